@@ -17,9 +17,17 @@ import math
 from fpdf import FPDF
 from datetime import datetime
 
+from calculadoracidadao import financeiro
+from calculadoracidadao.historico import Historico
+from calculadoracidadao.interface.atualizacao import Atualizador
+
+# Resultados guardados por sessão; os mais antigos são descartados
+TAMANHO_HISTORICO = 100
+
 class CalculadoraFinanceira:
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, tamanho_historico=TAMANHO_HISTORICO):
         self.page = page
+        self.atualizador = Atualizador(page)
         self.page.title = "Calculadora Financeira"
         self.page.padding = 20
         self.page.bgcolor = "#1d1313"  # Cor de fundo escura
@@ -75,8 +83,9 @@ class CalculadoraFinanceira:
         # Mensagem de erro
         self.error_text = Text("", color="#d22042")
         
-        # Lista de resultados
-        self.resultados = []
+        # Lista de resultados (os controles da lista ficam indexados pelo id)
+        self.resultados = Historico(tamanho_historico)
+        self.controles_resultados = {}
         self.lista_resultados = ListView(
             expand=1,
             spacing=10,
@@ -192,31 +201,30 @@ class CalculadoraFinanceira:
             result = 0
             
             if tipo == "vf":
-                result = vp * math.pow((1+s), t)
+                result = financeiro.calcular_valor_futuro(vp, s, t)
             elif tipo == "vp":
                 if VU:
-                    result = vf / (math.pow(1+s, t) - 1)
+                    result = financeiro.calcular_valor_presente_uniforme(vf, s, t)
                 else:
-                    result = vf / (math.pow(1+s, t))
+                    result = financeiro.calcular_valor_presente(vf, s, t)
             elif tipo == "t":
-                result = math.ceil(math.log(vf/vp)/math.log(1+s))
+                result = math.ceil(financeiro.calcular_tempo(vp, vf, s))
             elif tipo == "s":
-                result = (math.pow(vf/vp, 1/t) - 1) * 100
+                result = financeiro.calcular_taxa(vp, vf, t) * 100
                 
             if tipo is None:
                 self.error_text.value = "Você está com 4 variáveis, por favor retire uma delas!"
             else:
                 resultado_texto = f"{tipo.upper()}: {result:.2f}"
                 self.adicionar_resultado(resultado_texto)
-                if tipo == "vf": self.vf.value = f"{result:.2f}"
-                elif tipo == "vp": self.vp.value = f"{result:.2f}"
-                elif tipo == "t": self.t.value = f"{result:.0f}"
-                elif tipo == "s": self.s.value = f"{result:.2f}"
+                campo = {"vf": self.vf, "vp": self.vp, "t": self.t, "s": self.s}[tipo]
+                campo.value = f"{result:.0f}" if tipo == "t" else f"{result:.2f}"
+                self.atualizador.marcar(campo)
                 self.error_text.value = ""
         else:
             self.error_text.value = "Algum(ns) dos campos está(ão) inválido(s), por favor verificar!"
             
-        self.page.update()
+        self.atualizador.enviar(self.error_text)
 
     def adicionar_resultado(self, resultado):
         agora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -226,35 +234,35 @@ class CalculadoraFinanceira:
                 IconButton(
                     icon=icons.DELETE,
                     icon_color="#d22042",
-                    on_click=lambda e, res=resultado: self.remover_resultado(e, res)
+                    on_click=lambda e: self.remover_resultado(e, id_resultado)
                 )
             ]),
             bgcolor="#24b694",
             padding=10,
             border_radius=5
         )
-        self.resultados.append({
+        id_resultado, descartados = self.resultados.adicionar({
             'tempo': self.t.value,
             'taxa': self.s.value,
             'valor_presente': self.vp.value,
             'valor_futuro': self.vf.value,
             'resultado': resultado
         })
+        self.controles_resultados[id_resultado] = container
         self.lista_resultados.controls.append(container)
+        for id_descartado in descartados:
+            self.lista_resultados.controls.remove(self.controles_resultados.pop(id_descartado))
         self.btn_pdf.disabled = False
-        self.page.update()
+        self.atualizador.marcar(self.lista_resultados, self.btn_pdf)
 
-    def remover_resultado(self, e, resultado):
-        for control in self.lista_resultados.controls:
-            if resultado in control.content.controls[0].value:
-                self.lista_resultados.controls.remove(control)
-                self.resultados.remove(resultado)
-                break
+    def remover_resultado(self, e, id_resultado):
+        if self.resultados.remover(id_resultado) is not None:
+            self.lista_resultados.controls.remove(self.controles_resultados.pop(id_resultado))
         
         if not self.resultados:
             self.btn_pdf.disabled = True
             
-        self.page.update()
+        self.atualizador.enviar(self.lista_resultados, self.btn_pdf)
 
     def gerar_pdf(self, e):
         pdf = FPDF()
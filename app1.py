@@ -1,27 +1,7 @@
 import flet as ft
 
-def calcular_taxa_juros(prestacao, meses, valor_financiado, precisao=0.000001):
-    j_min = 0
-    j_max = 1
-    j = (j_min + j_max) / 2
-
-    while j_max - j_min > precisao:
-        q0 = (((1 - (1 + j) ** -meses)) / j) * prestacao
-        if q0 < valor_financiado:
-            j_min = j
-        else:
-            j_max = j
-        j = (j_min + j_max) / 2
-
-    return j
-
-def calcular_prestacao(valor_financiado, taxa_juros, meses):
-    prestacao = valor_financiado * (taxa_juros / (1 - (1 + taxa_juros) ** -meses))
-    return prestacao
-
-def calcular_valor_financiado(prestacao, taxa_juros, meses):
-    valor_financiado = prestacao * ((1 - (1 + taxa_juros) ** -meses) / taxa_juros)
-    return valor_financiado
+from calculadoracidadao import calcular_prestacao, calcular_taxa_juros, calcular_valor_financiado
+from calculadoracidadao.interface.atualizacao import Atualizador
 
 def main(page: ft.Page):
     page.title = "Calculadora de Financiamento"
@@ -80,6 +60,7 @@ def main(page: ft.Page):
     )
     
     resultado = ft.Text(size=16, color="#a3b808")
+    atualizador = Atualizador(page)
 
     def calcular(e):
         try:
@@ -94,7 +75,7 @@ def main(page: ft.Page):
             if campos_preenchidos != 3:
                 resultado.value = "Erro: Preencha exatamente 3 campos para realizar o cálculo"
                 resultado.visible = True
-                page.update()
+                atualizador.enviar(resultado)
                 return
 
             if valor_financiado_input.value and prestacao_input.value and meses_input.value:
@@ -136,7 +117,7 @@ def main(page: ft.Page):
             resultado.color = "#d22042"  # Vermelho para erro
             resultado.visible = True
             
-        page.update()
+        atualizador.enviar(resultado)
 
     calcular_button = ft.ElevatedButton(
         text="Calcular",
@@ -1,15 +1,21 @@
+import io
+import logging
+
 import flet as ft
-import numpy_financial as npf
-from fpdf import FPDF
-from datetime import datetime, timedelta
-import locale
+from datetime import datetime
+
+from calculadoracidadao import amortizacao
+from calculadoracidadao.exportacao import exportar_csv
+from calculadoracidadao.formatacao import formatar_moeda
+from calculadoracidadao.interface.downloads import TIPO_CSV, TIPO_PDF, ArquivosTemporarios, entregar_arquivo
+from calculadoracidadao.relatorio import montar_relatorio_pdf
+
+logger = logging.getLogger(__name__)
 
-# Configurar locale para formatação de moeda em pt-BR
-locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
 
 class SimuladorEmprestimos:
     def __init__(self):
-        pass
+        self.temporarios = ArquivosTemporarios()
         
     def calcular_emprestimo(self, valor, parcelas, taxa, tipo, data_primeira_parcela):
         """
@@ -20,165 +26,27 @@ class SimuladorEmprestimos:
         tipo: 'price' para Tabela Price ou 'sac' para Tabela SAC
         data_primeira_parcela: data da primeira parcela
         """
-        taxa = taxa / 100  # Converter taxa para decimal
-        resultados = []
-        
-        if tipo == "price":
-            # Cálculo Tabela Price
-            pmt = -npf.pmt(taxa, parcelas, valor)
-            saldo = valor
-            
-            for i in range(1, parcelas + 1):
-                juros = saldo * taxa
-                amortizacao = pmt - juros
-                saldo = saldo - amortizacao
-                
-                # Calcula a data da parcela
-                data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
-                
-                resultados.append({
-                    "parcela": i,
-                    "valor_parcela": pmt,
-                    "amortizacao": amortizacao,
-                    "juros": juros,
-                    "saldo": max(0, saldo),
-                    "data": data_parcela.strftime("%d/%m/%Y")
-                })
-                
-        else:  # SAC
-            # Cálculo Tabela SAC
-            amortizacao = valor / parcelas
-            saldo = valor
-            
-            for i in range(1, parcelas + 1):
-                juros = saldo * taxa
-                valor_parcela = amortizacao + juros
-                saldo = saldo - amortizacao
-                
-                # Calcula a data da parcela
-                data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
-                
-                resultados.append({
-                    "parcela": i,
-                    "valor_parcela": valor_parcela,
-                    "amortizacao": amortizacao,
-                    "juros": juros,
-                    "saldo": max(0, saldo),
-                    "data": data_parcela.strftime("%d/%m/%Y")
-                })
-        
-        return resultados
+        return amortizacao.calcular_emprestimo(valor, parcelas, taxa, tipo, data_primeira_parcela)
 
-    def gerar_pdf(self, dados, parametros):
-        """Gera relatório PDF com os resultados da simulação"""
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        
-        # Título
-        pdf.cell(0, 10, "Simulação de Empréstimo", ln=True, align="C")
-        pdf.ln(10)
-        
-        # Parâmetros
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 10, "Parâmetros do cálculo:", ln=True)
-        pdf.set_font("Arial", "", 12)
-        pdf.cell(0, 10, f"Valor do empréstimo: {locale.currency(parametros['valor'], grouping=True)}", ln=True)
-        pdf.cell(0, 10, f"Número de parcelas: {parametros['parcelas']}", ln=True)
-        pdf.cell(0, 10, f"Taxa de juros: {parametros['taxa']}% ao mês", ln=True)
-        pdf.cell(0, 10, f"Sistema: {'Tabela Price' if parametros['tipo'] == 'price' else 'Tabela SAC'}", ln=True)
-        pdf.cell(0, 10, f"Data primeira parcela: {parametros['data_primeira_parcela'].strftime('%d/%m/%Y')}", ln=True)
-        pdf.ln(10)
-        
-        # Tabela de resultados
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 10, "Resultados:", ln=True)
-        
-        # Cabeçalho da tabela
-        headers = ["Parcela", "Data", "Valor", "Amortização", "Juros", "Saldo"]
-        col_width = 32
-        
-        for header in headers:
-            pdf.cell(col_width, 10, header, 1)
-        pdf.ln()
-        
-        # Dados da tabela
-        pdf.set_font("Arial", "", 10)
-        total_valor = 0
-        total_amortizacao = 0
-        total_juros = 0
-        
-        for linha in dados:
-            pdf.cell(col_width, 10, f"{linha['parcela']}", 1)
-            pdf.cell(col_width, 10, f"{linha['data']}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['valor_parcela'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['amortizacao'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['juros'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['saldo'], grouping=True)}", 1)
-            pdf.ln()
-            
-            total_valor += linha['valor_parcela']
-            total_amortizacao += linha['amortizacao']
-            total_juros += linha['juros']
-        
-        # Linha de totais
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(col_width, 10, "Totais", 1)
-        pdf.cell(col_width, 10, "", 1)
-        pdf.cell(col_width, 10, locale.currency(total_valor, grouping=True), 1)
-        pdf.cell(col_width, 10, locale.currency(total_amortizacao, grouping=True), 1)
-        pdf.cell(col_width, 10, locale.currency(total_juros, grouping=True), 1)
-        pdf.cell(col_width, 10, "", 1)
-        
-        # Salvar PDF
-        pdf.output("simulacao_emprestimo.pdf")
+    def conteudo_pdf(self, parametros, dados=None):
+        """
+        Relatório PDF da simulação (bytes), gerado em memória
+        dados: Cronograma já calculado, ou None para calcular as parcelas em
+        blocos durante a geração
+        """
+        return montar_relatorio_pdf(
+            parametros['valor'], parametros['parcelas'], parametros['taxa'], parametros['tipo'],
+            parametros['data_primeira_parcela'], cronograma=dados,
+        ).conteudo()
 
-    def gerar_csv(self, dados, parametros):
-        """Gera arquivo CSV com os resultados da simulação"""
-        import csv
-        
-        with open('simulacao_emprestimo.csv', 'w', newline='') as file:
-            writer = csv.writer(file)
-            
-            # Cabeçalho com parâmetros
-            writer.writerow(['Parâmetros do cálculo'])
-            writer.writerow(['Valor do empréstimo', locale.currency(parametros['valor'], grouping=True)])
-            writer.writerow(['Número de parcelas', parametros['parcelas']])
-            writer.writerow(['Taxa de juros', f"{parametros['taxa']}% ao mês"])
-            writer.writerow(['Sistema', 'Tabela Price' if parametros['tipo'] == 'price' else 'Tabela SAC'])
-            writer.writerow(['Data primeira parcela', parametros['data_primeira_parcela'].strftime('%d/%m/%Y')])
-            writer.writerow([])  # Linha em branco
-            
-            # Cabeçalho da tabela
-            writer.writerow(['Parcela', 'Data', 'Valor', 'Amortização', 'Juros', 'Saldo'])
-            
-            # Dados
-            total_valor = 0
-            total_amortizacao = 0
-            total_juros = 0
-            
-            for linha in dados:
-                writer.writerow([
-                    linha['parcela'],
-                    linha['data'],
-                    locale.currency(linha['valor_parcela'], grouping=True),
-                    locale.currency(linha['amortizacao'], grouping=True),
-                    locale.currency(linha['juros'], grouping=True),
-                    locale.currency(linha['saldo'], grouping=True)
-                ])
-                total_valor += linha['valor_parcela']
-                total_amortizacao += linha['amortizacao']
-                total_juros += linha['juros']
-            
-            # Linha de totais
-            writer.writerow([
-                'Totais',
-                '',
-                locale.currency(total_valor, grouping=True),
-                locale.currency(total_amortizacao, grouping=True),
-                locale.currency(total_juros, grouping=True),
-                ''
-            ])
+    def conteudo_csv(self, parametros, dados=None):
+        """CSV da simulação (bytes, UTF-8), gerado em memória; veja conteudo_pdf"""
+        arquivo = io.BytesIO()
+        exportar_csv(
+            arquivo, parametros['valor'], parametros['parcelas'], parametros['taxa'], parametros['tipo'],
+            parametros['data_primeira_parcela'], cronograma=dados,
+        )
+        return arquivo.getvalue()
 
     def main_page(self, page: ft.Page):
         page.title = "Simulador de Empréstimos"
@@ -245,6 +113,9 @@ class SimuladorEmprestimos:
             rows=[]
         )
 
+        # Simulação exibida, exportada pelos botões de download
+        simulacao = {}
+
         def calcular(e):
             try:
                 valor = float(valor_emprestimo.value.replace(".", "").replace(",", "."))
@@ -269,18 +140,16 @@ class SimuladorEmprestimos:
                             cells=[
                                 ft.DataCell(ft.Text(f"{r['parcela']}")),
                                 ft.DataCell(ft.Text(r['data'])),
-                                ft.DataCell(ft.Text(locale.currency(r['valor_parcela'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['amortizacao'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['juros'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['saldo'], grouping=True)))
+                                ft.DataCell(ft.Text(formatar_moeda(r['valor_parcela']))),
+                                ft.DataCell(ft.Text(formatar_moeda(r['amortizacao']))),
+                                ft.DataCell(ft.Text(formatar_moeda(r['juros']))),
+                                ft.DataCell(ft.Text(formatar_moeda(r['saldo'])))
                             ]
                         )
                     )
                 
-                # Calcular totais
-                total_valor = sum(r['valor_parcela'] for r in resultados)
-                total_amortizacao = sum(r['amortizacao'] for r in resultados)
-                total_juros = sum(r['juros'] for r in resultados)
+                # Totais calculados junto com a tabela
+                totais = resultados.totais
                 
                 # Adicionar linha de totais
                 tabela_resultados.rows.append(
@@ -288,56 +157,49 @@ class SimuladorEmprestimos:
                         cells=[
                             ft.DataCell(ft.Text("Totais", weight=ft.FontWeight.BOLD)),
                             ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text(locale.currency(total_valor, grouping=True), weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text(locale.currency(total_amortizacao, grouping=True), weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text(locale.currency(total_juros, grouping=True), weight=ft.FontWeight.BOLD)),
+                            ft.DataCell(ft.Text(formatar_moeda(totais['valor_parcela']), weight=ft.FontWeight.BOLD)),
+                            ft.DataCell(ft.Text(formatar_moeda(totais['amortizacao']), weight=ft.FontWeight.BOLD)),
+                            ft.DataCell(ft.Text(formatar_moeda(totais['juros']), weight=ft.FontWeight.BOLD)),
                             ft.DataCell(ft.Text(""))
                         ],
                         color=ft.colors.SURFACE_VARIANT
                     )
                 )
                 
-                # Gerar PDF e habilitar botões de download
-                parametros = {
+                # Os arquivos só são gerados, em memória, quando pedidos
+                simulacao["parametros"] = {
                     "valor": valor,
                     "parcelas": parcelas,
                     "taxa": taxa,
                     "tipo": tipo,
                     "data_primeira_parcela": data_primeira_parcela
                 }
-                self.gerar_pdf(resultados, parametros)
-                self.gerar_csv(resultados, parametros)
+                simulacao["dados"] = resultados
                 
                 # Habilitar botões de download
                 btn_download_pdf.visible = True
                 btn_download_csv.visible = True
                 page.update()
                 
-            except Exception as err:
-                print(f"Erro: {err}")
+            except Exception:
+                logger.exception("Erro na simulação")
                 page.show_snack_bar(
                     ft.SnackBar(content=ft.Text("Por favor, verifique os valores informados"))
                 )
 
-        def download_pdf(e):
+        def baixar(nome, tipo, gerar):
             try:
-                import os
-                import webbrowser
-                if os.path.exists("simulacao_emprestimo.pdf"):
-                    # Usar webbrowser ao invés de launch_url
-                    webbrowser.open("simulacao_emprestimo.pdf")
-            except Exception as err:
-                print(f"Erro ao abrir PDF: {err}")
+                conteudo = gerar(simulacao["parametros"], simulacao["dados"])
+                entregar_arquivo(page, nome, conteudo, tipo, self.temporarios)
+            except Exception:
+                logger.exception("Erro ao gerar %s", nome)
+                page.show_snack_bar(ft.SnackBar(content=ft.Text("Não foi possível gerar o arquivo")))
+
+        def download_pdf(e):
+            baixar("simulacao_emprestimo.pdf", TIPO_PDF, self.conteudo_pdf)
 
         def download_csv(e):
-            try:
-                import os
-                import webbrowser
-                if os.path.exists("simulacao_emprestimo.csv"):
-                    # Usar webbrowser ao invés de launch_url
-                    webbrowser.open("simulacao_emprestimo.csv")
-            except Exception as err:
-                print(f"Erro ao abrir CSV: {err}")
+            baixar("simulacao_emprestimo.csv", TIPO_CSV, self.conteudo_csv)
 
         # Botões
         btn_calcular = ft.ElevatedButton(
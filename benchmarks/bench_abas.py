@@ -0,0 +1,71 @@
+"""
+Tempo até a primeira exibição e memória por sessão do MainApp.main,
+criando todas as abas de uma vez (antes) ou só a aba inicial (agora)
+Uso: python benchmarks/bench_abas.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class PaginaFalsa:
+    """Substitui ft.Page: guarda os controles adicionados, sem servidor"""
+
+    def __init__(self):
+        self.controls = []
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+
+    def update(self, *controles):
+        pass
+
+
+def sessao_todas_as_abas():
+    app = main.MainApp()
+    pagina = PaginaFalsa()
+    abas = [
+        app.create_calculadora_tab(pagina),
+        app.create_simulador_tab(pagina),
+        app.create_financiamento_tab(pagina),
+        app.create_help_tab(pagina),
+    ]
+    pagina.add(abas[0])
+    return pagina, abas
+
+
+def sessao_sob_demanda():
+    pagina = PaginaFalsa()
+    main.MainApp().main(pagina)
+    return pagina
+
+
+def medir(criar_sessao, sessoes=200):
+    inicio = time.perf_counter()
+    for _ in range(sessoes):
+        criar_sessao()
+    tempo = (time.perf_counter() - inicio) / sessoes
+
+    tracemalloc.start()
+    mantidas = [criar_sessao() for _ in range(sessoes)]
+    memoria = tracemalloc.get_traced_memory()[0] / sessoes
+    tracemalloc.stop()
+    del mantidas
+    return tempo, memoria
+
+
+def main_benchmark():
+    sessao_todas_as_abas()  # aquece importações e caches do Flet
+    for nome, criar_sessao in (("todas as abas", sessao_todas_as_abas), ("sob demanda", sessao_sob_demanda)):
+        tempo, memoria = medir(criar_sessao)
+        print(f"{nome:<15} primeira exibição {tempo * 1e3:7.2f} ms, memória por sessão {memoria / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main_benchmark()
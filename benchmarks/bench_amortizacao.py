@@ -0,0 +1,78 @@
+"""
+Compara o cálculo vetorizado das tabelas Price/SAC com o laço original
+Uso: python benchmarks/bench_amortizacao.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import numpy_financial as npf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculadoracidadao.amortizacao import calcular_colunas, calcular_emprestimo
+
+
+def calcular_emprestimo_laco(valor, parcelas, taxa, tipo, data_primeira_parcela):
+    """Implementação original, uma iteração Python por parcela"""
+    taxa = taxa / 100
+    resultados = []
+
+    if tipo == "price":
+        pmt = -npf.pmt(taxa, parcelas, valor)
+        saldo = valor
+        for i in range(1, parcelas + 1):
+            juros = saldo * taxa
+            amortizacao = pmt - juros
+            saldo = saldo - amortizacao
+            data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
+            resultados.append({
+                "parcela": i,
+                "valor_parcela": pmt,
+                "amortizacao": amortizacao,
+                "juros": juros,
+                "saldo": max(0, saldo),
+                "data": data_parcela.strftime("%d/%m/%Y")
+            })
+    else:
+        amortizacao = valor / parcelas
+        saldo = valor
+        for i in range(1, parcelas + 1):
+            juros = saldo * taxa
+            valor_parcela = amortizacao + juros
+            saldo = saldo - amortizacao
+            data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
+            resultados.append({
+                "parcela": i,
+                "valor_parcela": valor_parcela,
+                "amortizacao": amortizacao,
+                "juros": juros,
+                "saldo": max(0, saldo),
+                "data": data_parcela.strftime("%d/%m/%Y")
+            })
+
+    return resultados
+
+
+def medir(funcao, *args, repeticoes=5):
+    numero, _ = timeit.Timer(lambda: funcao(*args)).autorange()
+    return min(timeit.repeat(lambda: funcao(*args), number=numero, repeat=repeticoes)) / numero
+
+
+def main():
+    data = datetime(2025, 1, 10)
+    print(f"{'tipo':<6}{'parcelas':>10}{'laço (ms)':>14}{'numpy (ms)':>14}{'ganho':>9}"
+          f"{'só colunas (ms)':>18}{'ganho':>9}")
+    for tipo in ("price", "sac"):
+        for parcelas in (12, 120, 360, 420, 10_000):
+            args = (300_000.0, parcelas, 0.89, tipo, data)
+            t_laco = medir(calcular_emprestimo_laco, *args)
+            t_numpy = medir(calcular_emprestimo, *args)
+            t_colunas = medir(calcular_colunas, 300_000.0, parcelas, 0.0089, tipo)
+            print(f"{tipo:<6}{parcelas:>10}{t_laco * 1e3:>14.3f}{t_numpy * 1e3:>14.3f}{t_laco / t_numpy:>8.1f}x"
+                  f"{t_colunas * 1e3:>18.3f}{t_laco / t_colunas:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
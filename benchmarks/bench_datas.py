@@ -0,0 +1,49 @@
+"""
+Geração das datas de vencimento: laço com timedelta/strftime contra NumPy
+Uso: python benchmarks/bench_datas.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculadoracidadao.amortizacao import (
+    INTERVALO_30_DIAS,
+    INTERVALO_MENSAL,
+    calcular_datas,
+    formatar_datas,
+)
+
+
+def datas_laco(data_primeira_parcela, parcelas):
+    """Implementação original, uma data por iteração"""
+    return [
+        (data_primeira_parcela + timedelta(days=30 * (i-1))).strftime("%d/%m/%Y")
+        for i in range(1, parcelas + 1)
+    ]
+
+
+def medir(funcao, repeticoes=5):
+    numero, _ = timeit.Timer(funcao).autorange()
+    return min(timeit.repeat(funcao, number=numero, repeat=repeticoes)) / numero
+
+
+def main():
+    data = datetime(2025, 1, 31)
+    print(f"{'parcelas':>9}{'laço (µs)':>12}{'mensal (µs)':>14}{'+ texto (µs)':>15}{'30 dias (µs)':>15}")
+    for parcelas in (12, 120, 420, 10_000):
+        t_laco = medir(lambda: datas_laco(data, parcelas))
+        t_mensal = medir(lambda: calcular_datas(data, parcelas, INTERVALO_MENSAL))
+        t_texto = medir(lambda: formatar_datas(calcular_datas(data, parcelas, INTERVALO_MENSAL)))
+        t_30 = medir(lambda: calcular_datas(data, parcelas, INTERVALO_30_DIAS))
+        print(f"{parcelas:>9}{t_laco * 1e6:>12.1f}{t_mensal * 1e6:>14.1f}{t_texto * 1e6:>15.1f}{t_30 * 1e6:>15.1f}")
+
+    laco = datas_laco(data, 420)
+    mensal = formatar_datas(calcular_datas(data, 420))
+    print(f"parcela 13: laço {laco[12]}, mensal {mensal[12]}; parcela 420: laço {laco[-1]}, mensal {mensal[-1]}")
+
+
+if __name__ == "__main__":
+    main()
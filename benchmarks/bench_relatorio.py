@@ -0,0 +1,62 @@
+"""
+Relatório PDF: seis cell() por parcela contra o layout pré-calculado
+Uso: python benchmarks/bench_relatorio.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from fpdf import FPDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculadoracidadao.amortizacao import calcular_emprestimo
+from calculadoracidadao.formatacao import formatar_moeda
+from calculadoracidadao.relatorio import exportar_pdf
+
+VALOR = 250_000.0
+TAXA = 1.25
+DATA = datetime(2025, 1, 10)
+
+
+def relatorio_celulas(caminho, parcelas):
+    """Implementação original, uma célula por valor e quebra de página automática"""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 12)
+    for header in ["Parcela", "Data", "Valor", "Amortização", "Juros", "Saldo"]:
+        pdf.cell(32, 10, header, 1)
+    pdf.ln()
+    pdf.set_font("Arial", "", 10)
+    for linha in calcular_emprestimo(VALOR, parcelas, TAXA, "price", DATA):
+        pdf.cell(32, 10, f"{linha['parcela']}", 1)
+        pdf.cell(32, 10, f"{linha['data']}", 1)
+        pdf.cell(32, 10, formatar_moeda(linha['valor_parcela']), 1)
+        pdf.cell(32, 10, formatar_moeda(linha['amortizacao']), 1)
+        pdf.cell(32, 10, formatar_moeda(linha['juros']), 1)
+        pdf.cell(32, 10, formatar_moeda(linha['saldo']), 1)
+        pdf.ln()
+    pdf.output(caminho, "F")
+    return pdf.page_no()
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    paginas = funcao()
+    return paginas, time.perf_counter() - inicio
+
+
+def main():
+    caminho = os.path.join(tempfile.mkdtemp(), "relatorio.pdf")
+    print(f"{'parcelas':>9}{'cell() pág.':>13}{'pág./s':>9}{'layout pág.':>13}{'pág./s':>9}")
+    for parcelas in (120, 420, 10_000, 100_000):
+        paginas_celulas, t_celulas = medir(lambda: relatorio_celulas(caminho, parcelas))
+        paginas, t_layout = medir(lambda: exportar_pdf(caminho, VALOR, parcelas, TAXA, "price", DATA))
+        print(f"{parcelas:>9}{paginas_celulas:>13}{paginas_celulas / t_celulas:>9.0f}"
+              f"{paginas:>13}{paginas / t_layout:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
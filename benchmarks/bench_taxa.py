@@ -0,0 +1,83 @@
+"""
+Compara o cálculo da taxa de juros por bisseção (original) com Newton/Brent
+Uso: python benchmarks/bench_taxa.py
+"""
+import os
+import random
+import sys
+import timeit
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculadoracidadao.taxa import resolver_taxa
+
+
+def calcular_taxa_juros_bissecao(prestacao, meses, valor_financiado, precisao=0.000001):
+    """
+    Implementação original; devolve a taxa e o número de iterações
+    A comparação está invertida (q0 < valor_financiado deveria reduzir j_max),
+    por isso ela converge para 100% ao mês em qualquer cotação
+    """
+    j_min = 0
+    j_max = 1
+    j = (j_min + j_max) / 2
+    iteracoes = 0
+
+    while j_max - j_min > precisao:
+        iteracoes += 1
+        q0 = (((1 - (1 + j) ** -meses)) / j) * prestacao
+        if q0 < valor_financiado:
+            j_min = j
+        else:
+            j_max = j
+        j = (j_min + j_max) / 2
+
+    return j, iteracoes
+
+
+def gerar_cotacoes(quantidade, semente=42):
+    """Cotações aleatórias com taxas entre 0,1% e 15% ao mês"""
+    aleatorio = random.Random(semente)
+    cotacoes = []
+    for _ in range(quantidade):
+        meses = aleatorio.choice([6, 12, 24, 36, 48, 60, 120, 240, 360, 420])
+        taxa = aleatorio.uniform(0.001, 0.15)
+        valor = aleatorio.uniform(1_000, 1_000_000)
+        prestacao = valor * taxa / (1 - (1 + taxa) ** -meses)
+        cotacoes.append((prestacao, meses, valor, taxa))
+    return cotacoes
+
+
+def main():
+    cotacoes = gerar_cotacoes(5_000)
+
+    iteracoes_bissecao = Counter()
+    iteracoes_newton = Counter()
+    metodos = Counter()
+    erro_bissecao = erro_newton = 0.0
+    for prestacao, meses, valor, taxa in cotacoes:
+        j, iteracoes = calcular_taxa_juros_bissecao(prestacao, meses, valor)
+        iteracoes_bissecao[iteracoes] += 1
+        erro_bissecao = max(erro_bissecao, abs(j - taxa))
+
+        resultado = resolver_taxa(prestacao, meses, valor)
+        iteracoes_newton[resultado["iteracoes"]] += 1
+        metodos[resultado["metodo"]] += 1
+        erro_newton = max(erro_newton, abs(resultado["taxa"] - taxa))
+
+    t_bissecao = min(timeit.repeat(
+        lambda: [calcular_taxa_juros_bissecao(p, m, v) for p, m, v, _ in cotacoes], number=1, repeat=5))
+    t_newton = min(timeit.repeat(
+        lambda: [resolver_taxa(p, m, v) for p, m, v, _ in cotacoes], number=1, repeat=5))
+
+    print(f"{len(cotacoes)} cotações")
+    print(f"bisseção: {t_bissecao * 1e6 / len(cotacoes):.2f} µs/cotação, "
+          f"iterações {dict(sorted(iteracoes_bissecao.items()))}, erro máximo {erro_bissecao:.2e}")
+    print(f"newton:   {t_newton * 1e6 / len(cotacoes):.2f} µs/cotação, "
+          f"iterações {dict(sorted(iteracoes_newton.items()))}, erro máximo {erro_newton:.2e}")
+    print(f"métodos: {dict(metodos)}; ganho {t_bissecao / t_newton:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
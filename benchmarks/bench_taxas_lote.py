@@ -0,0 +1,49 @@
+"""
+Cálculo da taxa de juros em lote (NumPy) contra o laço com resolver_taxa
+Uso: python benchmarks/bench_taxas_lote.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculadoracidadao.taxa import STATUS_CONVERGIU, resolver_taxa, resolver_taxas
+
+
+def gerar_contratos(quantidade, semente=42):
+    """Contratos aleatórios com taxas entre 0,1% e 15% ao mês"""
+    aleatorio = np.random.default_rng(semente)
+    meses = aleatorio.choice([6, 12, 24, 36, 48, 60, 120, 240, 360, 420], quantidade).astype(np.float64)
+    taxas = aleatorio.uniform(0.001, 0.15, quantidade)
+    valores = aleatorio.uniform(1_000, 1_000_000, quantidade)
+    prestacoes = valores * taxas / (1 - (1 + taxas) ** -meses)
+    return prestacoes, meses, valores, taxas
+
+
+def main():
+    for quantidade in (10_000, 1_000_000):
+        prestacoes, meses, valores, taxas = gerar_contratos(quantidade)
+
+        inicio = time.perf_counter()
+        resultado = resolver_taxas(prestacoes, meses, valores)
+        t_lote = time.perf_counter() - inicio
+
+        # O laço escalar é medido em uma amostra e extrapolado
+        amostra = min(quantidade, 10_000)
+        inicio = time.perf_counter()
+        for i in range(amostra):
+            resolver_taxa(prestacoes[i], meses[i], valores[i])
+        t_laco = (time.perf_counter() - inicio) * quantidade / amostra
+
+        convergiram = np.count_nonzero(resultado["status"] == STATUS_CONVERGIU)
+        erro = np.nanmax(np.abs(resultado["taxa"] - taxas))
+        print(f"{quantidade:>9} contratos: lote {t_lote * 1e3:9.1f} ms, laço {t_laco * 1e3:9.1f} ms"
+              f"{' (estimado)' if amostra < quantidade else ''}, ganho {t_laco / t_lote:6.1f}x, "
+              f"convergiram {convergiram}, iterações máx. {resultado['iteracoes'].max()}, erro máx. {erro:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Núcleo de cálculo da Calculadora Financeira
+Depende apenas do NumPy: não importa Flet, FPDF nem altera o locale,
+podendo ser usado por processos em lote e servidores sem interface.
+"""
+from calculadoracidadao.amortizacao import (
+    Cronograma,
+    calcular_colunas,
+    calcular_comparacao,
+    calcular_emprestimo,
+    calcular_totais,
+)
+from calculadoracidadao.formatacao import formatar_moeda, formatar_moedas
+from calculadoracidadao.financeiro import (
+    calcular_prestacao,
+    calcular_taxa,
+    calcular_tempo,
+    calcular_valor_financiado,
+    calcular_valor_futuro,
+    calcular_valor_presente,
+    calcular_valor_presente_uniforme,
+)
+from calculadoracidadao.taxa import calcular_taxa_juros, resolver_taxa, resolver_taxas
+
+__all__ = [
+    "Cronograma",
+    "calcular_colunas",
+    "calcular_comparacao",
+    "calcular_emprestimo",
+    "calcular_totais",
+    "formatar_moeda",
+    "formatar_moedas",
+    "calcular_prestacao",
+    "calcular_taxa",
+    "calcular_tempo",
+    "calcular_valor_financiado",
+    "calcular_valor_futuro",
+    "calcular_valor_presente",
+    "calcular_valor_presente_uniforme",
+    "calcular_taxa_juros",
+    "resolver_taxa",
+    "resolver_taxas",
+]
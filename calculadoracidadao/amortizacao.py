@@ -0,0 +1,302 @@
+"""Cálculo vetorizado das tabelas de amortização (Price e SAC) com NumPy."""
+import numpy as np
+
+from calculadoracidadao.formatacao import formatar_moedas
+
+# Quantidade de parcelas calculadas de cada vez no modo de streaming
+TAMANHO_BLOCO = 4096
+
+# Intervalos entre os vencimentos das parcelas
+INTERVALO_MENSAL = "mensal"
+INTERVALO_30_DIAS = "30dias"
+
+
+def _prestacao(valor, parcelas, taxa, tipo):
+    """Prestação fixa (Price) ou amortização constante (SAC)"""
+    if parcelas < 1:
+        raise ValueError("O número de parcelas deve ser maior que zero")
+    if tipo == "price" and taxa != 0:
+        return valor * taxa / (1 - (1 + taxa) ** -parcelas)
+    return valor / parcelas
+
+
+def _saldos(valor, parcelas, taxa, tipo, prestacao, k):
+    """Saldo devedor após k parcelas (k pode ser um array)"""
+    if tipo == "price" and taxa != 0:
+        # Valor presente das parcelas restantes
+        return prestacao * (1 - (1 + taxa) ** -(parcelas - k)) / taxa
+    return valor - prestacao * k
+
+
+def _colunas(valor, parcelas, taxa, tipo, prestacao, inicio, fim):
+    """Colunas das parcelas inicio+1 até fim (a parcela 1 tem índice 0)"""
+    saldos = _saldos(valor, parcelas, taxa, tipo, prestacao, np.arange(inicio, fim + 1, dtype=np.float64))
+    juros = saldos[:-1] * taxa
+
+    if tipo == "price":
+        amortizacao = prestacao - juros
+        valor_parcela = np.full(fim - inicio, prestacao)
+    else:  # SAC
+        amortizacao = np.full(fim - inicio, prestacao)
+        valor_parcela = amortizacao + juros
+
+    return {
+        "valor_parcela": valor_parcela,
+        "amortizacao": amortizacao,
+        "juros": juros,
+        "saldo": np.maximum(saldos[1:], 0),
+    }
+
+
+def _totais(valor, parcelas, taxa, tipo, prestacao, inicio, fim):
+    """Totais das parcelas inicio+1 até fim, sem percorrer as colunas"""
+    quantidade = fim - inicio
+    amortizacao = (_saldos(valor, parcelas, taxa, tipo, prestacao, inicio)
+                   - _saldos(valor, parcelas, taxa, tipo, prestacao, fim))
+
+    if tipo == "price":
+        valor_parcela = quantidade * prestacao
+        juros = valor_parcela - amortizacao
+    else:  # SAC: os juros seguem uma progressão aritmética
+        juros = taxa * quantidade * (valor - prestacao * (inicio + fim - 1) / 2)
+        valor_parcela = amortizacao + juros
+
+    return {
+        "valor_parcela": float(valor_parcela),
+        "amortizacao": float(amortizacao),
+        "juros": float(juros),
+    }
+
+
+def calcular_totais(valor, parcelas, taxa, tipo):
+    """
+    Totais de valor, amortização e juros do empréstimo em tempo constante
+    Os parâmetros são os de calcular_emprestimo (taxa em %)
+    """
+    prestacao = _prestacao(valor, parcelas, taxa / 100, tipo)
+    return _totais(valor, parcelas, taxa / 100, tipo, prestacao, 0, parcelas)
+
+
+def calcular_colunas(valor, parcelas, taxa, tipo):
+    """
+    Calcula as colunas da tabela de amortização de uma só vez
+    valor: valor do empréstimo
+    parcelas: número de parcelas
+    taxa: taxa de juros mensal (decimal, ex: 0.01 para 1%)
+    tipo: 'price' para Tabela Price ou 'sac' para Tabela SAC
+    Retorna um dicionário com os arrays valor_parcela, amortizacao, juros e saldo
+    """
+    prestacao = _prestacao(valor, parcelas, taxa, tipo)
+    return _colunas(valor, parcelas, taxa, tipo, prestacao, 0, parcelas)
+
+
+def _datas(data_primeira_parcela, inicio, fim, intervalo=INTERVALO_MENSAL):
+    """Datas de vencimento das parcelas inicio+1 até fim"""
+    primeira = np.datetime64(data_primeira_parcela, "D")
+    if intervalo == INTERVALO_30_DIAS:
+        return primeira + np.arange(inicio, fim) * 30
+    if intervalo != INTERVALO_MENSAL:
+        raise ValueError(f"Intervalo de vencimento desconhecido: {intervalo}")
+
+    # Mantém o dia da primeira parcela, limitado ao último dia de cada mês
+    meses = primeira.astype("datetime64[M]") + np.arange(inicio, fim)
+    dia = (primeira - primeira.astype("datetime64[M]")).astype(np.int64)
+    inicio_mes = meses.astype("datetime64[D]")
+    dias_no_mes = ((meses + 1).astype("datetime64[D]") - inicio_mes).astype(np.int64)
+    return inicio_mes + np.minimum(dia, dias_no_mes - 1)
+
+
+def calcular_datas(data_primeira_parcela, parcelas, intervalo=INTERVALO_MENSAL):
+    """
+    Datas de vencimento de todas as parcelas, como datetime64[D]
+    intervalo: INTERVALO_MENSAL (mesmo dia em cada mês, ou o último dia dos
+    meses mais curtos) ou INTERVALO_30_DIAS (a cada 30 dias corridos)
+    """
+    return _datas(data_primeira_parcela, 0, parcelas, intervalo)
+
+
+def formatar_datas(datas):
+    """Converte um array datetime64[D] para strings no formato dd/mm/aaaa"""
+    # Fatia a partir do fim: anos acima de 9999 têm mais de quatro dígitos
+    return [f"{d[-2:]}/{d[-5:-3]}/{d[:-6]}" for d in np.datetime_as_string(datas, unit="D")]
+
+
+class Cronograma:
+    """
+    Tabela de amortização guardada em colunas (arrays NumPy)
+    valor_parcela, amortizacao, juros e saldo são float64 e data é
+    datetime64[D] (ou None). totais traz a soma de valor_parcela,
+    amortizacao e juros, calculada por fórmula junto com as colunas.
+    Datas e valores só viram texto na exibição ou exportação; iterar sobre
+    o cronograma gera as parcelas como dicionários, no formato usado pela
+    interface.
+    """
+
+    __slots__ = ("inicio", "data", "valor_parcela", "amortizacao", "juros", "saldo", "totais")
+
+    def __init__(self, valor_parcela, amortizacao, juros, saldo, data=None, inicio=0, totais=None):
+        self.inicio = inicio
+        self.totais = totais
+        self.data = data
+        self.valor_parcela = valor_parcela
+        self.amortizacao = amortizacao
+        self.juros = juros
+        self.saldo = saldo
+
+    @property
+    def parcela(self):
+        """Números das parcelas (a primeira do cronograma completo é 1)"""
+        return np.arange(self.inicio + 1, self.inicio + len(self) + 1)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelas colunas"""
+        colunas = (self.valor_parcela, self.amortizacao, self.juros, self.saldo, self.data)
+        return sum(coluna.nbytes for coluna in colunas if coluna is not None)
+
+    def __len__(self):
+        return len(self.saldo)
+
+    def __iter__(self):
+        for inicio in range(0, len(self), TAMANHO_BLOCO):
+            yield from self._parcelas(inicio, min(inicio + TAMANHO_BLOCO, len(self)))
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Parcela fora do cronograma")
+        return next(self._parcelas(indice, indice + 1))
+
+    def _parcelas(self, inicio, fim):
+        datas = formatar_datas(self.data[inicio:fim]) if self.data is not None else [None] * (fim - inicio)
+        for parcela, valor_parcela, amortizacao, juros, saldo, data in zip(
+            range(self.inicio + inicio + 1, self.inicio + fim + 1),
+            self.valor_parcela[inicio:fim].tolist(),
+            self.amortizacao[inicio:fim].tolist(),
+            self.juros[inicio:fim].tolist(),
+            self.saldo[inicio:fim].tolist(),
+            datas,
+        ):
+            yield {
+                "parcela": parcela,
+                "valor_parcela": valor_parcela,
+                "amortizacao": amortizacao,
+                "juros": juros,
+                "saldo": saldo,
+                "data": data,
+            }
+
+    def linhas_formatadas(self, formatar_moeda=None, inicio=0, fim=None):
+        """
+        Linhas da tabela como tuplas de textos (parcela, data, valor,
+        amortização, juros, saldo), formatadas apenas no intervalo pedido
+        formatar_moeda: função que recebe um float e devolve o texto; sem
+        ela, as colunas são formatadas em reais de uma só vez (formatar_moedas)
+        """
+        fim = len(self) if fim is None else min(fim, len(self))
+        if formatar_moeda is None:
+            datas = formatar_datas(self.data[inicio:fim]) if self.data is not None else [None] * (fim - inicio)
+            return list(zip(
+                map(str, range(self.inicio + inicio + 1, self.inicio + fim + 1)),
+                datas,
+                *(formatar_moedas(coluna[inicio:fim]).tolist()
+                  for coluna in (self.valor_parcela, self.amortizacao, self.juros, self.saldo)),
+            ))
+        return [
+            (str(linha["parcela"]), linha["data"], formatar_moeda(linha["valor_parcela"]),
+             formatar_moeda(linha["amortizacao"]), formatar_moeda(linha["juros"]),
+             formatar_moeda(linha["saldo"]))
+            for linha in self._parcelas(inicio, fim)
+        ]
+
+
+def calcular_comparacao(valor, parcelas, taxa, data_primeira_parcela=None, intervalo=INTERVALO_MENSAL):
+    """
+    Calcula as tabelas Price e SAC do mesmo empréstimo em uma só passada
+    Os parâmetros são os de calcular_emprestimo (taxa em %), sem o tipo.
+    Retorna um dicionário com:
+    - price e sac: os dois Cronogramas
+    - diferenca: Cronograma com Price menos SAC, parcela a parcela (e nos totais)
+    - juros_economizados: quanto o SAC paga a menos de juros no total
+    """
+    taxa = taxa / 100
+    prestacoes = {tipo: _prestacao(valor, parcelas, taxa, tipo) for tipo in ("price", "sac")}
+
+    # Uma linha por sistema: saldos, juros e amortização calculados juntos
+    k = np.arange(parcelas + 1, dtype=np.float64)
+    saldos = np.empty((2, parcelas + 1))
+    saldos[0] = _saldos(valor, parcelas, taxa, "price", prestacoes["price"], k)
+    saldos[1] = _saldos(valor, parcelas, taxa, "sac", prestacoes["sac"], k)
+    juros = saldos[:, :-1] * taxa
+    amortizacao = np.empty_like(juros)
+    amortizacao[0] = prestacoes["price"] - juros[0]
+    amortizacao[1] = prestacoes["sac"]
+    valor_parcela = amortizacao + juros
+    valor_parcela[0] = prestacoes["price"]
+    saldo = np.maximum(saldos[:, 1:], 0)
+
+    datas = calcular_datas(data_primeira_parcela, parcelas, intervalo) if data_primeira_parcela is not None else None
+    totais = [_totais(valor, parcelas, taxa, tipo, prestacoes[tipo], 0, parcelas) for tipo in ("price", "sac")]
+    price, sac = (
+        Cronograma(valor_parcela[i], amortizacao[i], juros[i], saldo[i], data=datas, totais=totais[i])
+        for i in range(2)
+    )
+    diferenca = Cronograma(
+        valor_parcela[0] - valor_parcela[1], amortizacao[0] - amortizacao[1], juros[0] - juros[1],
+        saldo[0] - saldo[1], data=datas, totais={chave: totais[0][chave] - totais[1][chave] for chave in totais[0]},
+    )
+    return {
+        "price": price,
+        "sac": sac,
+        "diferenca": diferenca,
+        "juros_economizados": diferenca.totais["juros"],
+    }
+
+
+def iterar_blocos(valor, parcelas, taxa, tipo, data_primeira_parcela=None, tamanho_bloco=TAMANHO_BLOCO,
+                  intervalo=INTERVALO_MENSAL, primeira=0):
+    """
+    Gera a tabela de amortização em blocos de até tamanho_bloco parcelas
+    Os parâmetros são os de calcular_colunas (taxa em decimal). Cada bloco é
+    um Cronograma com as colunas daquele trecho; as datas só são calculadas
+    se data_primeira_parcela for informada, no intervalo escolhido (veja
+    calcular_datas). A memória usada não depende do número de parcelas.
+    primeira: índice da parcela em que a geração começa (0 é a parcela 1)
+    """
+    prestacao = _prestacao(valor, parcelas, taxa, tipo)
+
+    for inicio in range(primeira, parcelas, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, parcelas)
+        colunas = _colunas(valor, parcelas, taxa, tipo, prestacao, inicio, fim)
+        totais = _totais(valor, parcelas, taxa, tipo, prestacao, inicio, fim)
+        datas = _datas(data_primeira_parcela, inicio, fim, intervalo) if data_primeira_parcela is not None else None
+        yield Cronograma(data=datas, inicio=inicio, totais=totais, **colunas)
+
+
+def iterar_parcelas(valor, parcelas, taxa, tipo, data_primeira_parcela, tamanho_bloco=TAMANHO_BLOCO,
+                    intervalo=INTERVALO_MENSAL):
+    """
+    Gera as parcelas uma a uma, no mesmo formato de calcular_emprestimo
+    (taxa em %), sem montar a tabela completa em memória
+    """
+    for bloco in iterar_blocos(valor, parcelas, taxa / 100, tipo, data_primeira_parcela, tamanho_bloco, intervalo):
+        yield from bloco
+
+
+def calcular_emprestimo(valor, parcelas, taxa, tipo, data_primeira_parcela=None, intervalo=INTERVALO_MENSAL):
+    """
+    Calcula as parcelas do empréstimo no formato usado pela interface
+    valor: valor do empréstimo
+    parcelas: número de parcelas
+    taxa: taxa de juros mensal (em %)
+    tipo: 'price' para Tabela Price ou 'sac' para Tabela SAC
+    data_primeira_parcela: data da primeira parcela
+    intervalo: INTERVALO_MENSAL ou INTERVALO_30_DIAS (veja calcular_datas)
+    Retorna um Cronograma; iterar sobre ele gera as parcelas como dicionários
+    """
+    prestacao = _prestacao(valor, parcelas, taxa / 100, tipo)
+    colunas = _colunas(valor, parcelas, taxa / 100, tipo, prestacao, 0, parcelas)
+    totais = _totais(valor, parcelas, taxa / 100, tipo, prestacao, 0, parcelas)
+    datas = calcular_datas(data_primeira_parcela, parcelas, intervalo) if data_primeira_parcela is not None else None
+    return Cronograma(data=datas, totais=totais, **colunas)
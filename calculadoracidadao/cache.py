@@ -0,0 +1,100 @@
+"""Cache LRU compartilhado entre as sessões do servidor."""
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache de tamanho limitado que descarta o item usado há mais tempo
+    Seguro para uso por várias sessões (threads) ao mesmo tempo. Os valores
+    são compartilhados entre as sessões e não devem ser alterados.
+    max_bytes: limite opcional da memória ocupada pelos valores, medida por
+    medir(valor); acima dele os mais antigos saem, mesmo que caibam mais
+    itens (o item mais recente sempre fica)
+    """
+
+    def __init__(self, tamanho_maximo=128, max_bytes=None, medir=None):
+        if tamanho_maximo < 1:
+            raise ValueError("O tamanho máximo do cache deve ser maior que zero")
+        if max_bytes is not None and medir is None:
+            raise ValueError("max_bytes exige a função medir")
+        self.tamanho_maximo = tamanho_maximo
+        self.max_bytes = max_bytes
+        self._medir = medir
+        self._itens = OrderedDict()
+        self._bytes = {}
+        self.bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave, calcular):
+        """
+        Devolve o valor da chave, chamando calcular() em caso de falha
+        O cálculo é feito fora da trava para não bloquear as outras sessões;
+        se duas sessões calcularem a mesma chave, fica o primeiro resultado.
+        """
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.falhas += 1
+
+        return self.guardar(chave, calcular())
+
+    def guardar(self, chave, valor):
+        """
+        Guarda o valor calculado fora do cache (ex: depois de buscar), sem
+        alterar os contadores de acertos e falhas
+        Se outra sessão já guardou a chave, fica o primeiro valor, que é o
+        devolvido.
+        """
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                return self._itens[chave]
+            self._itens[chave] = valor
+            if self._medir is not None:
+                self._bytes[chave] = self._medir(valor)
+                self.bytes += self._bytes[chave]
+            while len(self._itens) > self.tamanho_maximo or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes and len(self._itens) > 1):
+                antiga, _ = self._itens.popitem(last=False)
+                self.bytes -= self._bytes.pop(antiga, 0)
+                self.remocoes += 1
+        return valor
+
+    def buscar(self, chave, padrao=None):
+        """Devolve o valor da chave sem calcular nada (padrao em caso de falha)"""
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.falhas += 1
+            return padrao
+
+    def limpar(self):
+        """Remove todos os itens e zera os contadores"""
+        with self._trava:
+            self._itens.clear()
+            self._bytes.clear()
+            self.bytes = 0
+            self.acertos = self.falhas = self.remocoes = 0
+
+    def estatisticas(self):
+        """Contadores de acertos, falhas e remoções, e a ocupação atual"""
+        with self._trava:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "tamanho": len(self._itens),
+                "tamanho_maximo": self.tamanho_maximo,
+                "bytes": self.bytes,
+            }
+
+    def __len__(self):
+        return len(self._itens)
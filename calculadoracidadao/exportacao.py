@@ -0,0 +1,271 @@
+"""Exportação das tabelas de amortização para CSV, em blocos e direto das colunas."""
+import csv
+import io
+
+import numpy as np
+
+from calculadoracidadao.amortizacao import INTERVALO_MENSAL, Cronograma, calcular_totais, formatar_datas, iterar_blocos
+from calculadoracidadao.formatacao import LIMITE_VETORIZADO, arredondar_escalados, formatar_moeda
+
+# Apresentação em pt-BR (R$ 1.234,56 e dd/mm/aaaa), igual à tela
+FORMATO_PTBR = "ptbr"
+# Para outros programas: números com ponto decimal e datas ISO (aaaa-mm-dd)
+FORMATO_NUMERICO = "numerico"
+
+# Parcelas escritas por bloco: a memória usada não depende do total
+TAMANHO_BLOCO_CSV = 65536
+
+# Buffer do arquivo aberto por exportar_csv, em bytes
+TAMANHO_BUFFER = 1 << 20
+
+CABECALHO_PTBR = ["Parcela", "Data", "Valor", "Amortização", "Juros", "Saldo"]
+CABECALHO_NUMERICO = ["parcela", "data", "valor_parcela", "amortizacao", "juros", "saldo"]
+
+# Mesmo fim de linha do csv.writer
+FIM_DE_LINHA = "\r\n"
+
+
+# Casas decimais dos valores no FORMATO_NUMERICO (milionésimos de real)
+CASAS_DECIMAIS = 6
+
+# O texto é montado como uma matriz de bytes, uma linha por parcela; este
+# byte marca as posições vazias (zeros à esquerda, sinais ausentes), que
+# são retiradas antes de escrever
+_VAZIO = 0
+
+
+def _texto(texto, linhas):
+    """Coluna de bytes com o mesmo texto em todas as linhas"""
+    return np.broadcast_to(np.frombuffer(texto.encode("ascii"), dtype=np.uint8), (linhas, len(texto)))
+
+
+def _digitos(inteiros, minimo=1):
+    """
+    Dígitos ASCII de inteiros não negativos, alinhados à direita, com no
+    mínimo `minimo` dígitos (completando com zeros)
+    """
+    largura = max(minimo, len(str(int(inteiros.max()))) if len(inteiros) else minimo)
+    potencias = 10 ** np.arange(largura - 1, -1, -1, dtype=np.int64)
+    matriz = (inteiros[:, np.newaxis] // potencias % 10 + ord("0")).astype(np.uint8)
+    # Zeros à esquerda além do mínimo ficam vazios
+    matriz[(inteiros[:, np.newaxis] < potencias) & (np.arange(largura) < largura - minimo)] = _VAZIO
+    return matriz
+
+
+def _com_milhares(digitos):
+    """Insere o ponto de milhar do pt-BR (1.234.567) em uma matriz de _digitos"""
+    largura = digitos.shape[1]
+    grupos = [digitos[:, max(0, fim - 3):fim] for fim in range(largura, 0, -3)][::-1]
+    partes = [grupos[0]]
+    for grupo in grupos[1:]:
+        # O ponto só aparece quando há algum dígito à sua esquerda
+        ponto = np.where(partes[-1][:, -1:] != _VAZIO, np.uint8(ord(".")), np.uint8(_VAZIO))
+        partes += [ponto, grupo]
+    return np.concatenate(partes, axis=1)
+
+
+def _sinal(valores):
+    """Coluna com '-' nos valores negativos"""
+    return np.where(valores < 0, np.uint8(ord("-")), np.uint8(_VAZIO))[:, np.newaxis]
+
+
+def _datas(datas, formato):
+    """Colunas de bytes das datas, dd/mm/aaaa (pt-BR) ou aaaa-mm-dd (ISO)"""
+    anos = datas.astype("datetime64[Y]")
+    meses = datas.astype("datetime64[M]")
+    dia = (datas - meses).astype(np.int64) + 1
+    mes = (meses - anos).astype(np.int64) + 1
+    ano = anos.astype(np.int64) + 1970
+    linhas = len(datas)
+    if formato == FORMATO_NUMERICO:
+        return [_digitos(ano, 4), _texto("-", linhas), _digitos(mes, 2), _texto("-", linhas), _digitos(dia, 2)]
+    return [_digitos(dia, 2), _texto("/", linhas), _digitos(mes, 2), _texto("/", linhas), _digitos(ano, 4)]
+
+
+def _valores(coluna, formato):
+    """Colunas de bytes de um valor em reais: "R$ 1.234,56" ou 1234.560000"""
+    linhas = len(coluna)
+    absolutos = np.abs(coluna)
+    if formato == FORMATO_NUMERICO:
+        inteiro, fracao = np.divmod(arredondar_escalados(absolutos, CASAS_DECIMAIS), 10 ** CASAS_DECIMAIS)
+        return [_sinal(coluna), _digitos(inteiro), _texto(".", linhas), _digitos(fracao, CASAS_DECIMAIS)]
+    reais, centavos = np.divmod(arredondar_escalados(absolutos), 100)
+    return [_texto('"', linhas), _sinal(coluna), _texto("R$ ", linhas), _com_milhares(_digitos(reais)),
+            _texto(",", linhas), _digitos(centavos, 2), _texto('"', linhas)]
+
+
+def _limite(formato):
+    return LIMITE_VETORIZADO / 10 ** (CASAS_DECIMAIS - 2) if formato == FORMATO_NUMERICO else LIMITE_VETORIZADO
+
+
+def _linhas_csv_escalar(bloco, formato):
+    """Texto CSV das parcelas formatadas uma a uma (valores enormes, NaN ou infinitos)"""
+    if bloco.data is None:
+        datas = [""] * len(bloco)
+    elif formato == FORMATO_NUMERICO:
+        datas = np.datetime_as_string(bloco.data, unit="D").tolist()
+    else:
+        datas = formatar_datas(bloco.data)
+    formatar = f"{{:.{CASAS_DECIMAIS}f}}".format if formato == FORMATO_NUMERICO else formatar_moeda
+    colunas = [list(map(formatar, coluna.tolist()))
+               for coluna in (bloco.valor_parcela, bloco.amortizacao, bloco.juros, bloco.saldo)]
+    texto = io.StringIO(newline="")
+    csv.writer(texto).writerows(zip(bloco.parcela.tolist(), datas, *colunas))
+    return texto.getvalue()
+
+
+def _linhas_csv(bloco, formato):
+    """
+    Texto CSV das parcelas de um bloco
+    Os números viram dígitos por aritmética inteira sobre as colunas, sem
+    formatar um valor de cada vez; o texto de todas as linhas sai de uma
+    única matriz de bytes.
+    """
+    if formato not in (FORMATO_PTBR, FORMATO_NUMERICO):
+        raise ValueError(f"Formato de CSV desconhecido: {formato}")
+    colunas = (bloco.valor_parcela, bloco.amortizacao, bloco.juros, bloco.saldo)
+    if len(bloco) == 0:
+        return ""
+    if not all(np.all(np.abs(coluna) < _limite(formato)) for coluna in colunas):
+        return _linhas_csv_escalar(bloco, formato)
+
+    linhas = len(bloco)
+    virgula = _texto(",", linhas)
+    partes = [_digitos(bloco.parcela.astype(np.int64)), virgula]
+    if bloco.data is not None:
+        partes += _datas(bloco.data, formato)
+    for coluna in colunas:
+        partes += [virgula] + _valores(coluna, formato)
+    partes.append(_texto(FIM_DE_LINHA, linhas))
+
+    texto = np.concatenate(partes, axis=1).ravel()
+    return texto[texto != _VAZIO].tobytes().decode("ascii")
+
+
+def escrever_csv(arquivo, blocos, formato=FORMATO_PTBR):
+    """
+    Escreve o cabeçalho e as parcelas em arquivo (aberto em modo texto com
+    newline=''), um bloco de cada vez
+    blocos: Cronograma ou sequência de Cronogramas (ex: iterar_blocos)
+    Retorna o número de parcelas escritas.
+    """
+    if isinstance(blocos, Cronograma):
+        blocos = [blocos]
+    csv.writer(arquivo).writerow(CABECALHO_NUMERICO if formato == FORMATO_NUMERICO else CABECALHO_PTBR)
+    total = 0
+    for bloco in blocos:
+        arquivo.write(_linhas_csv(bloco, formato))
+        total += len(bloco)
+    return total
+
+
+def exportar_csv(caminho, valor, parcelas, taxa, tipo, data_primeira_parcela=None, formato=FORMATO_PTBR,
+                 intervalo=INTERVALO_MENSAL, tamanho_bloco=TAMANHO_BLOCO_CSV, cronograma=None):
+    """
+    Gera o CSV do empréstimo em blocos, sem montar a tabela inteira na memória
+    Os parâmetros são os de calcular_emprestimo (taxa em %). No FORMATO_PTBR
+    o arquivo traz os parâmetros do cálculo antes da tabela e os totais no
+    fim, como na tela; no FORMATO_NUMERICO traz só a tabela, para ser lida
+    por outros programas. cronograma: parcelas já calculadas (opcional).
+    caminho: nome do arquivo ou arquivo binário já aberto (ex: io.BytesIO),
+    que continua aberto depois da escrita.
+    """
+    if formato not in (FORMATO_PTBR, FORMATO_NUMERICO):
+        raise ValueError(f"Formato de CSV desconhecido: {formato}")
+    if cronograma is None:
+        cronograma = iterar_blocos(valor, parcelas, taxa / 100, tipo, data_primeira_parcela, tamanho_bloco, intervalo)
+
+    if hasattr(caminho, "write"):
+        arquivo = io.TextIOWrapper(caminho, encoding="utf-8", newline="")
+        try:
+            _escrever_exportacao(arquivo, valor, parcelas, taxa, tipo, data_primeira_parcela, formato, cronograma)
+        finally:
+            arquivo.detach()
+    else:
+        with open(caminho, "w", newline="", encoding="utf-8", buffering=TAMANHO_BUFFER) as arquivo:
+            _escrever_exportacao(arquivo, valor, parcelas, taxa, tipo, data_primeira_parcela, formato, cronograma)
+
+
+def _escrever_exportacao(arquivo, valor, parcelas, taxa, tipo, data_primeira_parcela, formato, cronograma):
+    """Conteúdo de exportar_csv em um arquivo já aberto em modo texto"""
+    writer = csv.writer(arquivo)
+    if formato == FORMATO_PTBR:
+        writer.writerow(["Parâmetros do cálculo"])
+        writer.writerow(["Valor do empréstimo", formatar_moeda(valor)])
+        writer.writerow(["Número de parcelas", parcelas])
+        writer.writerow(["Taxa de juros", f"{taxa}% ao mês"])
+        writer.writerow(["Sistema", "Tabela Price" if tipo == "price" else "Tabela SAC"])
+        if data_primeira_parcela is not None:
+            writer.writerow(["Data primeira parcela", data_primeira_parcela.strftime("%d/%m/%Y")])
+        writer.writerow([])  # Linha em branco
+
+    escrever_csv(arquivo, cronograma, formato)
+
+    if formato == FORMATO_PTBR:
+        totais = calcular_totais(valor, parcelas, taxa, tipo)
+        writer.writerow([])  # Linha em branco
+        writer.writerow([
+            "Totais",
+            "",
+            formatar_moeda(totais["valor_parcela"]),
+            formatar_moeda(totais["amortizacao"]),
+            formatar_moeda(totais["juros"]),
+            "",
+        ])
+
+
+def tabela_colunar(cronogramas):
+    """
+    DataFrame do pandas com as colunas numéricas das parcelas, sem passar
+    por texto (as colunas de CABECALHO_NUMERICO; data em datetime64)
+    cronogramas: um Cronograma, ou vários identificados pelo id do
+    empréstimo (dicionário {id: Cronograma} ou pares (id, Cronograma)); no
+    segundo caso a tabela começa pela coluna "emprestimo"
+    O pandas só é importado aqui: o restante do pacote depende apenas do NumPy.
+    """
+    import pandas as pd
+
+    if isinstance(cronogramas, Cronograma):
+        ids, cronogramas = None, [cronogramas]
+    else:
+        pares = list(cronogramas.items() if hasattr(cronogramas, "items") else cronogramas)
+        ids = [id_emprestimo for id_emprestimo, _ in pares]
+        cronogramas = [cronograma for _, cronograma in pares]
+
+    def juntar(colunas, tipo):
+        return np.concatenate(colunas).astype(tipo, copy=False) if colunas else np.array([], dtype=tipo)
+
+    tamanhos = [len(cronograma) for cronograma in cronogramas]
+    colunas = {}
+    if ids is not None:
+        colunas["emprestimo"] = np.repeat(np.asarray(ids), tamanhos) if ids else np.array([], dtype=object)
+    colunas["parcela"] = juntar([cronograma.parcela for cronograma in cronogramas], np.int64)
+    colunas["data"] = juntar([
+        cronograma.data if cronograma.data is not None else np.full(len(cronograma), np.datetime64("NaT", "D"))
+        for cronograma in cronogramas
+    ], "datetime64[s]")
+    for nome, atributo in zip(CABECALHO_NUMERICO[2:], ("valor_parcela", "amortizacao", "juros", "saldo")):
+        colunas[nome] = juntar([getattr(cronograma, atributo) for cronograma in cronogramas], np.float64)
+    return pd.DataFrame(colunas, copy=False)
+
+
+def exportar_parquet(caminho, cronogramas, compressao="snappy"):
+    """
+    Grava tabela_colunar(cronogramas) em Parquet
+    Requer o pyarrow (dependência opcional: poetry install -E colunar).
+    Retorna o número de parcelas gravadas.
+    """
+    tabela = tabela_colunar(cronogramas)
+    tabela.to_parquet(caminho, compression=compressao, index=False)
+    return len(tabela)
+
+
+def exportar_feather(caminho, cronogramas):
+    """
+    Grava tabela_colunar(cronogramas) em Arrow IPC (Feather v2)
+    Requer o pyarrow (dependência opcional: poetry install -E colunar).
+    Retorna o número de parcelas gravadas.
+    """
+    tabela = tabela_colunar(cronogramas)
+    tabela.to_feather(caminho)
+    return len(tabela)
@@ -0,0 +1,49 @@
+"""Fórmulas de juros compostos e de financiamento com prestações fixas."""
+import math
+
+
+def calcular_prestacao(valor_financiado, taxa_juros, meses):
+    """Prestação fixa (Tabela Price) de um valor financiado; taxa_juros em decimal"""
+    if taxa_juros == 0:
+        return valor_financiado / meses
+    return valor_financiado * (taxa_juros / (1 - (1 + taxa_juros) ** -meses))
+
+
+def calcular_valor_financiado(prestacao, taxa_juros, meses):
+    """Valor financiado que corresponde a uma prestação fixa; taxa_juros em decimal"""
+    if taxa_juros == 0:
+        return prestacao * meses
+    return prestacao * ((1 - (1 + taxa_juros) ** -meses) / taxa_juros)
+
+
+def calcular_valor_futuro(valor_presente, taxa, meses):
+    """Valor futuro de um capital a juros compostos; taxa em decimal"""
+    return valor_presente * (1 + taxa) ** meses
+
+
+def calcular_valor_presente(valor_futuro, taxa, meses):
+    """Valor presente de um capital a juros compostos; taxa em decimal"""
+    return valor_futuro / (1 + taxa) ** meses
+
+
+def calcular_valor_presente_uniforme(valor_futuro, taxa, meses):
+    """Valor presente uniforme (VU) de um valor futuro; taxa em decimal"""
+    return valor_futuro / ((1 + taxa) ** meses - 1)
+
+
+def calcular_tempo(valor_presente, valor_futuro, taxa):
+    """Número de meses (não arredondado) para o capital atingir o valor futuro"""
+    if valor_presente <= 0 or valor_futuro <= 0:
+        raise ValueError("Valor presente e valor futuro devem ser positivos")
+    if taxa <= -1 or taxa == 0:
+        raise ValueError("A taxa deve ser diferente de zero e maior que -100%")
+    return math.log(valor_futuro / valor_presente) / math.log(1 + taxa)
+
+
+def calcular_taxa(valor_presente, valor_futuro, meses):
+    """Taxa de juros mensal (decimal) que leva o valor presente ao valor futuro"""
+    if valor_presente <= 0 or valor_futuro <= 0:
+        raise ValueError("Valor presente e valor futuro devem ser positivos")
+    if meses < 1:
+        raise ValueError("O número de meses deve ser maior que zero")
+    return (valor_futuro / valor_presente) ** (1 / meses) - 1
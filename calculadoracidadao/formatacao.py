@@ -0,0 +1,64 @@
+"""Formatação de valores em reais (pt-BR) sem depender do locale do sistema."""
+from functools import lru_cache
+
+import numpy as np
+
+# Troca os separadores do formato en-US (1,234.56) pelos do pt-BR (1.234,56)
+_SEPARADORES = str.maketrans(",.", ".,")
+
+# Acima disso os centavos não cabem com folga em um int64; usa o caminho escalar
+LIMITE_VETORIZADO = 1e15
+
+
+@lru_cache(maxsize=4096)
+def formatar_moeda(valor):
+    """
+    Formata um valor como em locale.currency(valor, grouping=True) no pt_BR:
+    1234.5 -> 'R$ 1.234,50' e -1234.5 -> '-R$ 1.234,50'
+    """
+    texto = f"R$ {abs(valor):,.2f}".translate(_SEPARADORES)
+    return "-" + texto if valor < 0 else texto
+
+
+def arredondar_escalados(absolutos, casas=2):
+    """
+    absolutos * 10**casas como int64, com o mesmo arredondamento do formato
+    '%.{casas}f'; os valores devem ser não negativos e caber com folga no int64
+    """
+    escalados = absolutos * 10 ** casas
+    inteiros = np.rint(escalados).astype(np.int64)
+    # Perto da metade o produto pode ter arredondado para o lado errado;
+    # esses casos (raros) seguem o arredondamento exato do formato
+    duvidosos = np.abs(escalados - np.floor(escalados) - 0.5) < 1e-6 + escalados * 4e-16
+    if duvidosos.any():
+        inteiros[duvidosos] = [int(f"{v:.{casas}f}".replace(".", "")) for v in absolutos[duvidosos].tolist()]
+    return inteiros
+
+
+def formatar_moedas(valores):
+    """
+    Formata um array (ou coluna) de valores de uma só vez, com o mesmo
+    resultado de formatar_moeda em cada elemento
+    Retorna um array NumPy de strings; use .tolist() para obter uma lista.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    absolutos = np.abs(valores)
+    if valores.size == 0 or not np.all(absolutos < LIMITE_VETORIZADO):
+        # Valores enormes, infinitos ou NaN
+        return np.array([formatar_moeda(v) for v in valores.ravel().tolist()]).reshape(valores.shape)
+
+    reais, centavos = np.divmod(arredondar_escalados(absolutos), 100)
+
+    # Monta os grupos de milhar da direita para a esquerda
+    inteiro = np.strings.zfill((reais % 1000).astype(np.str_), 3)
+    resto = reais // 1000
+    while resto.any():
+        grupo = np.strings.zfill((resto % 1000).astype(np.str_), 3)
+        inteiro = np.where(resto > 0, np.strings.add(np.strings.add(grupo, "."), inteiro), inteiro)
+        resto //= 1000
+    inteiro = np.strings.lstrip(inteiro, "0")
+    inteiro = np.where(inteiro == "", "0", inteiro)
+
+    texto = np.strings.add(np.strings.add("R$ ", inteiro), ",")
+    texto = np.strings.add(texto, np.strings.zfill(centavos.astype(np.str_), 2))
+    return np.where(valores < 0, np.strings.add("-", texto), texto)
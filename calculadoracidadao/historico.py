@@ -0,0 +1,57 @@
+"""Histórico de resultados de uma sessão, indexado por id e de tamanho limitado."""
+import itertools
+from collections import OrderedDict
+
+
+class Historico:
+    """
+    Guarda os itens em ordem de inclusão, cada um com um id único
+    Remover por id custa O(1). Ao passar de tamanho_maximo, os itens mais
+    antigos são descartados, de modo que sessões longas (quiosques) usam
+    memória constante. Iterar gera os itens do mais antigo ao mais novo.
+    """
+
+    def __init__(self, tamanho_maximo=100):
+        if tamanho_maximo < 1:
+            raise ValueError("O tamanho máximo do histórico deve ser maior que zero")
+        self.tamanho_maximo = tamanho_maximo
+        self._itens = OrderedDict()
+        self._ids = itertools.count(1)
+        self.descartados = 0
+
+    def adicionar(self, item):
+        """
+        Inclui um item e devolve (id, ids_descartados), com os ids dos itens
+        antigos removidos para respeitar o tamanho máximo
+        """
+        id_item = next(self._ids)
+        self._itens[id_item] = item
+        descartados = []
+        while len(self._itens) > self.tamanho_maximo:
+            descartados.append(self._itens.popitem(last=False)[0])
+        self.descartados += len(descartados)
+        return id_item, descartados
+
+    def remover(self, id_item):
+        """Remove o item e o devolve (None se o id não estiver no histórico)"""
+        return self._itens.pop(id_item, None)
+
+    def limpar(self):
+        """Remove todos os itens"""
+        self._itens.clear()
+
+    def itens(self):
+        """Pares (id, item), do mais antigo ao mais novo"""
+        return self._itens.items()
+
+    def __getitem__(self, id_item):
+        return self._itens[id_item]
+
+    def __contains__(self, id_item):
+        return id_item in self._itens
+
+    def __iter__(self):
+        return iter(self._itens.values())
+
+    def __len__(self):
+        return len(self._itens)
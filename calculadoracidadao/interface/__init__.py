@@ -0,0 +1,5 @@
+"""
+Utilitários para as telas Flet
+Ao contrário do restante do pacote, estes módulos trabalham com controles
+Flet e não são importados por calculadoracidadao.
+"""
@@ -0,0 +1,114 @@
+"""Envio apenas dos controles alterados em cada evento, em vez de page.update()."""
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_trava = threading.Lock()
+# Bytes enviados por sessão, apenas durante o envio de um Atualizador que
+# está medindo; a entrada é removida ao fim do envio
+_bytes_por_sessao = {}
+
+
+def _instrumentar(conexao):
+    """Faz a conexão contar os bytes enviados a cada sessão (uma vez por conexão)"""
+    from flet.core.protocol import CommandEncoder
+
+    with _trava:
+        if getattr(conexao, "_bytes_por_sessao", None) is _bytes_por_sessao:
+            return
+        enviar_original = conexao.send_commands
+
+        def send_commands(session_id, commands):
+            if session_id in _bytes_por_sessao:
+                tamanho = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+                with _trava:
+                    _bytes_por_sessao[session_id] = _bytes_por_sessao.get(session_id, 0) + tamanho
+            return enviar_original(session_id, commands)
+
+        conexao.send_commands = send_commands
+        conexao._bytes_por_sessao = _bytes_por_sessao
+
+
+class Atualizador:
+    """
+    Acumula os controles alterados durante um evento e os envia juntos
+    Uso: marcar(controle, ...) após alterar os controles e enviar() no fim
+    do evento. Só os controles marcados são comparados e enviados ao cliente
+    (os descendentes de um controle marcado já vão com ele). Cada envio é
+    registrado no log (nível DEBUG) com o número de controles e de bytes.
+    medir: conta os bytes de cada envio, o que serializa os comandos uma
+    segunda vez; por padrão, só quando o log DEBUG está ativo (senão os
+    bytes ficam em zero)
+    marcar() e enviar() podem ser chamados de threads diferentes (handlers
+    síncronos rodam no executor do flet, os assíncronos no loop da página).
+    """
+
+    def __init__(self, page, medir=None):
+        self.page = page
+        self._trava = threading.RLock()
+        self._pendentes = []
+        self.eventos = 0
+        self.controles_enviados = 0
+        self.bytes_enviados = 0
+        self.ultimo_envio = {"controles": 0, "bytes": 0}
+
+        self._sessao = getattr(page, "session_id", None)
+        self._conexao = getattr(page, "connection", None)
+        self.medir = logger.isEnabledFor(logging.DEBUG) if medir is None else medir
+        if self.medir and self._conexao is not None:
+            _instrumentar(self._conexao)
+
+    def marcar(self, *controles):
+        """Marca controles alterados para o próximo envio"""
+        with self._trava:
+            for controle in controles:
+                if not any(controle is pendente for pendente in self._pendentes):
+                    self._pendentes.append(controle)
+
+    def enviar(self, *controles):
+        """
+        Envia os controles marcados (e os passados aqui) em uma única atualização
+        Retorna {'controles': n, 'bytes': n} deste envio
+        """
+        with self._trava:
+            self.marcar(*controles)
+            pendentes = [c for c in self._pendentes if not self._tem_ancestral_pendente(c)]
+            self._pendentes = []
+            medindo = self.medir and self._conexao is not None
+            if medindo:
+                with _trava:
+                    _bytes_por_sessao[self._sessao] = 0
+            try:
+                if pendentes:
+                    self.page.update(*pendentes)
+            finally:
+                if medindo:
+                    with _trava:
+                        enviados = _bytes_por_sessao.pop(self._sessao, 0)
+                else:
+                    enviados = 0
+
+            self.eventos += 1
+            self.controles_enviados += len(pendentes)
+            self.bytes_enviados += enviados
+            self.ultimo_envio = {"controles": len(pendentes), "bytes": enviados}
+            logger.debug("Atualização: %d controles, %d bytes", len(pendentes), enviados)
+            return self.ultimo_envio
+
+    def estatisticas(self):
+        """Totais da sessão: eventos, controles e bytes enviados"""
+        return {
+            "eventos": self.eventos,
+            "controles": self.controles_enviados,
+            "bytes": self.bytes_enviados,
+        }
+
+    def _tem_ancestral_pendente(self, controle):
+        pai = getattr(controle, "parent", None)
+        while pai is not None:
+            if any(pai is pendente for pendente in self._pendentes):
+                return True
+            pai = getattr(pai, "parent", None)
+        return False
@@ -0,0 +1,229 @@
+"""Arquivos exportados guardados em memória por sessão e entregues ao navegador como download."""
+import atexit
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urljoin
+
+# Rota HTTP que entrega os arquivos (veja registrar_rota)
+PREFIXO_DOWNLOADS = "/downloads"
+
+# Segundos que um arquivo fica disponível depois de gerado
+VALIDADE_PADRAO = 300
+
+# Arquivos guardados por sessão; um novo descarta o mais antigo
+MAX_POR_SESSAO = 4
+
+# Memória ocupada pelos arquivos de todas as sessões juntas
+MAX_BYTES = 256 * 2**20
+
+TIPO_PDF = "application/pdf"
+TIPO_CSV = "text/csv; charset=utf-8"
+
+# Mostrado em flet run -w, onde não há rota para entregar o arquivo
+AVISO_SEM_DOWNLOADS = "Para baixar arquivos pelo navegador, rode o aplicativo com python main.py --web"
+
+
+class Downloads:
+    """
+    Arquivos gerados pelas sessões, acessíveis por um token aleatório
+    Nada vai para o disco: cada exportação ganha seu próprio token, de modo
+    que sessões simultâneas não sobrescrevem os arquivos umas das outras.
+    Os arquivos expiram após `validade` segundos, são descartados quando a
+    sessão termina (remover_sessao) e, além de MAX_POR_SESSAO por sessão ou
+    max_bytes no total, os mais antigos saem primeiro. Todos os métodos
+    podem ser chamados de qualquer thread.
+    """
+
+    def __init__(self, validade=VALIDADE_PADRAO, max_por_sessao=MAX_POR_SESSAO, max_bytes=MAX_BYTES,
+                 relogio=time.monotonic):
+        self.validade = validade
+        self.max_por_sessao = max_por_sessao
+        self.max_bytes = max_bytes
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        # token -> (sessao, nome, tipo, conteudo, expira_em); a validade é a
+        # mesma para todos, então a ordem de inclusão é a ordem de expiração
+        self._arquivos = OrderedDict()
+        self._sessoes = {}
+        self.bytes = 0
+        self.expirados = 0
+
+    def guardar(self, sessao, nome, conteudo, tipo):
+        """Guarda o conteudo (bytes) e devolve o token para baixá-lo"""
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._limpar_expirados()
+            self._arquivos[token] = (sessao, nome, tipo, conteudo, self._relogio() + self.validade)
+            self.bytes += len(conteudo)
+            tokens = self._sessoes.setdefault(sessao, [])
+            tokens.append(token)
+            while len(tokens) > self.max_por_sessao:
+                self._remover(tokens[0])
+            while self.bytes > self.max_bytes and len(self._arquivos) > 1:
+                self._remover(next(iter(self._arquivos)))
+        return token
+
+    def buscar(self, token):
+        """(nome, tipo, conteudo) do arquivo, ou None se não existe ou expirou"""
+        with self._lock:
+            self._limpar_expirados()
+            arquivo = self._arquivos.get(token)
+        return arquivo[1:4] if arquivo is not None else None
+
+    def remover_sessao(self, sessao):
+        """Descarta os arquivos de uma sessão encerrada"""
+        with self._lock:
+            for token in list(self._sessoes.get(sessao, ())):
+                self._remover(token)
+
+    def limpar_expirados(self):
+        """Descarta os arquivos vencidos e devolve quantos foram descartados"""
+        with self._lock:
+            return self._limpar_expirados()
+
+    def estatisticas(self):
+        with self._lock:
+            return {"arquivos": len(self._arquivos), "sessoes": len(self._sessoes), "bytes": self.bytes,
+                    "expirados": self.expirados}
+
+    def __len__(self):
+        return len(self._arquivos)
+
+    def _limpar_expirados(self):
+        agora = self._relogio()
+        vencidos = 0
+        while self._arquivos:
+            token, arquivo = next(iter(self._arquivos.items()))
+            if arquivo[4] > agora:
+                break
+            self._remover(token)
+            vencidos += 1
+        self.expirados += vencidos
+        return vencidos
+
+    def _remover(self, token):
+        sessao, _, _, conteudo, _ = self._arquivos.pop(token)
+        self.bytes -= len(conteudo)
+        tokens = self._sessoes[sessao]
+        tokens.remove(token)
+        if not tokens:
+            del self._sessoes[sessao]
+
+
+class ArquivosTemporarios:
+    """
+    Exportações do aplicativo desktop, cada uma em um arquivo temporário
+    próprio, para ser aberta pelo sistema
+    Como no Downloads, os arquivos valem por `validade` segundos: os
+    vencidos são apagados a cada nova gravação (ou por limpar_expirados) e
+    os restantes quando o processo termina.
+    """
+
+    def __init__(self, validade=VALIDADE_PADRAO, pasta=None, relogio=time.monotonic):
+        self.validade = validade
+        self.pasta = pasta
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        # (expira_em, caminho), em ordem de expiração
+        self._arquivos = deque()
+        atexit.register(self.limpar)
+
+    def gravar(self, nome, conteudo):
+        """Grava o conteudo (bytes) em um arquivo novo, parecido com nome, e devolve o caminho"""
+        self.limpar_expirados()
+        raiz, extensao = os.path.splitext(nome)
+        descritor, caminho = tempfile.mkstemp(prefix=raiz + "_", suffix=extensao, dir=self.pasta)
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(conteudo)
+        with self._lock:
+            self._arquivos.append((self._relogio() + self.validade, caminho))
+        return caminho
+
+    def limpar_expirados(self):
+        """Apaga os arquivos vencidos e devolve quantos foram apagados"""
+        agora = self._relogio()
+        with self._lock:
+            vencidos = []
+            while self._arquivos and self._arquivos[0][0] <= agora:
+                vencidos.append(self._arquivos.popleft()[1])
+        for caminho in vencidos:
+            _apagar(caminho)
+        return len(vencidos)
+
+    def limpar(self):
+        """Apaga todos os arquivos ainda guardados"""
+        with self._lock:
+            caminhos = [caminho for _, caminho in self._arquivos]
+            self._arquivos.clear()
+        for caminho in caminhos:
+            _apagar(caminho)
+
+    def __len__(self):
+        return len(self._arquivos)
+
+
+def _apagar(caminho):
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        pass
+
+
+def url_download(page, token):
+    """Endereço do arquivo no mesmo servidor da página"""
+    return urljoin(page.url or "", f"{PREFIXO_DOWNLOADS}/{token}")
+
+
+def entregar(page, downloads, nome, conteudo, tipo):
+    """Guarda o arquivo para a sessão da página e pede ao navegador que o baixe"""
+    token = downloads.guardar(page.session_id, nome, conteudo, tipo)
+    page.launch_url(url_download(page, token))
+    return token
+
+
+def entregar_arquivo(page, nome, conteudo, tipo, temporarios, downloads=None):
+    """
+    Entrega uma exportação conforme o modo da página:
+    - web com a rota de downloads (downloads informado): em memória, via entregar
+    - web sem a rota (flet run -w): nada é gravado e o usuário é avisado
+    - desktop: arquivo temporário (temporarios), aberto em seguida
+    Retorna o token, o caminho do arquivo temporário ou None
+    """
+    if page.web:
+        if downloads is not None:
+            return entregar(page, downloads, nome, conteudo, tipo)
+        import flet as ft
+
+        page.show_snack_bar(ft.SnackBar(content=ft.Text(AVISO_SEM_DOWNLOADS), bgcolor="#d22042"))
+        return None
+    caminho = temporarios.gravar(nome, conteudo)
+    import webbrowser
+
+    webbrowser.open(caminho)
+    return caminho
+
+
+def registrar_rota(servidor, downloads):
+    """
+    Registra em uma aplicação FastAPI (ex: flet.fastapi.FastAPI) a rota
+    GET PREFIXO_DOWNLOADS/{token}, que entrega o arquivo como anexo
+    """
+    from fastapi import Response
+
+    @servidor.get(PREFIXO_DOWNLOADS + "/{token}")
+    def baixar(token: str):
+        arquivo = downloads.buscar(token)
+        if arquivo is None:
+            return Response("Arquivo expirado ou inexistente; gere a exportação novamente.", status_code=404,
+                            media_type="text/plain; charset=utf-8")
+        nome, tipo, conteudo = arquivo
+        return Response(conteudo, media_type=tipo, headers={
+            "Content-Disposition": f'attachment; filename="{nome}"',
+            "Cache-Control": "no-store",
+        })
+
+    return baixar
@@ -0,0 +1,62 @@
+"""Mapa de calor de uma grade de valores como imagem PNG, gerado só com NumPy e zlib."""
+import base64
+import struct
+import zlib
+
+import numpy as np
+
+# Cores do menor ao maior valor (as mesmas da interface)
+CORES = np.array([
+    (0x24, 0xb6, 0x94),
+    (0xa3, 0xb8, 0x08),
+    (0xd2, 0x20, 0x42),
+], dtype=np.float64)
+
+# Lado aproximado da imagem, em pixels
+TAMANHO_IMAGEM = 420
+
+
+def _colorir(grade):
+    """
+    Interpola as CORES conforme a posição de cada valor entre o mínimo e o
+    máximo, em escala logarítmica quando todos são positivos (as prestações
+    caem com o inverso do prazo e a escala linear esconde os prazos longos)
+    """
+    if np.nanmin(grade) > 0:
+        grade = np.log(grade)
+    minimo, maximo = np.nanmin(grade), np.nanmax(grade)
+    posicao = (grade - minimo) / (maximo - minimo) if maximo > minimo else np.zeros_like(grade)
+    posicao = np.nan_to_num(posicao) * (len(CORES) - 1)
+    indice = np.minimum(posicao.astype(np.intp), len(CORES) - 2)
+    fracao = (posicao - indice)[..., np.newaxis]
+    return (CORES[indice] * (1 - fracao) + CORES[indice + 1] * fracao).astype(np.uint8)
+
+
+def _bloco(tipo, dados):
+    return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados))
+
+
+def gerar_png(grade, tamanho=TAMANHO_IMAGEM):
+    """
+    PNG (bytes) com uma célula colorida por elemento da grade; as linhas da
+    grade ficam de cima para baixo e as colunas da esquerda para a direita
+    """
+    grade = np.asarray(grade, dtype=np.float64)
+    escala = max(1, tamanho // max(grade.shape))
+    pixels = _colorir(grade).repeat(escala, axis=0).repeat(escala, axis=1)
+    altura, largura = pixels.shape[:2]
+
+    # Cada linha do PNG começa com o byte do filtro (0 = nenhum)
+    linhas = np.zeros((altura, largura * 3 + 1), dtype=np.uint8)
+    linhas[:, 1:] = pixels.reshape(altura, largura * 3)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _bloco(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0)),
+        _bloco(b"IDAT", zlib.compress(linhas.tobytes(), 6)),
+        _bloco(b"IEND", b""),
+    ])
+
+
+def gerar_png_base64(grade, tamanho=TAMANHO_IMAGEM):
+    """gerar_png codificado em base64, para ft.Image(src_base64=...)"""
+    return base64.b64encode(gerar_png(grade, tamanho)).decode("ascii")
@@ -0,0 +1,94 @@
+"""Recálculo ao vivo com espera (debounce) e descarte dos cálculos obsoletos."""
+import asyncio
+import logging
+import threading
+import time
+
+from .tarefas import ServidorOcupado, executar
+
+logger = logging.getLogger(__name__)
+
+# Espera após a última tecla antes de calcular, em segundos
+ATRASO_PADRAO = 0.3
+
+
+class Recalculo:
+    """
+    Agenda um cálculo para depois que o usuário parar de digitar
+    calcular(): faz o cálculo no executor compartilhado (interface.tarefas)
+    e devolve o resultado (None para não mostrar nada)
+    mostrar(resultado): exibe o resultado na tela; é chamado no loop da
+    página, nunca numa thread do executor
+    agendar() é uma corrotina e deve ser usado como on_change: a espera é
+    feita no loop de eventos, sem criar uma thread por tecla. Uma entrada
+    nova descarta a espera anterior, e um cálculo já em andamento é
+    descartado se chegar uma entrada mais nova antes de ele terminar. A
+    latência entre a última tecla e o resultado exibido fica em
+    ultima_latencia (segundos) e é registrada no log (nível DEBUG).
+    """
+
+    def __init__(self, calcular, mostrar, atraso=ATRASO_PADRAO):
+        self.calcular = calcular
+        self.mostrar = mostrar
+        self.atraso = atraso
+        # cancelar() pode vir de um handler síncrono, em outra thread
+        self._trava = threading.Lock()
+        self._geracao = 0
+        self._ultima_entrada = 0.0
+        self.agendados = 0
+        self.executados = 0
+        self.descartados = 0
+        self.ultima_latencia = None
+
+    async def agendar(self, e=None):
+        """Registra uma nova entrada e calcula após a pausa, se ela ainda for a última"""
+        with self._trava:
+            self._geracao += 1
+            geracao = self._geracao
+            inicio = self._ultima_entrada = time.perf_counter()
+            self.agendados += 1
+
+        await asyncio.sleep(self.atraso)
+        while True:
+            if self._obsoleto(geracao):
+                return
+            try:
+                resultado = await executar(self.calcular)
+                break
+            except ServidorOcupado:
+                # Executor cheio: tenta de novo após outra pausa
+                await asyncio.sleep(self.atraso)
+            except Exception:
+                logger.exception("Erro no recálculo")
+                return
+
+        with self._trava:
+            if self._obsoleto(geracao):
+                self.descartados += 1
+                return
+        if resultado is None:
+            return
+        # Sem a trava: mostrar() roda no loop da página, que é o mesmo de
+        # todas as corrotinas agendar(), então nenhuma outra geração é
+        # exibida entre a verificação acima e esta chamada
+        self.mostrar(resultado)
+        self.executados += 1
+        self.ultima_latencia = time.perf_counter() - inicio
+        logger.debug("Recálculo exibido %.1f ms após a última entrada", self.ultima_latencia * 1000)
+
+    def cancelar(self):
+        """Descarta a espera e o cálculo em andamento"""
+        with self._trava:
+            self._geracao += 1
+
+    def _obsoleto(self, geracao):
+        return geracao != self._geracao
+
+    def estatisticas(self):
+        """Entradas agendadas, cálculos exibidos e descartados, e a última latência"""
+        return {
+            "agendados": self.agendados,
+            "executados": self.executados,
+            "descartados": self.descartados,
+            "ultima_latencia": self.ultima_latencia,
+        }
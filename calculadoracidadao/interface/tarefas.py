@@ -0,0 +1,35 @@
+"""Execução das tarefas pesadas (cálculos grandes e exportações) fora do loop da interface."""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Tarefas executando ao mesmo tempo, somando todas as sessões
+MAX_TAREFAS = min(4, os.cpu_count() or 1)
+# Tarefas aceitas (executando ou na fila) antes de recusar novas
+MAX_PENDENTES = 4 * MAX_TAREFAS
+
+_executor = ThreadPoolExecutor(max_workers=MAX_TAREFAS, thread_name_prefix="calculadora")
+_vagas = threading.BoundedSemaphore(MAX_PENDENTES)
+
+
+class ServidorOcupado(RuntimeError):
+    """Todas as vagas do executor estão ocupadas"""
+
+
+async def executar(funcao, *args, **kwargs):
+    """
+    Executa funcao(*args, **kwargs) no executor compartilhado e aguarda o
+    resultado sem bloquear o loop de eventos
+    Levanta ServidorOcupado se já houver MAX_PENDENTES tarefas aceitas, em
+    vez de deixar a fila crescer sem limite sob carga.
+    """
+    if not _vagas.acquire(blocking=False):
+        raise ServidorOcupado("Muitas tarefas em andamento, tente novamente em instantes")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _executor, functools.partial(funcao, *args, **kwargs)
+        )
+    finally:
+        _vagas.release()
@@ -0,0 +1,219 @@
+"""Relatório PDF das tabelas de amortização, montado página a página a partir das colunas."""
+from functools import lru_cache
+
+from fpdf import FPDF
+
+from calculadoracidadao.amortizacao import INTERVALO_MENSAL, Cronograma, calcular_totais, formatar_datas, iterar_blocos
+from calculadoracidadao.exportacao import CABECALHO_PTBR
+from calculadoracidadao.formatacao import formatar_moeda, formatar_moedas
+
+# Colunas da tabela, em mm (seis colunas ocupam a largura útil do A4)
+LARGURA_COLUNA = 31
+ALTURA_LINHA = 6
+TAMANHO_FONTE = 9
+
+# Parcelas formatadas por vez; um bloco rende várias páginas
+TAMANHO_BLOCO_PDF = 4096
+
+# Espaço reservado ao rodapé, em mm a partir da borda inferior
+ALTURA_RODAPE = 15
+
+
+class _Saida:
+    """
+    Documento final do FPDF acumulado em partes
+    O FPDF faz `buffer += linha` em um atributo, o que copia o documento
+    inteiro a cada linha e torna a saída quadrática no número de páginas.
+    """
+
+    def __init__(self):
+        self.partes = []
+        self.tamanho = 0
+
+    def __iadd__(self, texto):
+        self.partes.append(texto)
+        self.tamanho += len(texto)
+        return self
+
+    def __len__(self):
+        return self.tamanho
+
+    def encode(self, codificacao):
+        return "".join(self.partes).encode(codificacao)
+
+
+class RelatorioPDF(FPDF):
+    """
+    FPDF com cabeçalho da tabela e rodapé (Página n de N) repetidos em todas
+    as páginas
+    As parcelas não passam por cell(): as coordenadas das colunas e das
+    linhas são calculadas uma vez (layout da página) e cada página recebe
+    o texto de todas as suas linhas de uma só vez.
+    """
+
+    def __init__(self, titulo):
+        super().__init__()
+        self.titulo = titulo
+        self.alias_nb_pages()
+        self.set_auto_page_break(False)
+        self.set_margins(12, 10)
+        self.na_tabela = False
+        self.linhas_escritas = 0
+        self.buffer = _Saida()
+
+    def conteudo(self):
+        """O documento (bytes), sem gravar em arquivo"""
+        if self.state < 3:
+            self.close()
+        return self.buffer.encode("latin-1")
+
+    def header(self):
+        if self.page_no() == 1:
+            self.set_font("Arial", "B", 16)
+            self.cell(0, 10, self.titulo, ln=True, align="C")
+            self.ln(5)
+        else:
+            self.set_font("Arial", "I", 8)
+            self.cell(0, 6, self.titulo, ln=True, align="R")
+        if self.na_tabela:
+            self.cabecalho_tabela()
+
+    def footer(self):
+        self.set_y(-ALTURA_RODAPE)
+        self.set_font("Arial", "I", 8)
+        self.cell(0, 10, f"Página {self.page_no()} de {{nb}}", align="C")
+
+    def cabecalho_tabela(self):
+        """Títulos das colunas; a partir daqui as novas páginas os repetem"""
+        self.na_tabela = True
+        self.set_font("Arial", "B", TAMANHO_FONTE)
+        for titulo in CABECALHO_PTBR:
+            self.cell(LARGURA_COLUNA, ALTURA_LINHA, titulo, 1)
+        self.ln()
+
+    def linhas_livres(self):
+        """Quantas linhas da tabela ainda cabem na página atual"""
+        return max(0, int((self.h - ALTURA_RODAPE - self.y) // ALTURA_LINHA))
+
+    def escrever_linhas(self, colunas):
+        """
+        Escreve as linhas da tabela, abrindo novas páginas quando preciso
+        colunas: listas de textos já formatados, uma por coluna da tabela
+        """
+        self.set_font("Arial", "", TAMANHO_FONTE)
+        total = len(colunas[0])
+        inicio = 0
+        while inicio < total:
+            livres = self.linhas_livres()
+            if livres == 0:
+                self.add_page()
+                continue
+            fim = min(total, inicio + livres)
+            self._out(self._pagina_da_tabela(colunas, inicio, fim))
+            self.y += (fim - inicio) * ALTURA_LINHA
+            inicio = fim
+        self.linhas_escritas += total
+
+    def _pagina_da_tabela(self, colunas, inicio, fim):
+        """Operadores PDF das linhas [inicio, fim) a partir da posição atual"""
+        layout = _layout(self.l_margin, self.y, fim - inicio, len(colunas), self.h, self.k, self.c_margin,
+                         self.font_size, self.current_font["i"], self.font_size_pt)
+        textos = "\n".join(map(layout["modelo"].format, layout["alturas"], *(c[inicio:fim] for c in colunas)))
+        return f"{layout['grade']}\nBT {layout['fonte']}\n{textos}\nET"
+
+
+@lru_cache(maxsize=64)
+def _layout(esquerda, topo, linhas, colunas, altura_pagina, k, margem, tamanho_fonte, fonte, tamanho_pt):
+    """
+    Layout de um trecho da tabela: grade de linhas, posição do texto de cada
+    coluna e altura de cada linha, em coordenadas do PDF (pontos, origem
+    embaixo); como as páginas se repetem, cada layout é calculado uma vez
+    """
+    largura = colunas * LARGURA_COLUNA
+    base = topo + linhas * ALTURA_LINHA
+    tracos = [
+        f"{esquerda * k:.2f} {(altura_pagina - y) * k:.2f} m {(esquerda + largura) * k:.2f} {(altura_pagina - y) * k:.2f} l"
+        for y in (topo + i * ALTURA_LINHA for i in range(linhas + 1))
+    ] + [
+        f"{x * k:.2f} {(altura_pagina - topo) * k:.2f} m {x * k:.2f} {(altura_pagina - base) * k:.2f} l"
+        for x in (esquerda + j * LARGURA_COLUNA for j in range(colunas + 1))
+    ]
+    # Mesma posição do texto que cell() usa (alinhado à esquerda, centrado na altura)
+    modelo = " ".join(
+        f"1 0 0 1 {(esquerda + j * LARGURA_COLUNA + margem) * k:.2f} {{0}} Tm ({{{j + 1}}}) Tj" for j in range(colunas)
+    )
+    alturas = [
+        f"{(altura_pagina - (topo + i * ALTURA_LINHA + 0.5 * ALTURA_LINHA + 0.3 * tamanho_fonte)) * k:.2f}"
+        for i in range(linhas)
+    ]
+    return {
+        "grade": " ".join(tracos) + " S",
+        "fonte": f"/F{fonte} {tamanho_pt:.2f} Tf",
+        "modelo": modelo,
+        "alturas": alturas,
+    }
+
+
+def _colunas_formatadas(bloco):
+    """Textos das colunas de um bloco, formatados de uma vez por coluna"""
+    datas = formatar_datas(bloco.data) if bloco.data is not None else [""] * len(bloco)
+    return [bloco.parcela.astype(str).tolist(), datas] + [
+        formatar_moedas(coluna).tolist()
+        for coluna in (bloco.valor_parcela, bloco.amortizacao, bloco.juros, bloco.saldo)
+    ]
+
+
+def montar_relatorio_pdf(valor, parcelas, taxa, tipo, data_primeira_parcela=None, intervalo=INTERVALO_MENSAL,
+                         tamanho_bloco=TAMANHO_BLOCO_PDF, cronograma=None):
+    """
+    Monta o relatório do empréstimo (parâmetros, tabela e totais)
+    Os parâmetros são os de calcular_emprestimo (taxa em %); cronograma:
+    parcelas já calculadas (opcional). Retorna o RelatorioPDF, pronto para
+    output().
+    """
+    sistema = "Tabela Price" if tipo == "price" else "Tabela SAC"
+    pdf = RelatorioPDF(f"Simulação de Empréstimo - {sistema}")
+    pdf.add_page()
+
+    # Parâmetros
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Parâmetros do cálculo:", ln=True)
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 7, f"Valor do empréstimo: {formatar_moeda(valor)}", ln=True)
+    pdf.cell(0, 7, f"Número de parcelas: {parcelas}", ln=True)
+    pdf.cell(0, 7, f"Taxa de juros: {taxa}% ao mês", ln=True)
+    pdf.cell(0, 7, f"Sistema: {sistema}", ln=True)
+    if data_primeira_parcela is not None:
+        pdf.cell(0, 7, f"Data primeira parcela: {data_primeira_parcela.strftime('%d/%m/%Y')}", ln=True)
+    pdf.ln(5)
+
+    # Tabela de resultados
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Resultados:", ln=True)
+    pdf.cabecalho_tabela()
+
+    if cronograma is None:
+        cronograma = iterar_blocos(valor, parcelas, taxa / 100, tipo, data_primeira_parcela, tamanho_bloco, intervalo)
+    elif isinstance(cronograma, Cronograma):
+        cronograma = [cronograma]
+    for bloco in cronograma:
+        pdf.escrever_linhas(_colunas_formatadas(bloco))
+
+    # Linha de totais
+    totais = calcular_totais(valor, parcelas, taxa, tipo)
+    if pdf.linhas_livres() == 0:
+        pdf.add_page()
+    pdf.set_font("Arial", "B", TAMANHO_FONTE)
+    for texto in ["Totais", "", formatar_moeda(totais["valor_parcela"]), formatar_moeda(totais["amortizacao"]),
+                  formatar_moeda(totais["juros"]), ""]:
+        pdf.cell(LARGURA_COLUNA, ALTURA_LINHA, texto, 1)
+    return pdf
+
+
+def exportar_pdf(caminho, valor, parcelas, taxa, tipo, data_primeira_parcela=None, intervalo=INTERVALO_MENSAL,
+                 tamanho_bloco=TAMANHO_BLOCO_PDF, cronograma=None):
+    """Grava o relatório de montar_relatorio_pdf em caminho e retorna o número de páginas"""
+    pdf = montar_relatorio_pdf(valor, parcelas, taxa, tipo, data_primeira_parcela, intervalo, tamanho_bloco,
+                               cronograma)
+    pdf.output(str(caminho), "F")
+    return pdf.page_no()
@@ -0,0 +1,146 @@
+"""
+Relatórios PDF de muitas simulações de uma vez, distribuídos entre processos
+Uso: python -m calculadoracidadao.relatorio_lote contratos.csv pasta_saida
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from calculadoracidadao.relatorio import exportar_pdf
+
+# Lotes por processo: lotes menores equilibram melhor a carga, maiores
+# reduzem a troca de mensagens entre os processos
+LOTES_POR_PROCESSO = 4
+
+CAMPOS = ("valor", "parcelas", "taxa", "tipo", "data_primeira_parcela")
+
+
+def _caminho(simulacao, indice, pasta):
+    if "caminho" in simulacao:
+        return os.fspath(simulacao["caminho"])
+    return os.path.join(pasta, f"simulacao_{simulacao.get('id', indice)}.pdf")
+
+
+def _gerar_lote(lote):
+    """
+    Gera os relatórios de um lote dentro de um processo do pool
+    lote: pares (caminho, simulação); uma falha não interrompe o lote
+    """
+    inicio = time.perf_counter()
+    relatorios = paginas = 0
+    falhas = []
+    for caminho, simulacao in lote:
+        try:
+            paginas += exportar_pdf(caminho, **{campo: simulacao.get(campo) for campo in CAMPOS})
+            relatorios += 1
+        except Exception as err:
+            falhas.append((caminho, f"{type(err).__name__}: {err}"))
+    return {
+        "processo": os.getpid(),
+        "relatorios": relatorios,
+        "paginas": paginas,
+        "falhas": falhas,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def gerar_relatorios(simulacoes, pasta=".", processos=None, tamanho_lote=None):
+    """
+    Gera um PDF por simulação, em paralelo
+    simulacoes: dicionários com os parâmetros de calcular_emprestimo (valor,
+    parcelas, taxa em %, tipo e, opcional, data_primeira_parcela) e o
+    destino: "caminho", ou "id" para gravar pasta/simulacao_<id>.pdf (sem
+    nenhum dos dois, usa a posição na lista)
+    processos: tamanho do pool (padrão: número de CPUs)
+    tamanho_lote: simulações enviadas por vez a um processo (padrão: divide
+    o total em LOTES_POR_PROCESSO lotes por processo)
+    Retorna um dicionário com os totais, as falhas (caminho, erro) e, por
+    processo, relatórios, páginas, falhas e vazão.
+    """
+    tarefas = [(_caminho(simulacao, i, pasta), simulacao) for i, simulacao in enumerate(simulacoes)]
+    processos = processos or os.cpu_count() or 1
+    if tamanho_lote is None:
+        tamanho_lote = max(1, -(-len(tarefas) // (processos * LOTES_POR_PROCESSO)))
+    lotes = [tarefas[i:i + tamanho_lote] for i in range(0, len(tarefas), tamanho_lote)]
+
+    inicio = time.perf_counter()
+    por_processo = {}
+    falhas = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {executor.submit(_gerar_lote, lote): lote for lote in lotes}
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except Exception as err:
+                # O processo morreu (ou o lote não pôde ser enviado): o lote inteiro falhou
+                falhas += [(caminho, f"{type(err).__name__}: {err}") for caminho, _ in futuros[futuro]]
+                continue
+            processo = por_processo.setdefault(resultado["processo"], {
+                "lotes": 0, "relatorios": 0, "paginas": 0, "falhas": 0, "segundos": 0.0,
+            })
+            processo["lotes"] += 1
+            processo["relatorios"] += resultado["relatorios"]
+            processo["paginas"] += resultado["paginas"]
+            processo["falhas"] += len(resultado["falhas"])
+            processo["segundos"] += resultado["segundos"]
+            falhas += resultado["falhas"]
+    segundos = time.perf_counter() - inicio
+
+    for processo in por_processo.values():
+        processo["relatorios_por_segundo"] = processo["relatorios"] / processo["segundos"] if processo["segundos"] else 0.0
+    relatorios = sum(processo["relatorios"] for processo in por_processo.values())
+    paginas = sum(processo["paginas"] for processo in por_processo.values())
+    return {
+        "relatorios": relatorios,
+        "paginas": paginas,
+        "falhas": falhas,
+        "segundos": segundos,
+        "relatorios_por_segundo": relatorios / segundos if segundos else 0.0,
+        "paginas_por_segundo": paginas / segundos if segundos else 0.0,
+        "processos": por_processo,
+    }
+
+
+def ler_simulacoes(caminho):
+    """
+    Lê as simulações de um CSV com as colunas id, valor, parcelas, taxa (%),
+    tipo e, opcional, data_primeira_parcela (aaaa-mm-dd)
+    """
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        for linha in csv.DictReader(arquivo):
+            data = linha.get("data_primeira_parcela")
+            yield {
+                "id": linha["id"],
+                "valor": float(linha["valor"]),
+                "parcelas": int(linha["parcelas"]),
+                "taxa": float(linha["taxa"]),
+                "tipo": linha["tipo"],
+                "data_primeira_parcela": datetime.strptime(data, "%Y-%m-%d") if data else None,
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um relatório PDF por simulação de um CSV de contratos")
+    parser.add_argument("contratos", help="CSV com id, valor, parcelas, taxa, tipo e data_primeira_parcela")
+    parser.add_argument("pasta", help="pasta onde os PDFs serão gravados")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--tamanho-lote", type=int, default=None)
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta, exist_ok=True)
+    resultado = gerar_relatorios(ler_simulacoes(args.contratos), args.pasta, args.processos, args.tamanho_lote)
+    for pid, processo in sorted(resultado["processos"].items()):
+        print(f"processo {pid}: {processo['relatorios']} relatórios em {processo['lotes']} lotes, "
+              f"{processo['relatorios_por_segundo']:.1f}/s, {processo['falhas']} falhas")
+    print(f"total: {resultado['relatorios']} relatórios ({resultado['paginas']} páginas) em "
+          f"{resultado['segundos']:.2f} s, {resultado['relatorios_por_segundo']:.1f} relatórios/s, "
+          f"{len(resultado['falhas'])} falhas")
+    for caminho, erro in resultado["falhas"]:
+        print(f"falhou {caminho}: {erro}")
+
+
+if __name__ == "__main__":
+    main()
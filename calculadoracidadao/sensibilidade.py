@@ -0,0 +1,35 @@
+"""Grade de sensibilidade das prestações a taxa e prazo, calculada por broadcasting."""
+import numpy as np
+
+
+def calcular_grade_prestacoes(valor_financiado, taxas, prazos):
+    """
+    Prestação fixa (Tabela Price) para cada combinação de taxa e prazo
+    taxas: taxas de juros mensais (decimal), uma por linha da grade
+    prazos: números de meses, um por coluna da grade
+    Retorna um array (len(taxas), len(prazos)); o elemento [i, j] é igual a
+    calcular_prestacao(valor_financiado, taxas[i], prazos[j]).
+    """
+    taxas = np.asarray(taxas, dtype=np.float64)
+    prazos = np.asarray(prazos, dtype=np.float64)
+    if taxas.ndim != 1 or prazos.ndim != 1:
+        raise ValueError("Taxas e prazos devem ser listas de valores")
+    if np.any(prazos < 1):
+        raise ValueError("Os prazos devem ser maiores que zero")
+
+    # (1 + i) ** -n para todas as combinações de uma vez
+    desconto = np.exp(np.multiply.outer(-np.log1p(taxas), prazos))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grade = valor_financiado * taxas[:, np.newaxis] / (1 - desconto)
+
+    sem_juros = taxas == 0
+    if sem_juros.any():
+        grade[sem_juros] = valor_financiado / prazos
+    return grade
+
+
+def faixa(inicio, fim, quantidade):
+    """quantidade valores igualmente espaçados de inicio a fim (inclusive)"""
+    if quantidade < 1:
+        raise ValueError("A quantidade deve ser maior que zero")
+    return np.linspace(inicio, fim, quantidade)
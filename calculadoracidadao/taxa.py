@@ -0,0 +1,237 @@
+"""Cálculo da taxa de juros implícita de um financiamento com prestações fixas."""
+import math
+
+import numpy as np
+
+# Situação de cada contrato em resolver_taxas
+STATUS_CONVERGIU = 0
+STATUS_NAO_CONVERGIU = 1
+STATUS_INVALIDO = 2
+
+
+def _valor_presente(taxa, prestacao, meses):
+    """Valor presente das prestações e sua derivada em relação à taxa"""
+    if abs(taxa) < 1e-8:
+        # Expansão em série perto de zero, onde a fórmula fechada perde precisão
+        valor = prestacao * meses * (1 - (meses + 1) * taxa / 2)
+        derivada = -prestacao * meses * (meses + 1) / 2
+        return valor, derivada
+
+    fator = (1 + taxa) ** -meses
+    valor = prestacao * (1 - fator) / taxa
+    derivada = prestacao * (meses * fator / (1 + taxa) * taxa - (1 - fator)) / taxa ** 2
+    return valor, derivada
+
+
+def _brent(f, a, b, fa, fb, precisao, max_iteracoes):
+    """Método de Brent em um intervalo [a, b] com f(a) e f(b) de sinais opostos"""
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+
+    for iteracao in range(1, max_iteracoes + 1):
+        if fb == 0:
+            return b, iteracao
+        if fa * fb > 0:
+            a, fa = c, fc
+            d = e = b - a
+        if abs(fa) < abs(fb):
+            c, fc = b, fb
+            b, fb = a, fa
+            a, fa = c, fc
+
+        tolerancia = 2 * 2.2e-16 * abs(b) + precisao / 2
+        meio = (a - b) / 2
+        if abs(meio) <= tolerancia:
+            return b, iteracao
+
+        if abs(e) >= tolerancia and abs(fc) > abs(fb):
+            # Interpolação (secante ou quadrática inversa)
+            s = fb / fc
+            if a == c:
+                p = 2 * meio * s
+                q = 1 - s
+            else:
+                q = fc / fa
+                r = fb / fa
+                p = s * (2 * meio * q * (q - r) - (b - c) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * meio * q - abs(tolerancia * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = meio
+        else:
+            d = e = meio
+
+        c, fc = b, fb
+        b += d if abs(d) > tolerancia else math.copysign(tolerancia, meio)
+        fb = f(b)
+
+    return b, max_iteracoes
+
+
+def resolver_taxa(prestacao, meses, valor_financiado, precisao=0.000001, max_iteracoes=50):
+    """
+    Calcula a taxa de juros mensal pelo método de Newton com salvaguarda
+    prestacao: valor da prestação
+    meses: número de prestações
+    valor_financiado: valor financiado
+    precisao: tolerância da taxa (decimal)
+    Retorna um dicionário com taxa (decimal), iteracoes e metodo
+    ('exato', 'newton' ou 'brent')
+    """
+    if prestacao <= 0 or valor_financiado <= 0 or meses < 1:
+        raise ValueError("Prestação, meses e valor financiado devem ser positivos")
+
+    total = prestacao * meses
+    if math.isclose(total, valor_financiado, rel_tol=1e-12):
+        return {"taxa": 0.0, "iteracoes": 0, "metodo": "exato"}
+    if total < valor_financiado:
+        raise ValueError("As prestações não cobrem o valor financiado")
+
+    def f(taxa):
+        return _valor_presente(taxa, prestacao, meses)[0] - valor_financiado
+
+    # f é decrescente: positiva à esquerda da raiz e negativa à direita
+    a, fa = 0.0, total - valor_financiado
+    b = prestacao / valor_financiado
+    fb = f(b)
+    while fb > 0:
+        a, fa = b, fb
+        b *= 2
+        fb = f(b)
+
+    # Estimativa inicial: a maior entre a aproximação para prazos curtos
+    # (série de Taylor em zero) e a de prazos longos (perpetuidade)
+    taxa = max(2 * (total - valor_financiado) / (total * (meses + 1)),
+               prestacao / valor_financiado - 1 / meses)
+    taxa = min(max(taxa, a), b)
+
+    for iteracao in range(1, max_iteracoes + 1):
+        valor, derivada = _valor_presente(taxa, prestacao, meses)
+        fx = valor - valor_financiado
+        if fx > 0:
+            a, fa = taxa, fx
+        else:
+            b, fb = taxa, fx
+
+        nova = taxa - fx / derivada if derivada else math.nan
+        if abs(nova - taxa) < precisao:
+            return {"taxa": nova, "iteracoes": iteracao, "metodo": "newton"}
+        if not a <= nova <= b:
+            # Passo de Newton fora do intervalo: conclui com Brent
+            raiz, extra = _brent(f, a, b, fa, fb, precisao, max_iteracoes)
+            return {"taxa": raiz, "iteracoes": iteracao + extra, "metodo": "brent"}
+        taxa = nova
+
+    raiz, extra = _brent(f, a, b, fa, fb, precisao, max_iteracoes)
+    return {"taxa": raiz, "iteracoes": max_iteracoes + extra, "metodo": "brent"}
+
+
+def calcular_taxa_juros(prestacao, meses, valor_financiado, precisao=0.000001):
+    """Taxa de juros mensal (decimal) que iguala as prestações ao valor financiado"""
+    return resolver_taxa(prestacao, meses, valor_financiado, precisao)["taxa"]
+
+
+def _valor_presente_vetorizado(taxa, prestacao, meses):
+    """Versão de _valor_presente para arrays"""
+    perto_de_zero = np.abs(taxa) < 1e-8
+    segura = np.where(perto_de_zero, 1.0, taxa)
+    fator = (1 + segura) ** -meses
+    valor = np.where(
+        perto_de_zero,
+        prestacao * meses * (1 - (meses + 1) * taxa / 2),
+        prestacao * (1 - fator) / segura,
+    )
+    derivada = np.where(
+        perto_de_zero,
+        -prestacao * meses * (meses + 1) / 2,
+        prestacao * (meses * fator / (1 + segura) * segura - (1 - fator)) / segura ** 2,
+    )
+    return valor, derivada
+
+
+def resolver_taxas(prestacoes, meses, valores_financiados, precisao=0.000001, max_iteracoes=50):
+    """
+    Calcula a taxa de juros mensal de muitos contratos de uma só vez
+    prestacoes, meses, valores_financiados: arrays (ou escalares) compatíveis
+    precisao: tolerância da taxa (decimal)
+    Todos os contratos iteram juntos pelo método de Newton; os que convergem
+    saem do conjunto ativo e os passos que deixam o intervalo viram bisseção.
+    Retorna um dicionário com os arrays taxa (decimal), status
+    (STATUS_CONVERGIU, STATUS_NAO_CONVERGIU ou STATUS_INVALIDO) e iteracoes
+    """
+    prestacoes, meses, valores_financiados = np.broadcast_arrays(
+        np.asarray(prestacoes, dtype=np.float64),
+        np.asarray(meses, dtype=np.float64),
+        np.asarray(valores_financiados, dtype=np.float64),
+    )
+    forma = prestacoes.shape
+    p = prestacoes.ravel()
+    n = meses.ravel()
+    v = valores_financiados.ravel()
+
+    taxas = np.full(p.size, np.nan)
+    status = np.full(p.size, STATUS_INVALIDO, dtype=np.int8)
+    iteracoes = np.zeros(p.size, dtype=np.int16)
+
+    with np.errstate(invalid="ignore"):
+        total = p * n
+        validos = (p > 0) & (v > 0) & (n >= 1) & np.isfinite(total) & np.isfinite(v)
+        zero = validos & np.isclose(total, v, rtol=1e-12, atol=0)
+        taxas[zero] = 0.0
+        status[zero] = STATUS_CONVERGIU
+
+        ativos = np.flatnonzero(validos & ~zero & (total > v))
+    status[ativos] = STATUS_NAO_CONVERGIU
+    p, n, v, total = p[ativos], n[ativos], v[ativos], total[ativos]
+
+    # Intervalo [a, b] com f(a) > 0 > f(b), expandido enquanto necessário
+    a = np.zeros(ativos.size)
+    b = p / v
+    while True:
+        expandir = _valor_presente_vetorizado(b, p, n)[0] > v
+        if not expandir.any():
+            break
+        a[expandir] = b[expandir]
+        b[expandir] *= 2
+
+    taxa = np.maximum(2 * (total - v) / (total * (n + 1)), p / v - 1 / n)
+    taxa = np.clip(taxa, a, b)
+
+    for iteracao in range(1, max_iteracoes + 1):
+        if not ativos.size:
+            break
+        valor, derivada = _valor_presente_vetorizado(taxa, p, n)
+        fx = valor - v
+        positivo = fx > 0
+        a = np.where(positivo, taxa, a)
+        b = np.where(positivo, b, taxa)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nova = taxa - fx / derivada
+        convergiu = np.abs(nova - taxa) < precisao
+        fora = ~convergiu & ~((nova >= a) & (nova <= b))
+        nova[fora] = (a[fora] + b[fora]) / 2
+        convergiu |= fora & (b - a < precisao)
+        concluidos = ativos[convergiu]
+        taxas[concluidos] = nova[convergiu]
+        status[concluidos] = STATUS_CONVERGIU
+        iteracoes[concluidos] = iteracao
+
+        continuar = ~convergiu
+        ativos, taxa = ativos[continuar], nova[continuar]
+        a, b, p, n, v = a[continuar], b[continuar], p[continuar], n[continuar], v[continuar]
+
+    taxas[ativos] = taxa
+    iteracoes[ativos] = max_iteracoes
+
+    return {
+        "taxa": taxas.reshape(forma),
+        "status": status.reshape(forma),
+        "iteracoes": iteracoes.reshape(forma),
+    }
@@ -1,15 +1,67 @@
+import asyncio
+import functools
+import io
+import os
+import sys
+
 import flet as ft
-import locale
-import numpy_financial as npf
-from datetime import datetime, timedelta
-from fpdf import FPDF
+from datetime import datetime
+
+from calculadoracidadao import amortizacao, financeiro
+from calculadoracidadao.formatacao import formatar_moeda, formatar_moedas
+from calculadoracidadao.cache import CacheLRU
+from calculadoracidadao.exportacao import FORMATO_NUMERICO, FORMATO_PTBR, exportar_csv
+from calculadoracidadao.interface.atualizacao import Atualizador
+from calculadoracidadao.interface.downloads import (
+    TIPO_CSV,
+    TIPO_PDF,
+    ArquivosTemporarios,
+    Downloads,
+    entregar_arquivo,
+    registrar_rota,
+)
+from calculadoracidadao.interface.mapa_calor import gerar_png_base64
+from calculadoracidadao.interface.recalculo import Recalculo
+from calculadoracidadao.interface.tarefas import ServidorOcupado, executar
+from calculadoracidadao.relatorio import montar_relatorio_pdf
+from calculadoracidadao.sensibilidade import calcular_grade_prestacoes, faixa
+from calculadoracidadao.taxa import resolver_taxa
+
+
+def tamanho_simulacao(simulacao):
+    """Bytes ocupados pelas colunas de uma simulação guardada no cache"""
+    if "resultados" in simulacao:
+        resultados = simulacao["resultados"]
+        return sum(resultados[sistema].nbytes for sistema in ("price", "sac", "diferenca"))
+    return simulacao["cronograma"].nbytes
+
+
+# Simulações já calculadas, compartilhadas por todas as sessões (flet run -w).
+# Guardam só as colunas numéricas (cerca de 40 bytes por parcela); o texto é
+# gerado por página, na exibição.
+cache_simulacoes = CacheLRU(tamanho_maximo=256, max_bytes=256 * 2**20, medir=tamanho_simulacao)
 
-# Configurar locale para pt-BR
-locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
+# Parcelas exibidas por página na tabela do simulador
+LINHAS_POR_PAGINA = 60
+
+# Colunas da tabela do simulador em cada modo
+COLUNAS_SIMULACAO = ["Parcela", "Data", "Valor", "Amortização", "Juros", "Saldo"]
+COLUNAS_COMPARACAO = ["Parcela", "Data", "Price", "SAC", "Diferença", "Diferença de juros"]
+
+# Maior grade de prestações exibida como tabela (maiores: mapa de calor ou CSV)
+LIMITE_CELULAS_TABELA = 3000
+
+# Maior grade de prestações calculada: taxas (linhas) e prazos (colunas)
+MAX_TAXAS_GRADE = 200
+MAX_PRAZOS_GRADE = 420
 
 class MainApp:
     def __init__(self):
         self.current_tab = None
+        # Arquivos exportados no modo web, em memória e por sessão (veja app_web)
+        self.downloads = Downloads()
+        self.servindo_downloads = False
+        self.temporarios = ArquivosTemporarios()
         
     def main(self, page: ft.Page):
         page.title = "Calculadora Financeira"
@@ -18,10 +70,12 @@ class MainApp:
         page.theme_mode = ft.ThemeMode.DARK
         page.window_width = 1200
         page.window_height = 800
+        page.on_close = lambda e: self.downloads.remover_sessao(page.session_id)
+        atualizador = Atualizador(page)
         
         def change_tab(e):
-            tabs_content.content = tab_contents[e.control.selected_index]
-            page.update()
+            tabs_content.content = obter_conteudo(e.control.selected_index)
+            atualizador.enviar(tabs_content)
 
         # Container para conteúdo das abas
         tabs_content = ft.Container(
@@ -58,16 +112,23 @@ class MainApp:
             ],
         )
 
-        # Conteúdo de cada aba
-        tab_contents = [
-            self.create_calculadora_tab(page),
-            self.create_simulador_tab(page),
-            self.create_financiamento_tab(page),
-            self.create_help_tab(page)
+        # Conteúdo de cada aba, criado na primeira vez em que ela é aberta
+        # e mantido para o resto da sessão
+        criar_aba = [
+            self.create_calculadora_tab,
+            self.create_simulador_tab,
+            self.create_financiamento_tab,
+            self.create_help_tab
         ]
+        tab_contents = {}
+
+        def obter_conteudo(indice):
+            if indice not in tab_contents:
+                tab_contents[indice] = criar_aba[indice](page)
+            return tab_contents[indice]
 
         # Definir conteúdo inicial
-        tabs_content.content = tab_contents[0]
+        tabs_content.content = obter_conteudo(0)
 
         # Layout principal
         page.add(
@@ -78,31 +139,88 @@ class MainApp:
         )
 
     def calcular_taxa_juros(self, prestacao, meses, valor_financiado, precisao=0.000001):
-        j_min = 0
-        j_max = 1
-        j = (j_min + j_max) / 2
-
-        while j_max - j_min > precisao:
-            q0 = (((1 - (1 + j) ** -meses)) / j) * prestacao
-            if q0 < valor_financiado:
-                j_min = j
-            else:
-                j_max = j
-            j = (j_min + j_max) / 2
-
-        return j
+        return resolver_taxa(prestacao, meses, valor_financiado, precisao)["taxa"]
 
     def calcular_prestacao(self, valor_financiado, taxa_juros, meses):
-        prestacao = valor_financiado * (taxa_juros / (1 - (1 + taxa_juros) ** -meses))
-        return prestacao
+        return financeiro.calcular_prestacao(valor_financiado, taxa_juros, meses)
 
     def calcular_valor_financiado(self, prestacao, taxa_juros, meses):
-        valor_financiado = prestacao * ((1 - (1 + taxa_juros) ** -meses) / taxa_juros)
-        return valor_financiado
+        return financeiro.calcular_valor_financiado(prestacao, taxa_juros, meses)
+
+    def totais_formatados(self, valor, parcelas, taxa, tipo):
+        """Linha de totais da tabela do empréstimo, calculada sem gerar as parcelas"""
+        totais = amortizacao.calcular_totais(valor, parcelas, taxa, tipo)
+        return (
+            "Totais",
+            "",
+            formatar_moeda(totais["valor_parcela"]),
+            formatar_moeda(totais["amortizacao"]),
+            formatar_moeda(totais["juros"]),
+            "",
+        )
+
+    def simular_primeira_pagina(self, valor, parcelas, taxa, tipo, data_primeira_parcela):
+        """
+        Só a primeira página (LINHAS_POR_PAGINA parcelas) e os totais, para
+        exibir a tabela em tempo constante enquanto o restante é calculado
+        """
+        bloco = next(amortizacao.iterar_blocos(valor, parcelas, taxa / 100, tipo, data_primeira_parcela,
+                                               tamanho_bloco=LINHAS_POR_PAGINA))
+        return {
+            "cronograma": bloco,
+            "totais": self.totais_formatados(valor, parcelas, taxa, tipo),
+            "parcelas": parcelas,
+        }
+
+    def simular_emprestimo(self, valor, parcelas, taxa, tipo, data_primeira_parcela):
+        """Cronograma completo e a linha de totais; as parcelas são formatadas por página (linhas_simulacao)"""
+        return {
+            "cronograma": amortizacao.calcular_emprestimo(valor, parcelas, taxa, tipo, data_primeira_parcela),
+            "totais": self.totais_formatados(valor, parcelas, taxa, tipo),
+            "parcelas": parcelas,
+        }
+
+    def simular_comparacao(self, valor, parcelas, taxa, data_primeira_parcela):
+        """
+        Calcula Price e SAC juntos, com a linha de totais já formatada; as
+        prestações de cada sistema e as diferenças mês a mês (colunas de
+        COLUNAS_COMPARACAO) são formatadas por página (linhas_simulacao)
+        """
+        def calcular():
+            comparacao = amortizacao.calcular_comparacao(valor, parcelas, taxa, data_primeira_parcela)
+            price, sac, diferenca = comparacao["price"], comparacao["sac"], comparacao["diferenca"]
+            totais = (
+                "Totais",
+                "",
+                formatar_moeda(price.totais["valor_parcela"]),
+                formatar_moeda(sac.totais["valor_parcela"]),
+                formatar_moeda(diferenca.totais["valor_parcela"]),
+                formatar_moeda(diferenca.totais["juros"]),
+            )
+            return {"resultados": comparacao, "totais": totais, "parcelas": parcelas}
+
+        chave = ("comparacao", valor, parcelas, taxa, data_primeira_parcela)
+        return cache_simulacoes.obter(chave, calcular)
+
+    def linhas_simulacao(self, simulacao, inicio, fim):
+        """Linhas [inicio, fim) da tabela do simulador, formatadas na hora"""
+        if "resultados" not in simulacao:
+            return simulacao["cronograma"].linhas_formatadas(inicio=inicio, fim=fim)
+        comparacao = simulacao["resultados"]
+        price, sac, diferenca = comparacao["price"], comparacao["sac"], comparacao["diferenca"]
+        return list(zip(
+            map(str, range(inicio + 1, fim + 1)),
+            amortizacao.formatar_datas(price.data[inicio:fim]),
+            *(formatar_moedas(coluna[inicio:fim]).tolist()
+              for coluna in (price.valor_parcela, sac.valor_parcela, diferenca.valor_parcela, diferenca.juros)),
+        ))
 
     def create_calculadora_tab(self, page):
+        atualizador = Atualizador(page)
+
         # Primeira calculadora (app1.py)
-        def calcular(e):
+        def calcular_resultado(ao_vivo=False):
+            """Texto e cor do resultado; None ao vivo enquanto faltam campos"""
             try:
                 # Contando campos preenchidos
                 campos_preenchidos = sum(1 for campo in [
@@ -112,56 +230,54 @@ class MainApp:
                     taxa_juros.value
                 ] if campo)
 
+                if ao_vivo and campos_preenchidos < 3:
+                    return None
                 if campos_preenchidos != 3:
-                    resultado.value = "Erro: Preencha exatamente 3 campos para realizar o cálculo"
-                    resultado.color = "#d22042"
-                    resultado.visible = True
-                    page.update()
-                    return
+                    return "Erro: Preencha exatamente 3 campos para realizar o cálculo", "#d22042"
 
-                if valor_financiado.value and prestacao.value and meses.value:
-                    vf = float(valor_financiado.value.replace(',', '.'))
-                    m = int(meses.value)
-                    p = float(prestacao.value.replace(',', '.'))
-                    
+                # Erros de digitação e erros do cálculo têm mensagens diferentes
+                try:
+                    vf = float(valor_financiado.value.replace(',', '.')) if valor_financiado.value else None
+                    m = int(meses.value) if meses.value else None
+                    p = float(prestacao.value.replace(',', '.')) if prestacao.value else None
+                    taxa = float(taxa_juros.value.replace(',', '.')) / 100 if taxa_juros.value else None
+                except ValueError:
+                    return "Erro: Verifique se os valores inseridos são números válidos", "#d22042"
+
+                if vf is not None and p is not None and m is not None:
                     taxa = self.calcular_taxa_juros(p, m, vf)
                     taxa_percentual = taxa * 100
                     
-                    resultado.value = f"Taxa de juros mensal calculada: {taxa_percentual:.2f}%"
-                    resultado.color = "#a3b808"
-                    
-                elif taxa_juros.value and prestacao.value and meses.value:
-                    taxa = float(taxa_juros.value.replace(',', '.')) / 100
-                    p = float(prestacao.value.replace(',', '.'))
-                    m = int(meses.value)
+                    return f"Taxa de juros mensal calculada: {taxa_percentual:.2f}%", "#a3b808"
                     
+                elif taxa is not None and p is not None and m is not None:
                     vf = self.calcular_valor_financiado(p, taxa, m)
                     
-                    resultado.value = f"Valor financiado calculado: R$ {vf:.2f}"
-                    resultado.color = "#a3b808"
-                    
-                elif valor_financiado.value and taxa_juros.value and meses.value:
-                    vf = float(valor_financiado.value.replace(',', '.'))
-                    taxa = float(taxa_juros.value.replace(',', '.')) / 100
-                    m = int(meses.value)
+                    return f"Valor financiado calculado: R$ {vf:.2f}", "#a3b808"
                     
+                elif vf is not None and taxa is not None and m is not None:
                     p = self.calcular_prestacao(vf, taxa, m)
                     
-                    resultado.value = f"Valor da prestação calculado: R$ {p:.2f}"
-                    resultado.color = "#a3b808"
-                    
-                resultado.visible = True
-                    
-            except ValueError:
-                resultado.value = "Erro: Verifique se os valores inseridos são números válidos"
-                resultado.color = "#d22042"
-                resultado.visible = True
+                    return f"Valor da prestação calculado: R$ {p:.2f}", "#a3b808"
+
+            except ValueError as e:
+                return f"Erro: {e}", "#d22042"
             except Exception as e:
-                resultado.value = f"Erro no cálculo: {str(e)}"
-                resultado.color = "#d22042"
-                resultado.visible = True
-                
-            page.update()
+                return f"Erro no cálculo: {str(e)}", "#d22042"
+
+        def mostrar(texto_cor):
+            resultado.value, resultado.color = texto_cor
+            resultado.visible = True
+            atualizador.enviar(resultado)
+
+        def calcular(e):
+            recalculo.cancelar()
+            texto_cor = calcular_resultado()
+            if texto_cor is not None:
+                mostrar(texto_cor)
+
+        # Recalcula enquanto o usuário digita, após uma pausa
+        recalculo = Recalculo(lambda: calcular_resultado(ao_vivo=True), mostrar)
 
         # Campos de entrada
         taxa_juros = ft.TextField(
@@ -170,6 +286,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         meses = ft.TextField(
@@ -178,6 +295,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         prestacao = ft.TextField(
@@ -186,6 +304,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         valor_financiado = ft.TextField(
@@ -194,6 +313,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
 
         resultado = ft.Text(size=16, color="#a3b808", visible=False)
@@ -209,6 +329,22 @@ class MainApp:
             width=300,
         )
 
+        # A grade de prestações só é criada quando aberta, para não pesar na
+        # primeira exibição da aba
+        def abrir_grade(e):
+            grade.content = self.create_grade_prestacoes(page)
+            atualizador.enviar(grade)
+
+        grade = ft.Container(
+            ft.OutlinedButton(
+                text="Grade de prestações (taxa × prazo)",
+                icon=ft.icons.GRID_ON,
+                on_click=abrir_grade,
+                height=45,
+                width=300,
+            )
+        )
+
         instrucoes = ft.Column([
             ft.Text("Instruções", size=20, weight="bold", color="#24b694"),
             ft.Text(
@@ -237,60 +373,195 @@ class MainApp:
             prestacao,
             valor_financiado,
             calcular_button,
-            resultado
+            resultado,
+            ft.Divider(height=20, color="transparent"),
+            grade,
         ], scroll=ft.ScrollMode.AUTO, spacing=20)
 
+    def calcular_grade(self, valor, taxas, prazos, modo):
+        """
+        Prestações para cada taxa (linhas, em decimal) e prazo (colunas), já
+        prontas para exibição: a imagem do mapa de calor ou os textos da tabela
+        """
+        prestacoes = calcular_grade_prestacoes(valor, taxas, prazos)
+        grade = {"valor": valor, "taxas": taxas, "prazos": prazos, "prestacoes": prestacoes}
+        if modo == "mapa":
+            grade["imagem"] = gerar_png_base64(prestacoes)
+        elif prestacoes.size <= LIMITE_CELULAS_TABELA:
+            grade["textos"] = formatar_moedas(prestacoes).tolist()
+        return grade
+
+    def create_grade_prestacoes(self, page):
+        """Grade de prestações por taxa e prazo, para comparar condições de uma vez"""
+        atualizador = Atualizador(page)
+        grade_atual = None
+
+        def campo(label, valor, largura=140):
+            return ft.TextField(
+                label=label,
+                value=valor,
+                width=largura,
+                border_color="#24b694",
+                focused_border_color="#24b694",
+                color="#30c4c9",
+            )
+
+        async def gerar_grade(e):
+            nonlocal grade_atual
+            try:
+                valor = float(grade_valor.value.replace(',', '.'))
+                taxas = faixa(float(taxa_inicial.value.replace(',', '.')) / 100,
+                              float(taxa_final.value.replace(',', '.')) / 100,
+                              int(num_taxas.value))
+                prazos = range(int(prazo_inicial.value), int(prazo_final.value) + 1)
+                if not prazos:
+                    raise ValueError("Prazo final menor que o inicial")
+            except ValueError:
+                legenda.value = "Erro: Verifique se os valores da grade são números válidos"
+                legenda.color = "#d22042"
+                atualizador.enviar(legenda)
+                return
+            if len(taxas) > MAX_TAXAS_GRADE or len(prazos) > MAX_PRAZOS_GRADE:
+                legenda.value = (f"Erro: A grade aceita até {MAX_TAXAS_GRADE} taxas e "
+                                 f"{MAX_PRAZOS_GRADE} prazos")
+                legenda.color = "#d22042"
+                atualizador.enviar(legenda)
+                return
+            prazos = list(prazos)
+
+            btn_grade.disabled = btn_csv_grade.disabled = True
+            atualizador.enviar(btn_grade, btn_csv_grade)
+            try:
+                grade_atual = await executar(self.calcular_grade, valor, taxas, prazos, modo.value)
+                mostrar_grade()
+            except Exception as err:
+                legenda.value = f"Erro no cálculo: {str(err)}"
+                legenda.color = "#d22042"
+            finally:
+                btn_grade.disabled = btn_csv_grade.disabled = False
+                btn_csv_grade.visible = grade_atual is not None
+                atualizador.enviar(legenda, mapa, rolagem_tabela, btn_grade, btn_csv_grade)
+
+        def mostrar_grade():
+            prestacoes = grade_atual["prestacoes"]
+            taxas, prazos = grade_atual["taxas"], grade_atual["prazos"]
+            legenda.value = (
+                f"Linhas: taxas de {taxas[0] * 100:.2f}% a {taxas[-1] * 100:.2f}% ao mês. "
+                f"Colunas: prazos de {prazos[0]} a {prazos[-1]} meses. "
+                f"Prestações de {formatar_moeda(prestacoes.min())} a {formatar_moeda(prestacoes.max())}."
+            )
+            legenda.color = "#a3b808"
+            mapa.visible = "imagem" in grade_atual
+            rolagem_tabela.visible = "textos" in grade_atual
+            if mapa.visible:
+                mapa.src_base64 = grade_atual["imagem"]
+                legenda.value += " No mapa, do verde (menor) ao vermelho (maior)."
+            elif rolagem_tabela.visible:
+                textos = grade_atual["textos"]
+                tabela.columns = [ft.DataColumn(ft.Text("Taxa / Prazo"))] + [
+                    ft.DataColumn(ft.Text(str(prazo))) for prazo in prazos
+                ]
+                tabela.rows = [
+                    ft.DataRow(cells=[ft.DataCell(ft.Text(f"{taxa * 100:.2f}%", weight=ft.FontWeight.BOLD))]
+                               + [ft.DataCell(ft.Text(texto)) for texto in linha])
+                    for taxa, linha in zip(taxas.tolist(), textos)
+                ]
+            else:
+                legenda.value += (f" A tabela mostra até {LIMITE_CELULAS_TABELA} valores; "
+                                  "use o mapa de calor ou baixe o CSV.")
+
+        async def trocar_modo(e):
+            if grade_atual is not None:
+                await gerar_grade(e)
+
+        async def baixar_csv_grade(e):
+            btn_csv_grade.disabled = True
+            atualizador.enviar(btn_csv_grade)
+            try:
+                conteudo = await executar(self.conteudo_csv_grade, grade_atual)
+                self.entregar_arquivo(page, "grade_prestacoes.csv", conteudo, TIPO_CSV)
+            except Exception:
+                page.show_snack_bar(ft.SnackBar(content=ft.Text("Não foi possível gerar o arquivo"),
+                                                bgcolor="#d22042"))
+            finally:
+                btn_csv_grade.disabled = False
+                atualizador.enviar(btn_csv_grade)
+
+        grade_valor = campo("Valor financiado (R$)", "", largura=300)
+        taxa_inicial = campo("Taxa inicial (%)", "0.5")
+        taxa_final = campo("Taxa final (%)", "3")
+        num_taxas = campo("Nº de taxas", "50")
+        prazo_inicial = campo("Prazo inicial", "12")
+        prazo_final = campo("Prazo final", "71")
+
+        modo = ft.RadioGroup(
+            value="mapa",
+            on_change=trocar_modo,
+            content=ft.Row([
+                ft.Radio(value="mapa", label="Mapa de calor"),
+                ft.Radio(value="tabela", label="Tabela"),
+            ]),
+        )
+        btn_grade = ft.ElevatedButton(
+            text="Gerar grade",
+            on_click=gerar_grade,
+            style=ft.ButtonStyle(
+                color=ft.colors.WHITE,
+                bgcolor={"": "#24b694"},
+            ),
+            height=45,
+            width=300,
+        )
+        btn_csv_grade = ft.ElevatedButton(
+            text="Baixar CSV da grade",
+            on_click=baixar_csv_grade,
+            visible=False,
+            style=ft.ButtonStyle(
+                color=ft.colors.WHITE,
+                bgcolor={"": "#a3b808"},
+            ),
+            height=45,
+            width=300,
+        )
+        legenda = ft.Text(size=16, color="#a3b808")
+        mapa = ft.Image(width=600, height=420, fit=ft.ImageFit.FILL, visible=False)
+        tabela = ft.DataTable(columns=[ft.DataColumn(ft.Text(""))], rows=[])
+        rolagem_tabela = ft.Row([tabela], scroll=ft.ScrollMode.AUTO, visible=False)
+
+        return ft.Column([
+            ft.Text("Grade de prestações (taxa × prazo)", size=20, weight="bold", color="#24b694"),
+            ft.Text(
+                "Calcula a prestação para várias taxas e prazos de uma só vez.",
+                size=16,
+                color="#30c4c9"
+            ),
+            grade_valor,
+            ft.Row([taxa_inicial, taxa_final, num_taxas]),
+            ft.Row([prazo_inicial, prazo_final]),
+            modo,
+            ft.Row([btn_grade, btn_csv_grade]),
+            legenda,
+            mapa,
+            rolagem_tabela,
+        ], spacing=20)
+
     def create_simulador_tab(self, page):
-        def calcular_emprestimo(valor, parcelas, taxa, tipo, data_primeira_parcela):
-            taxa = taxa / 100
-            resultados = []
-            
-            if tipo == "price":
-                pmt = -npf.pmt(taxa, parcelas, valor)
-                saldo = valor
-                
-                for i in range(1, parcelas + 1):
-                    juros = saldo * taxa
-                    amortizacao = pmt - juros
-                    saldo = saldo - amortizacao
-                    
-                    data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
-                    
-                    resultados.append({
-                        "parcela": i,
-                        "valor_parcela": pmt,
-                        "amortizacao": amortizacao,
-                        "juros": juros,
-                        "saldo": max(0, saldo),
-                        "data": data_parcela.strftime("%d/%m/%Y")
-                    })
-                    
-            else:  # SAC
-                amortizacao = valor / parcelas
-                saldo = valor
-                
-                for i in range(1, parcelas + 1):
-                    juros = saldo * taxa
-                    valor_parcela = amortizacao + juros
-                    saldo = saldo - amortizacao
-                    
-                    data_parcela = data_primeira_parcela + timedelta(days=30 * (i-1))
-                    
-                    resultados.append({
-                        "parcela": i,
-                        "valor_parcela": valor_parcela,
-                        "amortizacao": amortizacao,
-                        "juros": juros,
-                        "saldo": max(0, saldo),
-                        "data": data_parcela.strftime("%d/%m/%Y")
-                    })
-            
-            return resultados
+        atualizador = Atualizador(page)
+
+        async def baixar_pdf(e):
+            await exportar("simulacao_emprestimo.pdf", TIPO_PDF, self.conteudo_pdf)
+
+        async def baixar_csv(e):
+            await exportar("simulacao_emprestimo.csv", TIPO_CSV, self.conteudo_csv)
+
+        async def baixar_csv_numerico(e):
+            await exportar("simulacao_emprestimo_numerico.csv", TIPO_CSV,
+                           functools.partial(self.conteudo_csv, formato=FORMATO_NUMERICO))
 
         # Criar os botões antes da função calcular
         btn_download_pdf = ft.ElevatedButton(
             text="Baixar PDF",
-            on_click=lambda e: self.gerar_pdf(resultados, parametros),
+            on_click=baixar_pdf,
             visible=False,
             style=ft.ButtonStyle(
                 color=ft.colors.WHITE,
@@ -302,7 +573,20 @@ class MainApp:
 
         btn_download_csv = ft.ElevatedButton(
             text="Baixar CSV",
-            on_click=lambda e: self.gerar_csv(resultados, parametros),
+            on_click=baixar_csv,
+            visible=False,
+            style=ft.ButtonStyle(
+                color=ft.colors.WHITE,
+                bgcolor={"": "#a3b808"},
+            ),
+            height=45,
+            width=300,
+        )
+
+        btn_download_csv_numerico = ft.ElevatedButton(
+            text="Baixar CSV numérico",
+            tooltip="Números com ponto decimal e datas aaaa-mm-dd, para planilhas e outros programas",
+            on_click=baixar_csv_numerico,
             visible=False,
             style=ft.ButtonStyle(
                 color=ft.colors.WHITE,
@@ -312,11 +596,118 @@ class MainApp:
             width=300,
         )
 
-        # Variáveis para armazenar resultados e parâmetros
-        resultados = []
+        # Variáveis para armazenar a simulação exibida e seus parâmetros
         parametros = {}
+        simulacao = None
+        pagina_atual = 0
+        # Incrementada a cada cálculo: um cronograma de uma simulação
+        # anterior que ainda esteja sendo calculado é descartado
+        geracao = 0
 
-        def calcular(e):
+        def parcelas_carregadas():
+            if "cronograma" in simulacao:
+                return len(simulacao["cronograma"])
+            return simulacao["parcelas"]
+
+        def total_paginas():
+            return max(1, -(-simulacao["parcelas"] // LINHAS_POR_PAGINA))
+
+        def paginas_carregadas():
+            return max(1, -(-parcelas_carregadas() // LINHAS_POR_PAGINA))
+
+        def atualizar_navegacao():
+            inicio = pagina_atual * LINHAS_POR_PAGINA
+            fim = min(inicio + LINHAS_POR_PAGINA, parcelas_carregadas())
+            texto_pagina.value = (
+                f"Página {pagina_atual + 1} de {total_paginas()} "
+                f"(parcelas {inicio + 1} a {fim} de {simulacao['parcelas']})"
+            )
+            if parcelas_carregadas() < simulacao["parcelas"]:
+                texto_pagina.value += " - calculando as demais parcelas"
+            btn_primeira.disabled = btn_anterior.disabled = pagina_atual == 0
+            btn_proxima.disabled = btn_ultima.disabled = pagina_atual >= paginas_carregadas() - 1
+            navegacao.visible = total_paginas() > 1
+
+        def mostrar_pagina(pagina):
+            """Formata e cria as linhas da tabela apenas para a página visível"""
+            nonlocal pagina_atual
+            pagina_atual = min(max(pagina, 0), paginas_carregadas() - 1)
+            inicio = pagina_atual * LINHAS_POR_PAGINA
+            fim = min(inicio + LINHAS_POR_PAGINA, parcelas_carregadas())
+
+            tabela_resultados.rows = [
+                ft.DataRow(cells=[ft.DataCell(ft.Text(celula)) for celula in linha])
+                for linha in self.linhas_simulacao(simulacao, inicio, fim)
+            ]
+            
+            # Linha de totais sempre visível
+            tabela_resultados.rows.append(
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(celula, weight=ft.FontWeight.BOLD))
+                        for celula in simulacao["totais"]
+                    ],
+                    color=ft.colors.SURFACE_VARIANT
+                )
+            )
+            atualizar_navegacao()
+
+        def ir_para(pagina):
+            mostrar_pagina(pagina)
+            atualizador.enviar(navegacao, tabela_resultados)
+
+        def avisar(mensagem):
+            page.show_snack_bar(ft.SnackBar(content=ft.Text(mensagem), bgcolor="#d22042"))
+
+        def ocupado(sim):
+            """Mostra o indicador de progresso e bloqueia os botões durante uma tarefa"""
+            progresso.visible = sim
+            calcular_button.disabled = btn_download_pdf.disabled = btn_download_csv.disabled = sim
+            btn_download_csv_numerico.disabled = sim
+            atualizador.enviar(progresso, calcular_button, btn_download_pdf, btn_download_csv,
+                               btn_download_csv_numerico)
+
+        async def exportar(nome, tipo, gerar):
+            ocupado(True)
+            try:
+                # As parcelas são geradas de novo durante a exportação, sem
+                # esperar o cronograma da tabela
+                conteudo = await executar(gerar, parametros)
+                self.entregar_arquivo(page, nome, conteudo, tipo)
+            except ServidorOcupado as err:
+                avisar(str(err))
+            except Exception:
+                avisar("Não foi possível gerar o arquivo")
+            finally:
+                ocupado(False)
+
+        async def carregar_cronograma(minha_geracao, chave):
+            """
+            Calcula o cronograma completo em segundo plano (tarefa própria,
+            iniciada com page.run_task) e libera as demais páginas
+            """
+            nonlocal simulacao
+            while minha_geracao == geracao:
+                try:
+                    completa = await executar(self.simular_emprestimo, *chave)
+                    break
+                except ServidorOcupado:
+                    # Cede a vez às outras sessões e tenta de novo
+                    await asyncio.sleep(0.1)
+                except Exception:
+                    avisar("Não foi possível calcular as demais parcelas")
+                    return
+            else:
+                return
+            completa = cache_simulacoes.guardar(chave, completa)
+            if minha_geracao != geracao:
+                return
+            simulacao = completa
+            atualizar_navegacao()
+            atualizador.enviar(navegacao)
+
+        async def calcular(e):
+            nonlocal parametros, simulacao, geracao
             try:
                 valor = float(valor_emprestimo.value.replace(".", "").replace(",", "."))
                 parcelas = int(num_parcelas.value)
@@ -328,49 +719,39 @@ class MainApp:
                     int(data_mes.value),
                     int(data_dia.value)
                 )
-                
-                nonlocal resultados, parametros
-                resultados = calcular_emprestimo(valor, parcelas, taxa, tipo, data_primeira_parcela)
-                
-                # Atualizar tabela
-                tabela_resultados.rows.clear()
-                for r in resultados:
-                    tabela_resultados.rows.append(
-                        ft.DataRow(
-                            cells=[
-                                ft.DataCell(ft.Text(f"{r['parcela']}")),
-                                ft.DataCell(ft.Text(r['data'])),
-                                ft.DataCell(ft.Text(locale.currency(r['valor_parcela'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['amortizacao'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['juros'], grouping=True))),
-                                ft.DataCell(ft.Text(locale.currency(r['saldo'], grouping=True)))
-                            ]
-                        )
+            except Exception:
+                avisar("Por favor, verifique os valores informados")
+                return
+
+            geracao += 1
+            chave = None
+            ocupado(True)
+            try:
+                if comparar.value:
+                    simulacao = await executar(self.simular_comparacao, valor, parcelas, taxa,
+                                               data_primeira_parcela)
+                    comparacao = simulacao["resultados"]
+                    resumo.value = (
+                        f"Juros totais: {formatar_moeda(comparacao['price'].totais['juros'])} na Tabela Price e "
+                        f"{formatar_moeda(comparacao['sac'].totais['juros'])} na SAC. "
+                        f"Com o SAC você economiza {formatar_moeda(comparacao['juros_economizados'])} em juros."
                     )
+                else:
+                    simulacao = cache_simulacoes.buscar((valor, parcelas, taxa, tipo, data_primeira_parcela))
+                    if simulacao is None:
+                        # Primeira página e totais agora; o cronograma completo depois
+                        chave = (valor, parcelas, taxa, tipo, data_primeira_parcela)
+                        simulacao = await executar(self.simular_primeira_pagina, *chave)
+                tabela_resultados.columns = colunas_comparacao if comparar.value else colunas_simulacao
+                resumo.visible = comparar.value
                 
-                # Calcular totais
-                total_valor = sum(r['valor_parcela'] for r in resultados)
-                total_amortizacao = sum(r['amortizacao'] for r in resultados)
-                total_juros = sum(r['juros'] for r in resultados)
-                
-                # Adicionar linha de totais
-                tabela_resultados.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text("Totais", weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text(locale.currency(total_valor, grouping=True), weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text(locale.currency(total_amortizacao, grouping=True), weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text(locale.currency(total_juros, grouping=True), weight=ft.FontWeight.BOLD)),
-                            ft.DataCell(ft.Text(""))
-                        ],
-                        color=ft.colors.SURFACE_VARIANT
-                    )
-                )
+                # Atualizar tabela a partir da primeira página
+                mostrar_pagina(0)
                 
-                # Habilitar botões de download
-                btn_download_pdf.visible = True
-                btn_download_csv.visible = True
+                # Os downloads exportam um único sistema
+                btn_download_pdf.visible = not comparar.value
+                btn_download_csv.visible = not comparar.value
+                btn_download_csv_numerico.visible = not comparar.value
                 
                 # Atualizar parâmetros
                 parametros = {
@@ -381,15 +762,19 @@ class MainApp:
                     "data_primeira_parcela": data_primeira_parcela
                 }
                 
-                page.update()
+                atualizador.marcar(resumo, navegacao, tabela_resultados)
                 
-            except Exception as err:
-                page.show_snack_bar(
-                    ft.SnackBar(
-                        content=ft.Text("Por favor, verifique os valores informados"),
-                        bgcolor="#d22042"
-                    )
-                )
+            except ServidorOcupado as err:
+                avisar(str(err))
+                return
+            except Exception:
+                avisar("Por favor, verifique os valores informados")
+                return
+            finally:
+                ocupado(False)
+
+            if chave is not None:
+                page.run_task(carregar_cronograma, geracao, chave)
 
         # Campos do simulador
         valor_emprestimo = ft.TextField(
@@ -457,19 +842,59 @@ class MainApp:
             color="#30c4c9",
         )
 
+        async def alternar_comparacao(e):
+            tipo_tabela.disabled = comparar.value
+            if simulacao is not None:
+                await calcular(e)
+            atualizador.enviar(tipo_tabela)
+
+        comparar = ft.Switch(
+            label="Comparar Price e SAC",
+            value=False,
+            active_color="#24b694",
+            on_change=alternar_comparacao,
+        )
+        resumo = ft.Text(size=16, color="#a3b808", visible=False)
+
         # Tabela de resultados
+        colunas_simulacao = [ft.DataColumn(ft.Text(coluna)) for coluna in COLUNAS_SIMULACAO]
+        colunas_comparacao = [ft.DataColumn(ft.Text(coluna)) for coluna in COLUNAS_COMPARACAO]
         tabela_resultados = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Parcela")),
-                ft.DataColumn(ft.Text("Data")),
-                ft.DataColumn(ft.Text("Valor")),
-                ft.DataColumn(ft.Text("Amortização")),
-                ft.DataColumn(ft.Text("Juros")),
-                ft.DataColumn(ft.Text("Saldo"))
-            ],
+            columns=colunas_simulacao,
             rows=[]
         )
 
+        # Navegação entre as páginas da tabela
+        btn_primeira = ft.IconButton(
+            icon=ft.icons.FIRST_PAGE,
+            icon_color="#24b694",
+            tooltip="Primeira página",
+            on_click=lambda e: ir_para(0),
+        )
+        btn_anterior = ft.IconButton(
+            icon=ft.icons.CHEVRON_LEFT,
+            icon_color="#24b694",
+            tooltip="Página anterior",
+            on_click=lambda e: ir_para(pagina_atual - 1),
+        )
+        btn_proxima = ft.IconButton(
+            icon=ft.icons.CHEVRON_RIGHT,
+            icon_color="#24b694",
+            tooltip="Próxima página",
+            on_click=lambda e: ir_para(pagina_atual + 1),
+        )
+        btn_ultima = ft.IconButton(
+            icon=ft.icons.LAST_PAGE,
+            icon_color="#24b694",
+            tooltip="Última página",
+            on_click=lambda e: ir_para(total_paginas() - 1),
+        )
+        texto_pagina = ft.Text(size=16, color="#30c4c9")
+        navegacao = ft.Row(
+            [btn_primeira, btn_anterior, texto_pagina, btn_proxima, btn_ultima],
+            visible=False,
+        )
+
         calcular_button = ft.ElevatedButton(
             text="Calcular",
             on_click=calcular,
@@ -480,6 +905,7 @@ class MainApp:
             height=45,
             width=300,
         )
+        progresso = ft.ProgressRing(width=24, height=24, color="#24b694", visible=False)
 
         return ft.Column([
             ft.Text(
@@ -489,19 +915,26 @@ class MainApp:
                 color="#24b694"
             ),
             ft.Row([valor_emprestimo, num_parcelas]),
-            ft.Row([taxa_juros, tipo_tabela]),
+            ft.Row([taxa_juros, tipo_tabela, comparar]),
             ft.Text("Data da primeira parcela:", size=16, color="#30c4c9"),
             ft.Row([data_dia, data_mes, data_ano]),
             ft.Row([
                 calcular_button,
                 btn_download_pdf,
-                btn_download_csv
+                btn_download_csv,
+                btn_download_csv_numerico,
+                progresso
             ]),
+            resumo,
+            navegacao,
             tabela_resultados
         ], scroll=ft.ScrollMode.AUTO, spacing=20)
 
     def create_financiamento_tab(self, page):
-        def calcular(e):
+        atualizador = Atualizador(page)
+
+        def calcular_resultado(ao_vivo=False):
+            """Texto e cor do resultado; None ao vivo enquanto faltam campos"""
             try:
                 campos_preenchidos = sum(1 for campo in [
                     valor_presente.value,
@@ -510,55 +943,53 @@ class MainApp:
                     valor_futuro.value
                 ] if campo)
 
+                if ao_vivo and campos_preenchidos < 3:
+                    return None
                 if campos_preenchidos != 3:
-                    resultado.value = "Erro: Preencha exatamente 3 campos para realizar o cálculo"
-                    resultado.color = "#d22042"
-                    resultado.visible = True
-                    page.update()
-                    return
+                    return "Erro: Preencha exatamente 3 campos para realizar o cálculo", "#d22042"
 
-                if valor_presente.value and taxa.value and tempo.value:
-                    vp = float(valor_presente.value.replace(',', '.'))
-                    t = int(tempo.value)
-                    r = float(taxa.value.replace(',', '.')) / 100
-                    
-                    vf = vp * (1 + r) ** t
-                    
-                    resultado.value = f"Valor futuro calculado: R$ {vf:.2f}"
-                    resultado.color = "#a3b808"
-                    
-                elif valor_presente.value and taxa.value and valor_futuro.value:
-                    vp = float(valor_presente.value.replace(',', '.'))
-                    r = float(taxa.value.replace(',', '.')) / 100
-                    vf = float(valor_futuro.value.replace(',', '.'))
-                    
-                    t = round(log(vf/vp) / log(1 + r))
-                    
-                    resultado.value = f"Tempo calculado: {t} meses"
-                    resultado.color = "#a3b808"
+                # Erros de digitação e erros do cálculo têm mensagens diferentes
+                try:
+                    vp = float(valor_presente.value.replace(',', '.')) if valor_presente.value else None
+                    r = float(taxa.value.replace(',', '.')) / 100 if taxa.value else None
+                    t = int(tempo.value) if tempo.value else None
+                    vf = float(valor_futuro.value.replace(',', '.')) if valor_futuro.value else None
+                except ValueError:
+                    return "Erro: Verifique se os valores inseridos são números válidos", "#d22042"
+
+                if vp is not None and r is not None and t is not None:
+                    vf = financeiro.calcular_valor_futuro(vp, r, t)
                     
-                elif valor_presente.value and tempo.value and valor_futuro.value:
-                    vp = float(valor_presente.value.replace(',', '.'))
-                    t = int(tempo.value)
-                    vf = float(valor_futuro.value.replace(',', '.'))
+                    return f"Valor futuro calculado: R$ {vf:.2f}", "#a3b808"
                     
-                    r = (vf/vp) ** (1/t) - 1
+                elif vp is not None and r is not None and vf is not None:
+                    t = round(financeiro.calcular_tempo(vp, vf, r))
                     
-                    resultado.value = f"Taxa de juros calculada: {r*100:.2f}%"
-                    resultado.color = "#a3b808"
+                    return f"Tempo calculado: {t} meses", "#a3b808"
                     
-                resultado.visible = True
+                elif vp is not None and t is not None and vf is not None:
+                    r = financeiro.calcular_taxa(vp, vf, t)
                     
-            except ValueError:
-                resultado.value = "Erro: Verifique se os valores inseridos são números válidos"
-                resultado.color = "#d22042"
-                resultado.visible = True
+                    return f"Taxa de juros calculada: {r*100:.2f}%", "#a3b808"
+
+            except ValueError as e:
+                return f"Erro: {e}", "#d22042"
             except Exception as e:
-                resultado.value = f"Erro no cálculo: {str(e)}"
-                resultado.color = "#d22042"
-                resultado.visible = True
-                
-            page.update()
+                return f"Erro no cálculo: {str(e)}", "#d22042"
+
+        def mostrar(texto_cor):
+            resultado.value, resultado.color = texto_cor
+            resultado.visible = True
+            atualizador.enviar(resultado)
+
+        def calcular(e):
+            recalculo.cancelar()
+            texto_cor = calcular_resultado()
+            if texto_cor is not None:
+                mostrar(texto_cor)
+
+        # Recalcula enquanto o usuário digita, após uma pausa
+        recalculo = Recalculo(lambda: calcular_resultado(ao_vivo=True), mostrar)
 
         valor_presente = ft.TextField(
             label="Valor Presente",
@@ -566,6 +997,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         taxa = ft.TextField(
@@ -574,6 +1006,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         tempo = ft.TextField(
@@ -582,6 +1015,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
         
         valor_futuro = ft.TextField(
@@ -590,6 +1024,7 @@ class MainApp:
             border_color="#24b694",
             focused_border_color="#24b694",
             color="#30c4c9",
+            on_change=recalculo.agendar,
         )
 
         resultado = ft.Text(size=16, color="#a3b808", visible=False)
@@ -646,129 +1081,76 @@ class MainApp:
             )
         ], scroll=ft.ScrollMode.AUTO)
 
-    def gerar_pdf(self, dados, parametros):
-        """Gera relatório PDF com os resultados da simulação"""
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        
-        # Título
-        pdf.cell(0, 10, "Simulação de Empréstimo", ln=True, align="C")
-        pdf.ln(10)
-        
-        # Parâmetros
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 10, "Parâmetros do cálculo:", ln=True)
-        pdf.set_font("Arial", "", 12)
-        pdf.cell(0, 10, f"Valor do empréstimo: {locale.currency(parametros['valor'], grouping=True)}", ln=True)
-        pdf.cell(0, 10, f"Número de parcelas: {parametros['parcelas']}", ln=True)
-        pdf.cell(0, 10, f"Taxa de juros: {parametros['taxa']}% ao mês", ln=True)
-        pdf.cell(0, 10, f"Sistema: {'Tabela Price' if parametros['tipo'] == 'price' else 'Tabela SAC'}", ln=True)
-        pdf.cell(0, 10, f"Data primeira parcela: {parametros['data_primeira_parcela'].strftime('%d/%m/%Y')}", ln=True)
-        pdf.ln(10)
-        
-        # Tabela de resultados
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 10, "Resultados:", ln=True)
-        
-        # Cabeçalho da tabela
-        headers = ["Parcela", "Data", "Valor", "Amortização", "Juros", "Saldo"]
-        col_width = 32
-        
-        for header in headers:
-            pdf.cell(col_width, 10, header, 1)
-        pdf.ln()
-        
-        # Dados da tabela
-        pdf.set_font("Arial", "", 10)
-        total_valor = 0
-        total_amortizacao = 0
-        total_juros = 0
-        
-        for linha in dados:
-            pdf.cell(col_width, 10, f"{linha['parcela']}", 1)
-            pdf.cell(col_width, 10, f"{linha['data']}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['valor_parcela'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['amortizacao'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['juros'], grouping=True)}", 1)
-            pdf.cell(col_width, 10, f"{locale.currency(linha['saldo'], grouping=True)}", 1)
-            pdf.ln()
-            
-            total_valor += linha['valor_parcela']
-            total_amortizacao += linha['amortizacao']
-            total_juros += linha['juros']
-        
-        # Linha de totais
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(col_width, 10, "Totais", 1)
-        pdf.cell(col_width, 10, "", 1)
-        pdf.cell(col_width, 10, locale.currency(total_valor, grouping=True), 1)
-        pdf.cell(col_width, 10, locale.currency(total_amortizacao, grouping=True), 1)
-        pdf.cell(col_width, 10, locale.currency(total_juros, grouping=True), 1)
-        pdf.cell(col_width, 10, "", 1)
-        
-        try:
-            # Salvar PDF
-            pdf.output("simulacao_emprestimo.pdf")
-            # Abrir o arquivo após gerar
-            import webbrowser
-            webbrowser.open("simulacao_emprestimo.pdf")
-        except Exception as e:
-            print(f"Erro ao gerar PDF: {str(e)}")
+    def conteudo_pdf(self, parametros):
+        """Relatório PDF da simulação (bytes), com as parcelas calculadas em blocos"""
+        return montar_relatorio_pdf(
+            parametros['valor'], parametros['parcelas'], parametros['taxa'], parametros['tipo'],
+            parametros['data_primeira_parcela'],
+        ).conteudo()
 
-    def gerar_csv(self, dados, parametros):
-        """Gera arquivo CSV com os resultados da simulação"""
+    def conteudo_csv(self, parametros, formato=FORMATO_PTBR):
+        """
+        CSV da simulação (bytes, UTF-8), com as parcelas calculadas em blocos
+        formato: FORMATO_PTBR (como na tela) ou FORMATO_NUMERICO (números com
+        ponto decimal e datas ISO, para planilhas e outros programas)
+        """
+        arquivo = io.BytesIO()
+        exportar_csv(
+            arquivo, parametros['valor'], parametros['parcelas'], parametros['taxa'], parametros['tipo'],
+            parametros['data_primeira_parcela'], formato=formato,
+        )
+        return arquivo.getvalue()
+
+    def conteudo_csv_grade(self, grade):
+        """
+        CSV (bytes, UTF-8) com a grade de prestações (veja calcular_grade):
+        uma linha por taxa e uma coluna por prazo
+        """
         import csv
-        
-        try:
-            with open('simulacao_emprestimo.csv', 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Cabeçalho com parâmetros
-                writer.writerow(['Parâmetros do cálculo'])
-                writer.writerow(['Valor do empréstimo', locale.currency(parametros['valor'], grouping=True)])
-                writer.writerow(['Número de parcelas', parametros['parcelas']])
-                writer.writerow(['Taxa de juros', f"{parametros['taxa']}% ao mês"])
-                writer.writerow(['Sistema', 'Tabela Price' if parametros['tipo'] == 'price' else 'Tabela SAC'])
-                writer.writerow(['Data primeira parcela', parametros['data_primeira_parcela'].strftime('%d/%m/%Y')])
-                writer.writerow([])  # Linha em branco
-                
-                # Cabeçalho da tabela
-                writer.writerow(['Parcela', 'Data', 'Valor', 'Amortização', 'Juros', 'Saldo'])
-                
-                # Dados
-                for linha in dados:
-                    writer.writerow([
-                        linha['parcela'],
-                        linha['data'],
-                        locale.currency(linha['valor_parcela'], grouping=True),
-                        locale.currency(linha['amortizacao'], grouping=True),
-                        locale.currency(linha['juros'], grouping=True),
-                        locale.currency(linha['saldo'], grouping=True)
-                    ])
-                
-                # Totais
-                total_valor = sum(r['valor_parcela'] for r in dados)
-                total_amortizacao = sum(r['amortizacao'] for r in dados)
-                total_juros = sum(r['juros'] for r in dados)
-                
-                writer.writerow([])  # Linha em branco
-                writer.writerow([
-                    'Totais',
-                    '',
-                    locale.currency(total_valor, grouping=True),
-                    locale.currency(total_amortizacao, grouping=True),
-                    locale.currency(total_juros, grouping=True),
-                    ''
-                ])
-
-            # Abrir o arquivo após gerar
-            import webbrowser
-            webbrowser.open("simulacao_emprestimo.csv")
-        except Exception as e:
-            print(f"Erro ao gerar CSV: {str(e)}")
+
+        arquivo = io.StringIO(newline='')
+        writer = csv.writer(arquivo)
+        writer.writerow(['Valor financiado', formatar_moeda(grade['valor'])])
+        writer.writerow([])  # Linha em branco
+        writer.writerow(['Taxa (%) / Prazo (meses)'] + list(grade['prazos']))
+        textos = formatar_moedas(grade['prestacoes']).tolist()
+        for taxa, linha in zip(grade['taxas'].tolist(), textos):
+            writer.writerow([f"{taxa * 100:.2f}".replace('.', ',')] + linha)
+        return arquivo.getvalue().encode('utf-8')
+
+    def entregar_arquivo(self, page, nome, conteudo, tipo):
+        """
+        Entrega um arquivo exportado: no modo web (app_web) ele fica em
+        memória, só para a sessão, e o navegador o baixa; no desktop vai
+        para um arquivo temporário, aberto em seguida e apagado depois
+        (veja downloads.entregar_arquivo)
+        """
+        return entregar_arquivo(page, nome, conteudo, tipo, self.temporarios,
+                                self.downloads if self.servindo_downloads else None)
+
+
+def app_web():
+    """
+    Aplicação ASGI do modo web, com a rota que entrega as exportações
+    guardadas em memória (nada é gravado no disco do servidor)
+    Uso: uvicorn main:app_web --factory, ou python main.py --web
+    """
+    import flet.fastapi as flet_fastapi
+
+    app = MainApp()
+    servidor = flet_fastapi.FastAPI()
+    registrar_rota(servidor, app.downloads)
+    app.servindo_downloads = True
+    servidor.mount("/", flet_fastapi.app(app.main))
+    return servidor
+
 
 def main():
+    if "--web" in sys.argv:
+        import uvicorn
+        uvicorn.run(app_web(), host=os.getenv("FLET_SERVER_IP", "127.0.0.1"),
+                    port=int(os.getenv("FLET_SERVER_PORT", "8000")))
+        return
     app = MainApp()
     ft.app(target=app.main)
 
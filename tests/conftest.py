@@ -0,0 +1,76 @@
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+# Arquivo com os resultados dos benchmarks; pode ser trocado pela variável
+# de ambiente BENCHMARK_JSON para comparar execuções diferentes
+ARQUIVO_BENCHMARK = os.environ.get(
+    "BENCHMARK_JSON",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark_resultados.json"),
+)
+
+# Os testes marcados com desempenho (tempos, lotes grandes, um processo por
+# CPU) só rodam com DESEMPENHO=1, para não deixar a suíte lenta e sujeita
+# à carga da máquina
+RODAR_DESEMPENHO = os.environ.get("DESEMPENHO", "") not in ("", "0")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "desempenho: benchmark com limites de tempo; roda só com DESEMPENHO=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if RODAR_DESEMPENHO:
+        return
+    pular = pytest.mark.skip(reason="benchmark; rode com DESEMPENHO=1")
+    for item in items:
+        if "desempenho" in item.keywords:
+            item.add_marker(pular)
+
+
+@pytest.fixture(scope="session")
+def benchmark():
+    """
+    Mede uma função e guarda o resultado para o arquivo JSON da sessão
+    Uso: benchmark(nome, tamanho, funcao) -> segundos por chamada (melhor de
+    várias repetições)
+    """
+    resultados = []
+
+    def medir(nome, tamanho, funcao, repeticoes=3, duracao_minima=0.02):
+        # Calibra o número de chamadas por amostra; a calibração vale como
+        # a primeira amostra
+        numero = 1
+        tempo = timeit.timeit(funcao, number=numero)
+        while tempo < duracao_minima:
+            numero *= 10
+            tempo = timeit.timeit(funcao, number=numero)
+        amostras = [tempo] + timeit.repeat(funcao, number=numero, repeat=repeticoes - 1)
+        segundos = min(amostras) / numero
+        resultados.append({
+            "nome": nome,
+            "tamanho": tamanho,
+            "segundos": segundos,
+            "por_item_us": segundos / tamanho * 1e6,
+            "por_segundo": tamanho / segundos,
+        })
+        return segundos
+
+    yield medir
+
+    if resultados:
+        with open(ARQUIVO_BENCHMARK, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "plataforma": platform.platform(),
+                "processador": platform.processor() or platform.machine(),
+                "resultados": resultados,
+            }, arquivo, indent=2, ensure_ascii=False)
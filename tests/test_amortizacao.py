@@ -0,0 +1,103 @@
+"""Tabelas Price e SAC: colunas, comparação, geração em blocos e datas de vencimento"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from calculadoracidadao import calcular_comparacao, calcular_emprestimo, calcular_totais
+from calculadoracidadao.amortizacao import (
+    INTERVALO_30_DIAS,
+    _datas,
+    calcular_datas,
+    formatar_datas,
+    iterar_blocos,
+)
+
+DATA = datetime(2025, 1, 10)
+
+
+@pytest.mark.parametrize("tipo", ["price", "sac"])
+def test_cronograma_quita_o_emprestimo(tipo):
+    cronograma = calcular_emprestimo(10_000.0, 24, 1.5, tipo, DATA)
+    assert len(cronograma) == 24
+    assert cronograma.amortizacao.sum() == pytest.approx(10_000.0)
+    assert cronograma.saldo[-1] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("parcelas", [1, 12, 420])
+def test_comparacao_igual_aos_sistemas_separados(parcelas):
+    comparacao = calcular_comparacao(250_000.0, parcelas, 1.25, DATA)
+    for tipo in ("price", "sac"):
+        separado = calcular_emprestimo(250_000.0, parcelas, 1.25, tipo, DATA)
+        np.testing.assert_allclose(comparacao[tipo].saldo, separado.saldo, rtol=1e-9, atol=1e-6)
+        assert comparacao[tipo].totais == pytest.approx(separado.totais)
+    assert comparacao["juros_economizados"] == pytest.approx(
+        comparacao["price"].totais["juros"] - comparacao["sac"].totais["juros"])
+
+
+def test_bloco_de_uma_pagina_igual_ao_cronograma():
+    completo = calcular_emprestimo(250_000.0, 1000, 1.25, "price", DATA)
+    primeiro = next(iterar_blocos(250_000.0, 1000, 0.0125, "price", DATA, tamanho_bloco=60))
+    meio = next(iterar_blocos(250_000.0, 1000, 0.0125, "price", DATA, tamanho_bloco=60, primeira=480))
+    assert primeiro.linhas_formatadas() == completo.linhas_formatadas(fim=60)
+    assert meio.linhas_formatadas() == completo.linhas_formatadas(inicio=480, fim=540)
+
+
+@pytest.mark.parametrize("tipo", ["price", "sac"])
+@pytest.mark.parametrize("valor, parcelas, taxa", [
+    (10_000.0, 1, 2.0),
+    (250_000.0, 360, 0.9),
+    (1_000.0, 12, 0.0),
+    (5_000_000.0, 10_000, 1.25),
+    (800.0, 48, 150.0),
+])
+def test_totais_por_formula_iguais_a_soma_das_colunas(tipo, valor, parcelas, taxa):
+    cronograma = calcular_emprestimo(valor, parcelas, taxa, tipo)
+    totais = calcular_totais(valor, parcelas, taxa, tipo)
+    for coluna in ("valor_parcela", "amortizacao", "juros"):
+        soma = getattr(cronograma, coluna).sum()
+        assert totais[coluna] == pytest.approx(soma, rel=1e-9, abs=1e-6)
+        assert cronograma.totais[coluna] == pytest.approx(soma, rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("tipo", ["price", "sac"])
+def test_totais_dos_blocos_somam_o_total(tipo):
+    blocos = list(iterar_blocos(250_000.0, 1000, 0.0125, tipo, tamanho_bloco=96))
+    total = calcular_totais(250_000.0, 1000, 1.25, tipo)
+    for coluna in ("valor_parcela", "amortizacao", "juros"):
+        for bloco in blocos:
+            assert bloco.totais[coluna] == pytest.approx(getattr(bloco, coluna).sum(), rel=1e-9)
+        assert sum(bloco.totais[coluna] for bloco in blocos) == pytest.approx(total[coluna], rel=1e-9)
+
+
+def test_dia_31_limitado_ao_fim_de_cada_mes():
+    datas = calcular_datas(datetime(2025, 1, 31), 6)
+    assert formatar_datas(datas) == [
+        "31/01/2025", "28/02/2025", "31/03/2025", "30/04/2025", "31/05/2025", "30/06/2025",
+    ]
+
+
+def test_fevereiro_de_ano_bissexto_e_sem_deriva():
+    assert formatar_datas(calcular_datas(datetime(2024, 1, 31), 3)) == ["31/01/2024", "29/02/2024", "31/03/2024"]
+    # Depois de fevereiro o dia 30 volta, em vez de ficar no 28
+    assert formatar_datas(calcular_datas(datetime(2025, 1, 30), 3)) == ["30/01/2025", "28/02/2025", "30/03/2025"]
+    # Dezembro passa para o ano seguinte
+    assert formatar_datas(calcular_datas(datetime(2025, 11, 15), 3)) == ["15/11/2025", "15/12/2025", "15/01/2026"]
+
+
+def test_intervalo_de_30_dias():
+    datas = calcular_datas(datetime(2025, 1, 31), 13, INTERVALO_30_DIAS)
+    assert datas.dtype == np.dtype("datetime64[D]")
+    assert (np.diff(datas) == np.timedelta64(30, "D")).all()
+    assert formatar_datas(datas[:2]) == ["31/01/2025", "02/03/2025"]
+
+
+@pytest.mark.parametrize("intervalo", ["mensal", INTERVALO_30_DIAS])
+def test_datas_de_um_trecho_iguais_as_completas(intervalo):
+    completas = calcular_datas(datetime(2024, 1, 31), 600, intervalo)
+    np.testing.assert_array_equal(_datas(datetime(2024, 1, 31), 250, 310, intervalo), completas[250:310])
+
+
+def test_intervalo_desconhecido():
+    with pytest.raises(ValueError):
+        calcular_datas(DATA, 12, "semanal")
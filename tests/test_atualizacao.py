@@ -0,0 +1,81 @@
+"""Atualizador: envio só dos controles marcados e medição opcional dos bytes"""
+import threading
+
+import flet as ft
+
+from calculadoracidadao.interface import atualizacao
+from calculadoracidadao.interface.atualizacao import Atualizador
+
+
+class Conexao:
+    def __init__(self):
+        self.lotes = []
+
+    def send_commands(self, session_id, commands):
+        self.lotes.append((session_id, commands))
+
+
+class Pagina:
+    """Página mínima: update() manda um comando por controle pela conexão"""
+
+    def __init__(self, sessao):
+        self.session_id = sessao
+        self.connection = Conexao()
+        self.atualizados = []
+
+    def update(self, *controles):
+        self.atualizados.append(controles)
+        self.connection.send_commands(self.session_id, [{"id": str(id(c))} for c in controles])
+
+
+def test_envia_cada_controle_uma_vez():
+    pagina = Pagina("s1")
+    texto = ft.Text("a")
+    botao = ft.ElevatedButton("b")
+    atualizador = Atualizador(pagina, medir=False)
+
+    atualizador.marcar(texto, botao, texto)
+    assert atualizador.enviar() == {"controles": 2, "bytes": 0}
+    assert pagina.atualizados == [(texto, botao)]
+    assert atualizador.enviar() == {"controles": 0, "bytes": 0}
+    assert len(pagina.atualizados) == 1
+
+
+def test_mede_bytes_sem_guardar_a_sessao():
+    pagina = Pagina("s2")
+    atualizador = Atualizador(pagina, medir=True)
+
+    enviado = atualizador.enviar(ft.Text("a"), ft.Text("b"))
+    assert enviado["controles"] == 2
+    assert enviado["bytes"] > 0
+    assert atualizador.estatisticas()["bytes"] == enviado["bytes"]
+    assert "s2" not in atualizacao._bytes_por_sessao
+
+
+def test_sem_debug_nao_mede(caplog):
+    caplog.set_level("INFO", logger=atualizacao.__name__)
+    pagina = Pagina("s3")
+    atualizador = Atualizador(pagina)
+
+    assert not atualizador.medir
+    assert atualizador.enviar(ft.Text("a"))["bytes"] == 0
+    assert not hasattr(pagina.connection, "_bytes_por_sessao")
+
+
+def test_marcar_de_varias_threads():
+    pagina = Pagina("s4")
+    atualizador = Atualizador(pagina, medir=False)
+    textos = [ft.Text(str(i)) for i in range(200)]
+
+    def marcar(parte):
+        for texto in parte:
+            atualizador.marcar(texto)
+            atualizador.marcar(textos[0])
+
+    threads = [threading.Thread(target=marcar, args=(textos[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert atualizador.enviar()["controles"] == len(textos)
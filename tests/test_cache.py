@@ -0,0 +1,80 @@
+"""Cache LRU compartilhado: contadores, descarte e uso por várias threads"""
+import threading
+
+import pytest
+
+from calculadoracidadao.cache import CacheLRU
+
+
+def test_contadores_e_descarte_do_menos_usado():
+    cache = CacheLRU(tamanho_maximo=2)
+    assert cache.obter("a", lambda: 1) == 1
+    assert cache.obter("b", lambda: 2) == 2
+    assert cache.obter("a", lambda: 0) == 1  # acerto: "a" passa a ser o mais recente
+    cache.obter("c", lambda: 3)  # descarta "b"
+
+    assert cache.buscar("b") is None
+    assert cache.buscar("a") == 1
+    assert cache.estatisticas() == {
+        "acertos": 2, "falhas": 4, "remocoes": 1, "tamanho": 2, "tamanho_maximo": 2, "bytes": 0,
+    }
+
+    cache.limpar()
+    assert len(cache) == 0
+    assert cache.estatisticas()["falhas"] == 0
+
+
+def test_guardar_nao_conta_falha_nem_substitui():
+    cache = CacheLRU()
+    assert cache.buscar("a") is None
+    assert cache.guardar("a", 1) == 1
+    assert cache.guardar("a", 2) == 1
+    assert cache.estatisticas()["falhas"] == 1
+    assert cache.estatisticas()["acertos"] == 0
+
+
+def test_limite_de_bytes():
+    cache = CacheLRU(tamanho_maximo=10, max_bytes=10, medir=len)
+    cache.guardar("a", b"1234")
+    cache.guardar("b", b"1234")
+    cache.guardar("c", b"1234")  # 12 bytes: "a" sai
+    assert cache.buscar("a") is None
+    assert cache.estatisticas()["bytes"] == 8
+    # Um item maior que o limite fica sozinho
+    cache.guardar("d", b"x" * 20)
+    assert len(cache) == 1
+    assert cache.estatisticas()["bytes"] == 20
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        CacheLRU(tamanho_maximo=0)
+    with pytest.raises(ValueError):
+        CacheLRU(max_bytes=10)
+
+
+def test_threads_calculam_e_contam_sem_perder_nada():
+    cache = CacheLRU(tamanho_maximo=50)
+    chamadas = 8
+    por_thread = 2000
+    barreira = threading.Barrier(chamadas)
+    erros = []
+
+    def usar(numero):
+        barreira.wait()
+        for i in range(por_thread):
+            chave = (numero + i) % 100
+            if cache.obter(chave, lambda: chave * 2) != chave * 2:
+                erros.append(chave)
+
+    threads = [threading.Thread(target=usar, args=(n,)) for n in range(chamadas)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    estatisticas = cache.estatisticas()
+    assert erros == []
+    assert estatisticas["acertos"] + estatisticas["falhas"] == chamadas * por_thread
+    assert estatisticas["tamanho"] == len(cache) <= 50
+    assert estatisticas["remocoes"] <= estatisticas["falhas"]
@@ -0,0 +1,222 @@
+"""
+Benchmarks dos cálculos e das exportações
+Rodam sem tela nem navegador, só quando pedidos:
+DESEMPENHO=1 python -m pytest tests/test_desempenho.py
+Os tempos vão para benchmark_resultados.json (ou BENCHMARK_JSON). As
+verificações de resultado ficam nos testes de cada módulo.
+"""
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from calculadoracidadao import (
+    calcular_comparacao,
+    calcular_emprestimo,
+    calcular_prestacao,
+    calcular_taxa_juros,
+    calcular_valor_financiado,
+    formatar_moeda,
+    formatar_moedas,
+    resolver_taxas,
+)
+from calculadoracidadao.exportacao import FORMATO_NUMERICO, FORMATO_PTBR, exportar_csv, exportar_parquet
+from calculadoracidadao.interface.mapa_calor import gerar_png
+from calculadoracidadao.relatorio import exportar_pdf
+from calculadoracidadao.relatorio_lote import gerar_relatorios
+from calculadoracidadao.sensibilidade import calcular_grade_prestacoes
+
+PARCELAS = [12, 120, 420, 10_000]
+LOTES = [1_000, 10_000, 100_000]
+VALOR = 250_000.0
+TAXA = 0.0125
+DATA = datetime(2025, 1, 10)
+
+pytestmark = pytest.mark.desempenho
+
+
+def gerar_contratos(quantidade, semente=42):
+    aleatorio = np.random.default_rng(semente)
+    meses = aleatorio.choice([12, 24, 36, 60, 120, 240, 360, 420], quantidade).astype(np.float64)
+    taxas = aleatorio.uniform(0.001, 0.1, quantidade)
+    valores = aleatorio.uniform(1_000, 1_000_000, quantidade)
+    prestacoes = valores * taxas / (1 - (1 + taxas) ** -meses)
+    return prestacoes, meses, valores, taxas
+
+
+@pytest.fixture(scope="module")
+def app():
+    import main
+    return main.MainApp()
+
+
+@pytest.mark.parametrize("meses", PARCELAS)
+def test_calcular_taxa_juros(benchmark, meses):
+    prestacao = calcular_prestacao(VALOR, TAXA, meses)
+    segundos = benchmark("calcular_taxa_juros", meses, lambda: calcular_taxa_juros(prestacao, meses, VALOR))
+    assert calcular_taxa_juros(prestacao, meses, VALOR) == pytest.approx(TAXA, abs=1e-6)
+    assert segundos < 0.01
+
+
+@pytest.mark.parametrize("meses", PARCELAS)
+def test_calcular_prestacao(benchmark, meses):
+    benchmark("calcular_prestacao", meses, lambda: calcular_prestacao(VALOR, TAXA, meses))
+
+
+@pytest.mark.parametrize("meses", PARCELAS)
+def test_calcular_valor_financiado(benchmark, meses):
+    prestacao = calcular_prestacao(VALOR, TAXA, meses)
+    benchmark("calcular_valor_financiado", meses, lambda: calcular_valor_financiado(prestacao, TAXA, meses))
+
+
+@pytest.mark.parametrize("tipo", ["price", "sac"])
+@pytest.mark.parametrize("parcelas", PARCELAS)
+def test_calcular_emprestimo(benchmark, tipo, parcelas):
+    segundos = benchmark(
+        f"calcular_emprestimo_{tipo}", parcelas,
+        lambda: calcular_emprestimo(VALOR, parcelas, TAXA * 100, tipo, DATA),
+    )
+    assert len(calcular_emprestimo(VALOR, parcelas, TAXA * 100, tipo, DATA)) == parcelas
+    assert segundos < 0.05
+
+
+@pytest.mark.parametrize("parcelas", PARCELAS)
+def test_calcular_comparacao(benchmark, parcelas):
+    segundos = benchmark("calcular_comparacao", parcelas,
+                         lambda: calcular_comparacao(VALOR, parcelas, TAXA * 100, DATA))
+    comparacao = calcular_comparacao(VALOR, parcelas, TAXA * 100, DATA)
+    for tipo in ("price", "sac"):
+        separado = calcular_emprestimo(VALOR, parcelas, TAXA * 100, tipo, DATA)
+        np.testing.assert_allclose(comparacao[tipo].saldo, separado.saldo, rtol=1e-9, atol=1e-6)
+        assert comparacao[tipo].totais == pytest.approx(separado.totais)
+    assert comparacao["juros_economizados"] == pytest.approx(
+        comparacao["price"].totais["juros"] - comparacao["sac"].totais["juros"])
+    assert segundos < 0.05
+
+
+@pytest.mark.parametrize("taxas, prazos", [(50, 60), (200, 420)])
+def test_grade_prestacoes(benchmark, taxas, prazos):
+    grade_taxas = np.linspace(0, 0.05, taxas)
+    grade_prazos = np.arange(1, prazos + 1)
+    segundos = benchmark("grade_prestacoes", taxas * prazos,
+                         lambda: calcular_grade_prestacoes(VALOR, grade_taxas, grade_prazos))
+    grade = calcular_grade_prestacoes(VALOR, grade_taxas, grade_prazos)
+    benchmark("grade_mapa_calor", taxas * prazos, lambda: gerar_png(grade), repeticoes=1)
+    for i, j in [(0, 0), (taxas // 2, prazos - 1), (taxas - 1, prazos // 3)]:
+        assert grade[i, j] == pytest.approx(calcular_prestacao(VALOR, grade_taxas[i], grade_prazos[j]))
+    assert segundos < 0.05
+
+
+@pytest.mark.parametrize("parcelas", PARCELAS)
+def test_formatar_moedas(benchmark, parcelas):
+    valores = calcular_emprestimo(VALOR, parcelas, TAXA * 100, "sac").juros
+    benchmark("formatar_moedas", parcelas, lambda: formatar_moedas(valores).tolist())
+    benchmark("formatar_moeda", parcelas, lambda: [formatar_moeda.__wrapped__(v) for v in valores.tolist()])
+    assert formatar_moedas(valores).tolist() == [formatar_moeda(v) for v in valores.tolist()]
+
+
+@pytest.mark.parametrize("parcelas", PARCELAS + [1_000_000])
+def test_primeira_pagina(benchmark, app, parcelas):
+    """A primeira página da tabela não depende do número de parcelas"""
+    def primeira_pagina():
+        simulacao = app.simular_primeira_pagina(VALOR, parcelas, TAXA * 100, "price", DATA)
+        return app.linhas_simulacao(simulacao, 0, min(parcelas, 60))
+
+    segundos = benchmark("primeira_pagina", parcelas, primeira_pagina)
+    completa = app.simular_emprestimo(VALOR, min(parcelas, 10_000), TAXA * 100, "price", DATA)
+    assert app.linhas_simulacao(completa, 0, min(parcelas, 60)) == primeira_pagina()
+    assert segundos < 0.01
+
+
+@pytest.mark.parametrize("parcelas", PARCELAS)
+def test_conteudo_pdf(benchmark, app, parcelas):
+    parametros = {"valor": VALOR, "parcelas": parcelas, "taxa": TAXA * 100, "tipo": "price",
+                  "data_primeira_parcela": DATA}
+    benchmark("conteudo_pdf", parcelas, lambda: app.conteudo_pdf(parametros), repeticoes=1)
+    assert app.conteudo_pdf(parametros).startswith(b"%PDF")
+
+
+@pytest.mark.parametrize("formato", [FORMATO_PTBR, FORMATO_NUMERICO])
+@pytest.mark.parametrize("parcelas", PARCELAS)
+def test_conteudo_csv(benchmark, app, parcelas, formato):
+    parametros = {"valor": VALOR, "parcelas": parcelas, "taxa": TAXA * 100, "tipo": "price",
+                  "data_primeira_parcela": DATA}
+    benchmark(f"conteudo_csv_{formato}", parcelas, lambda: app.conteudo_csv(parametros, formato), repeticoes=1)
+
+
+@pytest.mark.parametrize("parcelas", PARCELAS + [100_000])
+def test_exportar_pdf(benchmark, tmp_path, parcelas):
+    """Relatório PDF; o tamanho registrado é o número de páginas (páginas por segundo)"""
+    caminho = tmp_path / "simulacao.pdf"
+    paginas = exportar_pdf(caminho, VALOR, parcelas, TAXA * 100, "price", DATA)
+    segundos = benchmark("exportar_pdf_paginas", paginas,
+                         lambda: exportar_pdf(caminho, VALOR, parcelas, TAXA * 100, "price", DATA), repeticoes=1)
+    if parcelas >= 10_000:
+        assert paginas / segundos > 200
+
+
+@pytest.mark.parametrize("quantidade", [200])
+def test_relatorios_em_lote(benchmark, tmp_path, quantidade):
+    """Relatórios de 420 parcelas, um por contrato, em todos os processadores"""
+    _, _, valores, taxas = gerar_contratos(quantidade)
+    simulacoes = [
+        {"id": i, "valor": v, "parcelas": 420, "taxa": t * 100, "tipo": "price", "data_primeira_parcela": DATA}
+        for i, (v, t) in enumerate(zip(valores.tolist(), taxas.tolist()))
+    ]
+    benchmark("relatorios_em_lote", quantidade, lambda: gerar_relatorios(simulacoes, tmp_path), repeticoes=1)
+    assert len(list(tmp_path.iterdir())) == quantidade
+
+
+@pytest.mark.parametrize("quantidade", LOTES[:2])
+def test_exportar_parquet_lote(benchmark, tmp_path, quantidade):
+    """Cronogramas de 360 parcelas, um por contrato, em um único arquivo Parquet"""
+    pytest.importorskip("pyarrow")
+    _, _, valores, taxas = gerar_contratos(quantidade)
+    lote = {i: calcular_emprestimo(v, 360, t * 100, "price", DATA)
+            for i, (v, t) in enumerate(zip(valores.tolist(), taxas.tolist()))}
+    benchmark("exportar_parquet_lote", quantidade * 360,
+              lambda: exportar_parquet(tmp_path / "lote.parquet", lote), repeticoes=1)
+
+
+@pytest.mark.parametrize("formato", [FORMATO_PTBR, FORMATO_NUMERICO])
+def test_exportar_csv_grande(benchmark, tmp_path, formato):
+    """Um milhão de parcelas em blocos: a memória usada não depende do total"""
+    parcelas = 1_000_000
+    caminho = tmp_path / "simulacao.csv"
+
+    def exportar():
+        exportar_csv(caminho, VALOR, parcelas, TAXA * 100, "price", DATA, formato=formato)
+
+    benchmark(f"exportar_csv_{formato}", parcelas, exportar, repeticoes=1)
+    tracemalloc.start()
+    try:
+        exportar()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert pico < 32 * 2**20 < caminho.stat().st_size
+
+
+@pytest.mark.parametrize("quantidade", LOTES)
+def test_lote_resolver_taxas(benchmark, quantidade):
+    prestacoes, meses, valores, taxas = gerar_contratos(quantidade)
+    benchmark("lote_resolver_taxas", quantidade, lambda: resolver_taxas(prestacoes, meses, valores))
+    resultado = resolver_taxas(prestacoes, meses, valores)
+    np.testing.assert_allclose(resultado["taxa"], taxas, atol=1e-6)
+
+
+@pytest.mark.parametrize("quantidade", LOTES)
+def test_lote_calcular_prestacao(benchmark, quantidade):
+    _, meses, valores, taxas = gerar_contratos(quantidade)
+    contratos = list(zip(valores.tolist(), taxas.tolist(), meses.tolist()))
+    benchmark("lote_calcular_prestacao", quantidade,
+              lambda: [calcular_prestacao(v, t, m) for v, t, m in contratos], repeticoes=1)
+
+
+@pytest.mark.parametrize("quantidade", LOTES)
+def test_lote_calcular_emprestimo(benchmark, quantidade):
+    _, meses, valores, taxas = gerar_contratos(quantidade)
+    contratos = list(zip(valores.tolist(), meses.astype(int).tolist(), (taxas * 100).tolist()))
+    benchmark("lote_calcular_emprestimo", quantidade,
+              lambda: [calcular_emprestimo(v, m, t, "price", DATA) for v, m, t in contratos], repeticoes=1)
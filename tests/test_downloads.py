@@ -0,0 +1,158 @@
+"""Exportações guardadas em memória por sessão e entregues como download"""
+import os
+import threading
+import webbrowser
+from types import SimpleNamespace
+
+import pytest
+
+from calculadoracidadao.interface import downloads as modulo_downloads
+from calculadoracidadao.interface.downloads import (
+    PREFIXO_DOWNLOADS,
+    TIPO_CSV,
+    ArquivosTemporarios,
+    Downloads,
+    entregar,
+    entregar_arquivo,
+    registrar_rota,
+)
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_guardar_e_buscar():
+    downloads = Downloads()
+    token = downloads.guardar("s1", "a.csv", b"1,2\r\n", TIPO_CSV)
+    assert downloads.buscar(token) == ("a.csv", TIPO_CSV, b"1,2\r\n")
+    assert downloads.buscar("outro") is None
+    assert downloads.guardar("s1", "a.csv", b"1,2\r\n", TIPO_CSV) != token
+
+
+def test_arquivos_expiram():
+    relogio = Relogio()
+    downloads = Downloads(validade=60, relogio=relogio)
+    antigo = downloads.guardar("s1", "a.pdf", b"%PDF", "application/pdf")
+    relogio.agora = 30
+    novo = downloads.guardar("s2", "b.pdf", b"%PDF", "application/pdf")
+    relogio.agora = 61
+    assert downloads.buscar(antigo) is None
+    assert downloads.buscar(novo) is not None
+    relogio.agora = 91
+    assert downloads.limpar_expirados() == 1
+    assert downloads.estatisticas() == {"arquivos": 0, "sessoes": 0, "bytes": 0, "expirados": 2}
+
+
+def test_limites_por_sessao_e_de_memoria():
+    downloads = Downloads(max_por_sessao=2, max_bytes=25)
+    s1 = [downloads.guardar("s1", f"{i}.csv", b"x" * 5, TIPO_CSV) for i in range(3)]
+    assert [downloads.buscar(t) is not None for t in s1] == [False, True, True]
+    s2 = [downloads.guardar("s2", f"{i}.csv", b"x" * 10, TIPO_CSV) for i in range(2)]
+    # 30 bytes no total: sai o arquivo mais antigo, de outra sessão
+    assert [downloads.buscar(t) is not None for t in s1 + s2] == [False, False, True, True, True]
+    assert downloads.bytes == 25
+
+
+def test_remover_sessao():
+    downloads = Downloads()
+    mantido = downloads.guardar("s1", "a.csv", b"a", TIPO_CSV)
+    removidos = [downloads.guardar("s2", "b.csv", b"b", TIPO_CSV) for _ in range(2)]
+    downloads.remover_sessao("s2")
+    downloads.remover_sessao("inexistente")
+    assert downloads.buscar(mantido) is not None
+    assert all(downloads.buscar(t) is None for t in removidos)
+    assert len(downloads) == 1
+
+
+def test_sessoes_simultaneas():
+    downloads = Downloads(max_por_sessao=1000, max_bytes=10**9)
+    erros = []
+
+    def sessao(numero):
+        for i in range(200):
+            conteudo = f"{numero}-{i}".encode()
+            token = downloads.guardar(numero, "simulacao.csv", conteudo, TIPO_CSV)
+            if downloads.buscar(token)[2] != conteudo:
+                erros.append((numero, i))
+
+    threads = [threading.Thread(target=sessao, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert erros == []
+    assert len(downloads) == 1600
+    assert downloads.bytes == sum(len(f"{n}-{i}") for n in range(8) for i in range(200))
+
+
+def test_entregar_abre_o_endereco_da_sessao():
+    abertos = []
+    page = SimpleNamespace(session_id="s1", url="http://127.0.0.1:8000/", launch_url=abertos.append)
+    downloads = Downloads()
+    token = entregar(page, downloads, "simulacao.csv", b"1", TIPO_CSV)
+    assert abertos == [f"http://127.0.0.1:8000{PREFIXO_DOWNLOADS}/{token}"]
+    assert downloads.estatisticas()["sessoes"] == 1
+
+
+def test_temporarios_apagados_depois_da_validade(tmp_path):
+    relogio = Relogio()
+    temporarios = ArquivosTemporarios(validade=60, pasta=tmp_path, relogio=relogio)
+    antigo = temporarios.gravar("simulacao.csv", b"1")
+    relogio.agora = 30
+    novo = temporarios.gravar("simulacao.csv", b"2")
+    assert antigo != novo
+    assert open(novo, "rb").read() == b"2"
+
+    relogio.agora = 61
+    assert temporarios.limpar_expirados() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [os.path.basename(novo)]
+    temporarios.limpar()
+    assert list(tmp_path.iterdir()) == []
+    assert len(temporarios) == 0
+
+
+def test_entregar_arquivo_conforme_o_modo(tmp_path, monkeypatch):
+    abertos = []
+    avisos = []
+    monkeypatch.setattr(webbrowser, "open", abertos.append)
+    temporarios = ArquivosTemporarios(pasta=tmp_path)
+
+    desktop = SimpleNamespace(web=False)
+    caminho = entregar_arquivo(desktop, "simulacao.pdf", b"%PDF", modulo_downloads.TIPO_PDF, temporarios)
+    assert abertos == [caminho]
+    assert caminho.endswith(".pdf")
+
+    # flet run -w: sem a rota, nada é gravado
+    sem_rota = SimpleNamespace(web=True, show_snack_bar=lambda barra: avisos.append(barra.content.value))
+    assert entregar_arquivo(sem_rota, "simulacao.csv", b"1", TIPO_CSV, temporarios) is None
+    assert avisos == [modulo_downloads.AVISO_SEM_DOWNLOADS]
+    assert len(list(tmp_path.iterdir())) == 1
+
+    downloads = Downloads()
+    com_rota = SimpleNamespace(web=True, session_id="s1", url="http://h/", launch_url=abertos.append)
+    token = entregar_arquivo(com_rota, "simulacao.csv", b"1", TIPO_CSV, temporarios, downloads)
+    assert downloads.buscar(token) == ("simulacao.csv", TIPO_CSV, b"1")
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_rota_download():
+    fastapi = pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    servidor = fastapi.FastAPI()
+    downloads = Downloads()
+    registrar_rota(servidor, downloads)
+    token = downloads.guardar("s1", "simulacao.csv", "Parcela\r\n".encode(), TIPO_CSV)
+    cliente = TestClient(servidor)
+
+    resposta = cliente.get(f"{PREFIXO_DOWNLOADS}/{token}")
+    assert resposta.status_code == 200
+    assert resposta.content == b"Parcela\r\n"
+    assert resposta.headers["content-disposition"] == 'attachment; filename="simulacao.csv"'
+    assert cliente.get(f"{PREFIXO_DOWNLOADS}/invalido").status_code == 404
@@ -0,0 +1,158 @@
+"""Exportação das tabelas de amortização para CSV"""
+import csv
+import io
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from calculadoracidadao import calcular_emprestimo, formatar_moeda
+from calculadoracidadao.amortizacao import formatar_datas, iterar_blocos
+from calculadoracidadao.exportacao import (
+    CABECALHO_NUMERICO,
+    CABECALHO_PTBR,
+    FORMATO_NUMERICO,
+    FORMATO_PTBR,
+    escrever_csv,
+    exportar_csv,
+    exportar_feather,
+    exportar_parquet,
+    tabela_colunar,
+)
+
+DATA = datetime(2024, 1, 31)
+
+
+def csv_referencia(cronograma):
+    """As mesmas linhas escritas uma a uma pelo csv.writer"""
+    arquivo = io.StringIO(newline="")
+    writer = csv.writer(arquivo)
+    writer.writerow(CABECALHO_PTBR)
+    datas = formatar_datas(cronograma.data) if cronograma.data is not None else [""] * len(cronograma)
+    for linha, data in zip(cronograma, datas):
+        writer.writerow([linha["parcela"], data] + [
+            formatar_moeda(linha[coluna]) for coluna in ("valor_parcela", "amortizacao", "juros", "saldo")
+        ])
+    return arquivo.getvalue()
+
+
+def escrever(cronograma, formato):
+    arquivo = io.StringIO(newline="")
+    escrever_csv(arquivo, cronograma, formato)
+    return arquivo.getvalue()
+
+
+@pytest.mark.parametrize("valor, parcelas, taxa, tipo, data", [
+    (250_000.0, 420, 1.25, "price", DATA),
+    (1_234_567_890.55, 360, 0.0, "sac", None),
+    (999.995, 7, 3.3, "price", datetime(2024, 2, 29)),
+])
+def test_ptbr_igual_ao_csv_writer(valor, parcelas, taxa, tipo, data):
+    cronograma = calcular_emprestimo(valor, parcelas, taxa, tipo, data)
+    assert escrever(cronograma, FORMATO_PTBR) == csv_referencia(cronograma)
+
+
+def test_ptbr_negativos_e_valores_enormes():
+    cronograma = calcular_emprestimo(1000.0, 4, 1.0, "price", DATA)
+    cronograma.saldo[:] = [-0.004, -1_234_567.891, 1e20, np.nan]
+    assert escrever(cronograma, FORMATO_PTBR) == csv_referencia(cronograma)
+
+
+def test_numerico_pode_ser_lido_de_volta():
+    cronograma = calcular_emprestimo(250_000.0, 420, 1.25, "sac", DATA)
+    linhas = list(csv.reader(io.StringIO(escrever(cronograma, FORMATO_NUMERICO))))
+    assert linhas[0] == CABECALHO_NUMERICO
+    colunas = list(zip(*linhas[1:]))
+    assert [int(p) for p in colunas[0]] == cronograma.parcela.tolist()
+    assert list(colunas[1]) == np.datetime_as_string(cronograma.data, unit="D").tolist()
+    for texto, coluna in zip(colunas[2:], (cronograma.valor_parcela, cronograma.amortizacao,
+                                           cronograma.juros, cronograma.saldo)):
+        np.testing.assert_allclose([float(v) for v in texto], coluna, rtol=0, atol=5e-7)
+
+
+def test_blocos_iguais_ao_cronograma(tmp_path):
+    parametros = dict(valor=250_000.0, parcelas=1000, taxa=1.25, tipo="price", data_primeira_parcela=DATA)
+    for formato in (FORMATO_PTBR, FORMATO_NUMERICO):
+        exportar_csv(tmp_path / "blocos.csv", formato=formato, tamanho_bloco=97, **parametros)
+        exportar_csv(tmp_path / "inteiro.csv", formato=formato, cronograma=calcular_emprestimo(**parametros),
+                     **parametros)
+        assert (tmp_path / "blocos.csv").read_bytes() == (tmp_path / "inteiro.csv").read_bytes()
+
+
+def test_exportar_csv_ptbr_traz_parametros_e_totais(tmp_path):
+    exportar_csv(tmp_path / "simulacao.csv", 1000.0, 12, 1.0, "price", DATA)
+    linhas = list(csv.reader(open(tmp_path / "simulacao.csv", encoding="utf-8", newline="")))
+    assert linhas[0] == ["Parâmetros do cálculo"]
+    assert ["Data primeira parcela", "31/01/2024"] in linhas
+    inicio = linhas.index(CABECALHO_PTBR)
+    assert linhas[inicio + 12][:2] == ["12", "31/12/2024"]
+    assert linhas[inicio + 13] == []
+    totais = calcular_emprestimo(1000.0, 12, 1.0, "price").totais
+    assert linhas[-1] == ["Totais", "", formatar_moeda(totais["valor_parcela"]),
+                          formatar_moeda(totais["amortizacao"]), formatar_moeda(totais["juros"]), ""]
+
+
+def test_exportar_csv_numerico_so_a_tabela(tmp_path):
+    exportar_csv(tmp_path / "simulacao.csv", 1000.0, 12, 1.0, "sac", formato=FORMATO_NUMERICO)
+    linhas = list(csv.reader(open(tmp_path / "simulacao.csv", encoding="utf-8", newline="")))
+    assert linhas[0] == CABECALHO_NUMERICO
+    assert len(linhas) == 13
+    assert linhas[-1][:2] == ["12", ""]
+    assert float(linhas[-1][-1]) == 0
+
+
+def test_formato_desconhecido(tmp_path):
+    with pytest.raises(ValueError):
+        exportar_csv(tmp_path / "simulacao.csv", 1000.0, 12, 1.0, "price", formato="xlsx")
+    with pytest.raises(ValueError):
+        escrever(next(iterar_blocos(1000.0, 12, 0.01, "price", None)), "xlsx")
+
+
+def test_tabela_colunar_sem_texto():
+    cronograma = calcular_emprestimo(250_000.0, 420, 1.25, "price", DATA)
+    tabela = tabela_colunar(cronograma)
+    assert list(tabela.columns) == CABECALHO_NUMERICO
+    assert tabela["parcela"].dtype == np.int64 and tabela["saldo"].dtype == np.float64
+    np.testing.assert_array_equal(tabela["juros"].to_numpy(), cronograma.juros)
+    np.testing.assert_array_equal(tabela["data"].to_numpy().astype("datetime64[D]"), cronograma.data)
+
+
+def test_tabela_colunar_por_emprestimo():
+    lote = {
+        "A": calcular_emprestimo(1000.0, 12, 1.0, "price", DATA),
+        "B": calcular_emprestimo(5000.0, 24, 2.0, "sac"),
+    }
+    tabela = tabela_colunar(lote)
+    assert list(tabela.columns) == ["emprestimo"] + CABECALHO_NUMERICO
+    assert tabela["emprestimo"].tolist() == ["A"] * 12 + ["B"] * 24
+    assert tabela["parcela"].tolist() == list(range(1, 13)) + list(range(1, 25))
+    assert tabela["data"].isna().tolist() == [False] * 12 + [True] * 24
+    assert tabela_colunar(list(lote.items())).equals(tabela)
+
+
+@pytest.mark.parametrize("exportar, ler", [
+    (exportar_parquet, "read_parquet"),
+    (exportar_feather, "read_feather"),
+])
+def test_exportar_colunar(tmp_path, exportar, ler):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    lote = {i: calcular_emprestimo(1000.0 * i, 60, 1.5, "price", DATA) for i in range(1, 11)}
+    caminho = tmp_path / "lote"
+    assert exportar(caminho, lote) == 600
+    lido = getattr(pd, ler)(caminho)
+    esperado = tabela_colunar(lote)
+    assert lido["emprestimo"].tolist() == esperado["emprestimo"].tolist()
+    for coluna in CABECALHO_NUMERICO[2:]:
+        np.testing.assert_array_equal(lido[coluna].to_numpy(), esperado[coluna].to_numpy())
+    assert (lido["data"] == esperado["data"]).all()
+
+
+def test_exportar_csv_em_memoria(tmp_path):
+    parametros = dict(valor=250_000.0, parcelas=500, taxa=1.25, tipo="sac", data_primeira_parcela=DATA)
+    arquivo = io.BytesIO()
+    exportar_csv(arquivo, **parametros)
+    exportar_csv(tmp_path / "simulacao.csv", **parametros)
+    assert not arquivo.closed
+    assert arquivo.getvalue() == (tmp_path / "simulacao.csv").read_bytes()
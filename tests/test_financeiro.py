@@ -0,0 +1,24 @@
+"""Fórmulas de financeiro: valores de referência e entradas inválidas"""
+import math
+
+import pytest
+
+from calculadoracidadao import financeiro
+
+
+def test_tempo_e_taxa_inversos_do_valor_futuro():
+    vf = financeiro.calcular_valor_futuro(1000, 0.01, 24)
+    assert math.isclose(financeiro.calcular_tempo(1000, vf, 0.01), 24)
+    assert math.isclose(financeiro.calcular_taxa(1000, vf, 24), 0.01)
+
+
+@pytest.mark.parametrize("vp, vf, taxa", [(1000, -5, 0.01), (0, 1500, 0.01), (1000, 1500, 0), (1000, 1500, -1)])
+def test_tempo_recusa_entradas_invalidas(vp, vf, taxa):
+    with pytest.raises(ValueError):
+        financeiro.calcular_tempo(vp, vf, taxa)
+
+
+@pytest.mark.parametrize("vp, vf, meses", [(1000, -5, 12), (-1000, 1500, 12), (1000, 1500, 0)])
+def test_taxa_recusa_entradas_invalidas(vp, vf, meses):
+    with pytest.raises(ValueError):
+        financeiro.calcular_taxa(vp, vf, meses)
@@ -0,0 +1,29 @@
+"""Formatação de valores em reais sem o locale do sistema"""
+import numpy as np
+import pytest
+
+from calculadoracidadao import formatar_moeda, formatar_moedas
+
+
+@pytest.mark.parametrize("valor, texto", [
+    (0, "R$ 0,00"),
+    (0.5, "R$ 0,50"),
+    (999.995, "R$ 1.000,00"),
+    (1234.5, "R$ 1.234,50"),
+    (1_000_000, "R$ 1.000.000,00"),
+    (-1234.5, "-R$ 1.234,50"),
+    (2.675, "R$ 2,67"),  # 2.675 é 2.67499... em binário
+])
+def test_formatar_moeda(valor, texto):
+    assert formatar_moeda(valor) == texto
+    assert formatar_moedas([valor]).tolist() == [texto]
+
+
+def test_formatar_moedas_igual_ao_escalar():
+    aleatorio = np.random.default_rng(7)
+    valores = np.concatenate([
+        aleatorio.uniform(-1e9, 1e9, 50_000),
+        np.round(aleatorio.uniform(0, 1e4, 50_000), 3),  # muitos meios centavos
+        [np.nan, np.inf, 1e20],
+    ])
+    assert formatar_moedas(valores).tolist() == [formatar_moeda(v) for v in valores.tolist()]
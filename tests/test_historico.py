@@ -0,0 +1,39 @@
+"""Histórico de resultados indexado e limitado"""
+import pytest
+
+from calculadoracidadao.historico import Historico
+
+
+def test_descarta_os_mais_antigos():
+    historico = Historico(tamanho_maximo=3)
+    ids = [historico.adicionar(f"r{i}")[0] for i in range(3)]
+    id_novo, descartados = historico.adicionar("r3")
+
+    assert descartados == [ids[0]]
+    assert list(historico) == ["r1", "r2", "r3"]
+    assert id_novo not in ids
+    assert historico.descartados == 1
+
+
+def test_remover_por_id():
+    historico = Historico()
+    id_a, _ = historico.adicionar("a")
+    id_b, _ = historico.adicionar("b")
+
+    assert historico.remover(id_a) == "a"
+    assert historico.remover(id_a) is None
+    assert id_b in historico and id_a not in historico
+    assert list(historico.itens()) == [(id_b, "b")]
+
+
+def test_memoria_constante():
+    historico = Historico(tamanho_maximo=10)
+    for i in range(10_000):
+        historico.adicionar({"resultado": i})
+    assert len(historico) == 10
+    assert historico.descartados == 9_990
+
+
+def test_tamanho_invalido():
+    with pytest.raises(ValueError):
+        Historico(tamanho_maximo=0)
@@ -0,0 +1,89 @@
+"""Recálculo ao vivo: espera, descarte de cálculos obsoletos e latência"""
+import asyncio
+import threading
+import time
+
+from calculadoracidadao.interface.recalculo import Recalculo
+
+ATRASO = 0.05
+
+
+def test_rajada_de_teclas_calcula_uma_vez():
+    calculos = []
+    exibidos = []
+
+    async def cenario():
+        recalculo = Recalculo(lambda: calculos.append(1) or len(calculos), exibidos.append, atraso=ATRASO)
+        teclas = [asyncio.ensure_future(recalculo.agendar()) for _ in range(20)]
+        await asyncio.gather(*teclas)
+        return recalculo
+
+    threads = threading.active_count()
+    recalculo = asyncio.run(cenario())
+
+    assert len(calculos) == 1
+    assert exibidos == [1]
+    assert ATRASO <= recalculo.ultima_latencia < ATRASO + 0.5
+    # A espera fica no loop: nenhuma thread nova por tecla
+    assert threading.active_count() <= threads + 1
+
+
+def test_calculo_obsoleto_e_descartado():
+    liberar = threading.Event()
+    iniciou = threading.Event()
+    exibidos = []
+    entradas = iter(["antigo", "novo"])
+
+    def calcular():
+        valor = next(entradas)
+        if valor == "antigo":
+            iniciou.set()
+            liberar.wait(2)
+        return valor
+
+    async def cenario():
+        recalculo = Recalculo(calcular, exibidos.append, atraso=ATRASO)
+        primeira = asyncio.ensure_future(recalculo.agendar())
+        while not iniciou.is_set():
+            await asyncio.sleep(0.001)
+        segunda = asyncio.ensure_future(recalculo.agendar())  # entrada nova durante o cálculo
+        liberar.set()
+        await asyncio.gather(primeira, segunda)
+        return recalculo
+
+    recalculo = asyncio.run(cenario())
+    assert exibidos == ["novo"]
+    assert recalculo.estatisticas()["descartados"] == 1
+
+
+def test_cancelar_nao_exibe():
+    exibidos = []
+
+    async def cenario():
+        recalculo = Recalculo(lambda: 1, exibidos.append, atraso=ATRASO)
+        tecla = asyncio.ensure_future(recalculo.agendar())
+        await asyncio.sleep(0)
+        recalculo.cancelar()
+        await tecla
+
+    asyncio.run(cenario())
+    assert exibidos == []
+
+
+def test_mostrar_roda_no_loop_sem_trava():
+    chamadas = []
+
+    async def cenario():
+        recalculo = Recalculo(lambda: 1, None, atraso=ATRASO)
+
+        def mostrar(resultado):
+            # Uma tecla nova não pode esperar pelo mostrar() em andamento
+            assert recalculo._trava.acquire(blocking=False)
+            recalculo._trava.release()
+            chamadas.append(threading.current_thread())
+
+        recalculo.mostrar = mostrar
+        await recalculo.agendar()
+
+    asyncio.run(cenario())
+    assert chamadas == [threading.main_thread()]
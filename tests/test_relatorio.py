@@ -0,0 +1,49 @@
+"""Relatório PDF das tabelas de amortização"""
+from datetime import datetime
+
+from calculadoracidadao import calcular_emprestimo, formatar_moeda
+from calculadoracidadao.amortizacao import formatar_datas
+from calculadoracidadao.exportacao import CABECALHO_PTBR
+from calculadoracidadao.relatorio import exportar_pdf, montar_relatorio_pdf
+
+DATA = datetime(2025, 1, 10)
+
+
+def montar(parcelas, **kwargs):
+    pdf = montar_relatorio_pdf(250_000.0, parcelas, 1.25, "price", DATA, **kwargs)
+    pdf.set_compression(False)
+    pdf.close()
+    return pdf
+
+
+def test_todas_as_parcelas_em_ordem():
+    pdf = montar(1000, tamanho_bloco=97)
+    cronograma = calcular_emprestimo(250_000.0, 1000, 1.25, "price", DATA)
+    texto = "".join(pdf.pages[n] for n in range(1, pdf.page_no() + 1))
+    assert pdf.linhas_escritas == 1000
+    posicoes = [texto.index(f"({data}) Tj") for data in formatar_datas(cronograma.data)]
+    assert posicoes == sorted(posicoes)
+    assert f"({formatar_moeda(cronograma.saldo[500])}) Tj" in texto
+
+
+def test_cabecalho_e_rodape_em_todas_as_paginas():
+    pdf = montar(420)
+    assert pdf.page_no() > 5
+    for n in range(1, pdf.page_no() + 1):
+        pagina = pdf.pages[n]
+        assert all(f"({titulo}) Tj" in pagina for titulo in CABECALHO_PTBR)
+        assert f"de {pdf.page_no()}) Tj" in pagina
+
+
+def test_mesmo_resultado_com_cronograma():
+    calculado = montar(300, cronograma=calcular_emprestimo(250_000.0, 300, 1.25, "price", DATA))
+    assert calculado.pages == montar(300).pages
+
+
+def test_exportar_pdf(tmp_path):
+    caminho = tmp_path / "simulacao.pdf"
+    paginas = exportar_pdf(caminho, 10_000.0, 12, 2.0, "sac")
+    conteudo = caminho.read_bytes()
+    assert paginas == 1
+    assert conteudo.startswith(b"%PDF") and conteudo.rstrip().endswith(b"%%EOF")
+    assert montar_relatorio_pdf(10_000.0, 12, 2.0, "sac").conteudo().startswith(b"%PDF")
@@ -0,0 +1,57 @@
+"""Relatórios PDF em lote, distribuídos entre processos"""
+from datetime import datetime
+
+from calculadoracidadao.relatorio_lote import gerar_relatorios, ler_simulacoes
+
+
+def simulacoes(quantidade):
+    return [
+        {"id": i, "valor": 10_000.0 * (i + 1), "parcelas": 12 + i, "taxa": 1.5, "tipo": "price" if i % 2 else "sac",
+         "data_primeira_parcela": datetime(2025, 1, 10)}
+        for i in range(quantidade)
+    ]
+
+
+def test_um_arquivo_por_simulacao(tmp_path):
+    lote = simulacoes(10) + [{"valor": 1000.0, "parcelas": 3, "taxa": 1.0, "tipo": "sac",
+                              "caminho": tmp_path / "outro.pdf"}]
+    resultado = gerar_relatorios(lote, tmp_path, processos=2, tamanho_lote=3)
+    assert resultado["relatorios"] == 11
+    assert resultado["falhas"] == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [f"simulacao_{i}.pdf" for i in range(10)] + ["outro.pdf"]
+    )
+    assert all(p.read_bytes().startswith(b"%PDF") for p in tmp_path.iterdir())
+
+
+def test_falhas_por_processo(tmp_path):
+    lote = simulacoes(6)
+    lote[2]["parcelas"] = 0
+    del lote[4]["taxa"]
+    resultado = gerar_relatorios(lote, tmp_path, processos=2, tamanho_lote=2)
+    assert resultado["relatorios"] == 4
+    assert sorted(caminho for caminho, _ in resultado["falhas"]) == [
+        str(tmp_path / "simulacao_2.pdf"), str(tmp_path / "simulacao_4.pdf"),
+    ]
+    processos = resultado["processos"].values()
+    assert 1 <= len(processos) <= 2
+    assert sum(p["lotes"] for p in processos) == 3
+    assert sum(p["relatorios"] for p in processos) == 4
+    assert sum(p["falhas"] for p in processos) == 2
+    assert all(p["relatorios_por_segundo"] > 0 for p in processos)
+    assert resultado["paginas_por_segundo"] > 0
+
+
+def test_ler_simulacoes(tmp_path):
+    contratos = tmp_path / "contratos.csv"
+    contratos.write_text(
+        "id,valor,parcelas,taxa,tipo,data_primeira_parcela\n"
+        "A1,1000.50,12,1.5,price,2025-01-10\n"
+        "A2,2000,24,0.9,sac,\n",
+        encoding="utf-8",
+    )
+    assert list(ler_simulacoes(contratos)) == [
+        {"id": "A1", "valor": 1000.5, "parcelas": 12, "taxa": 1.5, "tipo": "price",
+         "data_primeira_parcela": datetime(2025, 1, 10)},
+        {"id": "A2", "valor": 2000.0, "parcelas": 24, "taxa": 0.9, "tipo": "sac", "data_primeira_parcela": None},
+    ]
@@ -0,0 +1,27 @@
+"""Grade de prestações por taxa e prazo"""
+import numpy as np
+import pytest
+
+from calculadoracidadao import calcular_prestacao
+from calculadoracidadao.sensibilidade import calcular_grade_prestacoes, faixa
+
+
+def test_grade_igual_ao_calculo_escalar():
+    taxas = np.linspace(0, 0.05, 50)
+    prazos = np.arange(1, 61)
+    grade = calcular_grade_prestacoes(250_000.0, taxas, prazos)
+    assert grade.shape == (50, 60)
+    for i, j in [(0, 0), (25, 59), (49, 20)]:
+        assert grade[i, j] == pytest.approx(calcular_prestacao(250_000.0, taxas[i], prazos[j]))
+
+
+def test_taxa_zero_divide_o_valor():
+    grade = calcular_grade_prestacoes(1200.0, [0.0, 0.01], [12, 24])
+    np.testing.assert_allclose(grade[0], [100.0, 50.0])
+
+
+def test_entradas_invalidas():
+    with pytest.raises(ValueError):
+        calcular_grade_prestacoes(1000.0, [0.01], [0, 12])
+    with pytest.raises(ValueError):
+        faixa(0.01, 0.02, 0)
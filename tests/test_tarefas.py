@@ -0,0 +1,38 @@
+"""Executor limitado das tarefas pesadas da interface"""
+import asyncio
+import threading
+
+import pytest
+
+from calculadoracidadao.interface import tarefas
+
+
+def test_executar_nao_bloqueia_o_loop():
+    liberar = threading.Event()
+
+    async def cenario():
+        tarefa = asyncio.ensure_future(tarefas.executar(liberar.wait, 2))
+        ticks = 0
+        while ticks < 5:
+            await asyncio.sleep(0.001)
+            ticks += 1
+        liberar.set()
+        return await tarefa, ticks
+
+    assert asyncio.run(cenario()) == (True, 5)
+
+
+def test_executar_recusa_quando_cheio():
+    liberar = threading.Event()
+
+    async def cenario():
+        pendentes = [asyncio.ensure_future(tarefas.executar(liberar.wait, 2))
+                     for _ in range(tarefas.MAX_PENDENTES)]
+        await asyncio.sleep(0)
+        with pytest.raises(tarefas.ServidorOcupado):
+            await tarefas.executar(int)
+        liberar.set()
+        await asyncio.gather(*pendentes)
+        return await tarefas.executar(int, "7")
+
+    assert asyncio.run(cenario()) == 7
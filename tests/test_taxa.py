@@ -0,0 +1,58 @@
+"""Taxa de juros a partir da prestação, do prazo e do valor financiado"""
+import numpy as np
+import pytest
+
+from calculadoracidadao import calcular_prestacao, calcular_taxa_juros, resolver_taxa, resolver_taxas
+from calculadoracidadao.taxa import STATUS_CONVERGIU, STATUS_INVALIDO
+
+
+@pytest.mark.parametrize("meses", [12, 120, 420, 10_000])
+def test_recupera_a_taxa(meses):
+    prestacao = calcular_prestacao(250_000.0, 0.0125, meses)
+    assert calcular_taxa_juros(prestacao, meses, 250_000.0) == pytest.approx(0.0125, abs=1e-6)
+
+
+def test_lote_recupera_as_taxas():
+    aleatorio = np.random.default_rng(42)
+    meses = aleatorio.choice([12, 24, 36, 60, 120, 240, 360, 420], 1000).astype(np.float64)
+    taxas = aleatorio.uniform(0.001, 0.1, 1000)
+    valores = aleatorio.uniform(1_000, 1_000_000, 1000)
+    prestacoes = valores * taxas / (1 - (1 + taxas) ** -meses)
+    np.testing.assert_allclose(resolver_taxas(prestacoes, meses, valores)["taxa"], taxas, atol=1e-6)
+
+
+@pytest.mark.parametrize("taxa", [1.5, 3.0, 10.0])
+def test_taxas_acima_de_100_por_cento_ao_mes(taxa):
+    prestacao = calcular_prestacao(1_000.0, taxa, 24)
+    resultado = resolver_taxa(prestacao, 24, 1_000.0)
+    assert resultado["taxa"] == pytest.approx(taxa, rel=1e-6)
+    assert resultado["metodo"] in ("newton", "brent")
+
+
+def test_taxa_zero_e_exata():
+    assert resolver_taxa(100.0, 12, 1_200.0) == {"taxa": 0.0, "iteracoes": 0, "metodo": "exato"}
+
+
+def test_taxa_quase_zero():
+    prestacao = calcular_prestacao(1_200.0, 1e-7, 12)
+    assert resolver_taxa(prestacao, 12, 1_200.0)["taxa"] == pytest.approx(1e-7, abs=1e-9)
+
+
+@pytest.mark.parametrize("prestacao, meses, valor", [
+    (90.0, 12, 1_200.0),  # as prestações não cobrem o valor
+    (0.0, 12, 1_200.0),
+    (100.0, 0, 1_200.0),
+    (100.0, 12, -1.0),
+])
+def test_sem_solucao(prestacao, meses, valor):
+    with pytest.raises(ValueError):
+        resolver_taxa(prestacao, meses, valor)
+
+
+def test_lote_marca_contratos_sem_solucao():
+    resultado = resolver_taxas([100.0, 90.0, 0.0, calcular_prestacao(1_000.0, 2.0, 24)],
+                               [12, 12, 12, 24], [1_200.0, 1_200.0, 1_200.0, 1_000.0])
+    assert resultado["status"].tolist() == [STATUS_CONVERGIU, STATUS_INVALIDO, STATUS_INVALIDO, STATUS_CONVERGIU]
+    assert resultado["taxa"][0] == 0.0
+    assert np.isnan(resultado["taxa"][1:3]).all()
+    assert resultado["taxa"][3] == pytest.approx(2.0, rel=1e-6)